@@ -11,6 +11,7 @@ from app.model.models import User
 from app.services.email.utils import send_email_async
 from app.core.auth import generate_access_token
 from app.core.extensions import limiter
+from app.core.json_provider import OrjsonProvider
 from flask_cors import CORS
 from contextlib import contextmanager
 from flask_sqlalchemy import SQLAlchemy
@@ -24,6 +25,12 @@ migrate = Migrate()
 jwt = JWTManager()
 
 
+@jwt.token_in_blocklist_loader
+def check_if_token_revoked(jwt_header, jwt_payload):
+    from app.core.revocation import revocation_store
+    return revocation_store.is_revoked(jwt_payload["jti"])
+
+
 # ✅ Context-managed DB session
 @contextmanager
 def get_db():
@@ -37,6 +44,7 @@ def get_db():
 # ✅ Flask app factory
 def create_app(test_config=None):
     app = Flask(__name__)
+    app.json = OrjsonProvider(app)
     limiter.init_app(app)
     
     if test_config:
@@ -53,8 +61,20 @@ def create_app(test_config=None):
     logger.setLevel(log_level)
     CORS(app)   
     
+    # ✅ Return request-scoped DB connections to the pool
+    from app.model.base import close_request_sessions
+    app.teardown_request(close_request_sessions)
+
+    # ✅ Verify the JWT once per request; handlers read the cached principal
+    from app.core.authorization import register_auth_middleware
+    register_auth_middleware(app)
+
+    # ✅ gzip/brotli large JSON and text responses
+    from app.core.compression import register_compression
+    register_compression(app)
+
     # ✅ Register blueprints
-    from app.routes import users, accounts, transactions, external_transaction, billpayment, bills, budgets, categories, auth
+    from app.routes import users, accounts, transactions, external_transaction, billpayment, bills, budgets, categories, auth, metrics, gateway, scheduled_transfers
     app.register_blueprint(auth.auth_bp)
     app.register_blueprint(users.users_bp, url_prefix="/users")
     app.register_blueprint(accounts.accounts_bp, url_prefix="/accounts")
@@ -64,6 +84,13 @@ def create_app(test_config=None):
     app.register_blueprint(bills.bills_bp)
     app.register_blueprint(budgets.budgets_bp)
     app.register_blueprint(categories.categories_bp)
+    app.register_blueprint(metrics.metrics_bp)
+    app.register_blueprint(gateway.gateway_bp)
+    app.register_blueprint(scheduled_transfers.scheduled_transfers_bp)
+
+    # ✅ Register CLI commands
+    from app.cli import register_cli
+    register_cli(app)
     
     return app
 
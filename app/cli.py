@@ -0,0 +1,211 @@
+# app/cli.py
+import click
+import time
+from datetime import datetime, timedelta
+from flask.cli import AppGroup
+from app.database.db import SessionLocal
+from app.database.dependency import get_db
+from app.core.usernames import username_filter
+from app.model.models import Account
+from app.services.accounts.snapshots import snapshot_through
+from app.services.authorizations.expiry import SWEEP_BATCH, expire_authorizations
+from app.services.bills.autopay import CHUNK_BILLS, run_autopay
+from app.services.bills.reminders import send_bill_reminders
+from app.services.ledger.postings import unbalanced_transactions
+from app.services.ledger.projection import project_balances
+from app.services.ledger.slots import MAX_SLOTS, fold_slots, set_slots
+from app.services.gateway.client import get_gateway
+from app.services.gateway.settlement import batch_pending_withdrawals, submit_open_batches
+from app.services.gateway.stub import create_stub_app
+from app.services.scheduled_transfers.executor import CLAIM_BATCH, run_due_transfers
+from app.services.settlements.ingest import import_settlement
+from app.services.settlements.parsing import FORMATS
+from config import Config
+
+usernames_cli = AppGroup("usernames", help="Maintain the username negative-lookup filter.")
+balances_cli = AppGroup("balances", help="End-of-day account balance snapshots.")
+ledger_cli = AppGroup("ledger", help="Double-entry ledger postings and the balance projection.")
+settlements_cli = AppGroup("settlements", help="Partner bank settlement files.")
+gateway_cli = AppGroup("gateway", help="Batched settlement of external withdrawals.")
+authorizations_cli = AppGroup("authorizations", help="Card authorization holds.")
+transfers_cli = AppGroup("transfers", help="Scheduled and recurring transfers.")
+bills_cli = AppGroup("bills", help="Bill autopay and reminders.")
+
+
+@usernames_cli.command("rebuild")
+@click.option("--probes", default=10_000, show_default=True, help="Random lookups used to measure false positives.")
+def rebuild_usernames(probes):
+    """Rebuild the username filter and print its memory / false-positive report."""
+    with get_db() as db:
+        username_filter.rebuild(db)
+
+    for key, value in username_filter.report(probes).items():
+        click.echo(f"{key}: {value}")
+
+
+@balances_cli.command("snapshot")
+@click.option("--date", "day", type=click.DateTime(formats=["%Y-%m-%d"]), default=None,
+              help="Last day to snapshot (UTC). Defaults to yesterday.")
+def snapshot_balances(day):
+    """Write closing balances for every day since the last snapshot. Run nightly."""
+    last_day = day.date() if day else datetime.utcnow().date() - timedelta(days=1)
+    with get_db() as db:
+        results = snapshot_through(db, last_day)
+
+    if not results:
+        click.echo(f"Snapshots are already up to date through {last_day}")
+    for snapshot_day, rows in results:
+        click.echo(f"{snapshot_day}: {rows} accounts")
+
+
+@ledger_cli.command("project")
+def project_ledger():
+    """Fold new postings into the cached account balances. Run every minute or so."""
+    with get_db() as db:
+        updated = project_balances(db)
+    click.echo(f"{updated} account balances updated")
+
+
+@ledger_cli.command("fold")
+def fold_ledger_slots():
+    """Merge hot accounts' balance slots into their cached balances. Run alongside ``project``."""
+    with get_db() as db:
+        updated = fold_slots(db)
+    click.echo(f"{updated} hot account balances folded")
+
+
+@ledger_cli.command("hot")
+@click.argument("account_id", type=int)
+@click.option("--slots", default=8, show_default=True, type=click.IntRange(1, MAX_SLOTS),
+              help="Credit slots to spread incoming money over; 1 turns hot mode off.")
+def set_hot_account(account_id, slots):
+    """Spread credits to a busy account (e.g. a merchant) over several balance rows."""
+    with get_db() as db:
+        account = db.get(Account, account_id)
+        if account is None:
+            raise click.ClickException(f"Account {account_id} not found")
+        set_slots(db, account, slots)
+    click.echo(f"Account {account_id} credits {slots} balance slots")
+
+
+@ledger_cli.command("check")
+@click.option("--limit", default=100, show_default=True, help="Most transactions to list.")
+def check_ledger(limit):
+    """List transactions whose postings are missing or don't net to zero."""
+    with get_db() as db:
+        ids = unbalanced_transactions(db, limit)
+
+    if not ids:
+        click.echo("Every transaction has a balanced debit and credit")
+        return
+    click.echo(f"{len(ids)} unbalanced transactions: {', '.join(map(str, ids))}")
+    raise SystemExit(1)
+
+
+@settlements_cli.command("import")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--bank", "bank_name", required=True, help="Partner bank the file comes from.")
+@click.option("--format", "file_format", type=click.Choice(FORMATS), default=None,
+              help="File layout; defaults to csv for .csv files and fixed otherwise.")
+def import_settlement_file(path, bank_name, file_format):
+    """Credit every deposit in a settlement file; rows already imported are skipped."""
+    file_format = file_format or ("csv" if path.lower().endswith(".csv") else "fixed")
+    with get_db() as db, open(path, newline="", encoding="utf-8") as stream:
+        report = import_settlement(db, stream, bank_name, file_format)
+
+    for key in ("rows", "applied", "applied_amount", "rejected", "duplicates", "unknown_accounts"):
+        click.echo(f"{key}: {report[key]}")
+    for rejected in report["rejected_lines"]:
+        click.echo(f"line {rejected['line']}: {rejected['reason']}")
+
+
+def _settle_once(batch_size, concurrency):
+    with get_db() as db:
+        created = batch_pending_withdrawals(db, batch_size)
+    submitted = submit_open_batches(SessionLocal, get_gateway(), concurrency)
+    return created, submitted
+
+
+@gateway_cli.command("settle")
+@click.option("--batch-size", default=Config.GATEWAY_BATCH_SIZE, show_default=True, help="Most withdrawals per batch.")
+@click.option("--concurrency", default=Config.GATEWAY_MAX_CONCURRENCY, show_default=True,
+              help="Batches submitted to the gateway at once.")
+@click.option("--every", type=float, default=None, help="Keep running, once every this many seconds.")
+def settle_withdrawals(batch_size, concurrency, every):
+    """Batch pending external withdrawals and submit open batches to the gateway."""
+    while True:
+        created, submitted = _settle_once(batch_size, concurrency)
+        click.echo(f"{created} batches created, {submitted} submitted")
+        if every is None:
+            return
+        time.sleep(every)
+
+
+@gateway_cli.command("stub")
+@click.option("--port", default=5055, show_default=True)
+@click.option("--settle-after", default=1.0, show_default=True, help="Seconds before the callback is sent.")
+@click.option("--reject-rate", default=0.02, show_default=True, help="Share of items the stub rejects.")
+def run_gateway_stub(port, settle_after, reject_rate):
+    """Run a stand-in partner bank gateway for local development."""
+    create_stub_app(Config.GATEWAY_SECRET, settle_after, reject_rate).run(port=port, threaded=True)
+
+
+@authorizations_cli.command("expire")
+@click.option("--batch-size", default=SWEEP_BATCH, show_default=True, help="Most holds expired per statement.")
+@click.option("--every", type=float, default=None, help="Keep running, once every this many seconds.")
+def expire_holds(batch_size, every):
+    """Close card holds past their expiry, freeing the funds they reserved."""
+    while True:
+        with get_db() as db:
+            expired = expire_authorizations(db, batch_size=batch_size)
+        click.echo(f"{expired} authorizations expired")
+        if every is None:
+            return
+        time.sleep(every)
+
+
+@transfers_cli.command("run")
+@click.option("--batch-size", default=CLAIM_BATCH, show_default=True, help="Due transfers claimed at a time.")
+@click.option("--every", type=float, default=None, help="Keep running, once every this many seconds.")
+def run_scheduled_transfers(batch_size, every):
+    """Run due scheduled transfers. Several can run at once; each claims different transfers."""
+    while True:
+        report = run_due_transfers(SessionLocal, batch_size)
+        click.echo(" ".join(f"{key}={value}" for key, value in report.items()))
+        if every is None:
+            return
+        time.sleep(every)
+
+
+@bills_cli.command("autopay")
+@click.option("--day", type=click.DateTime(formats=["%Y-%m-%d"]), default=None, help="Pay bills due by this day (default: today).")
+@click.option("--workers", default=Config.AUTOPAY_WORKERS, show_default=True, help="Worker processes.")
+@click.option("--chunk-bills", default=CHUNK_BILLS, show_default=True, help="Bills paid per database transaction.")
+def autopay_bills(day, workers, chunk_bills):
+    """Pay autopay bills that are due from their accounts. Run daily."""
+    report = run_autopay(day=day.date() if day else None, chunk_bills=chunk_bills, workers=workers)
+    for key in ("day", "due", "chunks", "paid", "amount", "seconds"):
+        click.echo(f"{key}: {report[key]}")
+    for failure in report["failed"]:
+        click.echo(f"bill {failure['bill_id']}: {failure['reason']}")
+
+
+@bills_cli.command("remind")
+@click.option("--days", default=Config.BILL_REMINDER_DAYS, show_default=True, help="Remind of bills due within this many days.")
+def remind_bills(days):
+    """Email users about upcoming and overdue bills and mark overdue ones. Run daily."""
+    with get_db() as db:
+        report = send_bill_reminders(db, days=days)
+    for key, value in report.items():
+        click.echo(f"{key}: {value}")
+
+
+def register_cli(app):
+    app.cli.add_command(usernames_cli)
+    app.cli.add_command(balances_cli)
+    app.cli.add_command(ledger_cli)
+    app.cli.add_command(settlements_cli)
+    app.cli.add_command(gateway_cli)
+    app.cli.add_command(authorizations_cli)
+    app.cli.add_command(transfers_cli)
+    app.cli.add_command(bills_cli)
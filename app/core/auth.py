@@ -4,6 +4,8 @@ from datetime import datetime, timedelta
 from typing import Optional
 from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request, create_access_token
 from app.core.extensions import limiter
+from app.core import lockout
+from app.core.authorization import current_principal
 from flask import request, jsonify, abort
 from dotenv import load_dotenv
 from app.database.dependency import get_db
@@ -25,7 +27,7 @@ def generate_access_token(user):
     return create_access_token(
         identity=str(user.id),
         expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES),
-        additional_claims={"role": user.role or "user"} 
+        additional_claims={"role": user.role or "user", "username": user.username}
     )
     
 
@@ -40,29 +42,17 @@ def authenticate_user(username: str, password: str, db=None):
         return None
 
     # Check for lockout
-    if user.is_locked:
-        if user.locked_time and datetime.utcnow() > user.locked_time + LOCK_DURATION:
-            user.is_locked = False
-            user.failed_attempts = 0
-            db.commit()
-        else:
-            abort(403, description="Account is locked. Please wait or contact support.")
+    if lockout.check_lock(db, user, LOCK_DURATION):
+        abort(403, description="Account is locked. Please wait or contact support.")
 
     if not verify_password(password, user.password):
-        user.failed_attempts += 1
-        if user.failed_attempts >= MAX_FAILED_ATTEMPTS:
-            user.is_locked = True
-            user.locked_time = datetime.utcnow()
-            db.commit()
+        attempts, locked = lockout.register_failure(db, user, MAX_FAILED_ATTEMPTS, LOCK_DURATION)
+        if locked:
             abort(403, description="Account locked due to multiple failed attempts.")
-        db.commit()
-        abort(401, description=f"Invalid password. {MAX_FAILED_ATTEMPTS - user.failed_attempts} attempts left.")
+        abort(401, description=f"Invalid password. {MAX_FAILED_ATTEMPTS - attempts} attempts left.")
 
     # Successful login
-    user.failed_attempts = 0
-    user.is_locked = False
-    user.locked_time = None
-    db.commit()
+    lockout.clear(db, user)
 
     return {
         "id": user.id,
@@ -74,14 +64,23 @@ def authenticate_user(username: str, password: str, db=None):
 
 
 # Extract current user from JWT
-def get_current_user():
-    try:
-        verify_jwt_in_request()
-        user_id = get_jwt_identity()
-    except Exception:
+def get_current_user(fresh: bool = False):
+    """Return the caller as a dict.
+
+    By default this is built from the JWT claims already verified for this
+    request. Pass ``fresh=True`` when the handler needs the stored profile
+    (e.g. the email address invoices are sent to); that costs a query.
+    """
+    principal = current_principal()
+    if principal is None:
         logger.warning(f"🔒 Missing or invalid JWT for: {request.method} {request.path}")
         abort(401, description="Missing or invalid token")
 
+    # Tokens issued before the username claim existed still need a lookup
+    if not fresh and principal.username:
+        return principal.as_dict()
+
+    user_id = principal.id
     with get_db() as db:
         user = db.query(User).filter_by(id=user_id).first()
         if not user:
@@ -93,5 +92,6 @@ def get_current_user():
             "username": user.username,
             "email": user.email,
             "full_name": user.full_name,
-            "phone_number": user.phone_number
+            "phone_number": user.phone_number,
+            "role": user.role or "user"
         }
\ No newline at end of file
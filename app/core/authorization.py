@@ -1,21 +1,64 @@
-from flask import request
+from dataclasses import dataclass
+from typing import Optional
+from flask import request, g
 from flask_jwt_extended import verify_jwt_in_request, get_jwt
 from functools import wraps
 from app.core.logger import logger
 
+
+@dataclass(frozen=True)
+class Principal:
+    """Caller identity taken from verified JWT claims, no database involved."""
+    id: int
+    role: str
+    username: Optional[str]
+
+    def as_dict(self):
+        return {"id": self.id, "username": self.username, "role": self.role}
+
+
+def load_principal():
+    """Verify the request's JWT (if any) and store the principal on ``flask.g``.
+
+    Runs once per request as a ``before_request`` hook; ``role_required``,
+    ``get_current_user`` and the rate limiter all read the cached result.
+    """
+    g.principal = None
+    try:
+        verify_jwt_in_request(optional=True)
+        claims = get_jwt()
+        if not claims:
+            return
+        g.principal = Principal(
+            id=int(claims["sub"]),
+            role=claims.get("role") or "user",
+            username=claims.get("username"),
+        )
+    except Exception:
+        logger.warning(f"🔒 Invalid JWT for: {request.method} {request.path}")
+
+
+def current_principal() -> Optional[Principal]:
+    if "principal" not in g:
+        load_principal()
+    return g.principal
+
+
+def register_auth_middleware(app):
+    app.before_request(load_principal)
+
+
 def role_required(*roles):
     def decorator(fn):
         @wraps(fn)
         def wrapper(*args, **kwargs):
-            try:
-                verify_jwt_in_request()
-                claims = get_jwt()
-            except Exception:
+            principal = current_principal()
+            if principal is None:
                 logger.warning(f"🔒 Missing or invalid JWT for: {request.method} {request.path}")
                 return {"detail": "Missing or invalid token"}, 401
 
-            if claims.get("role") not in roles:
-                logger.warning(f"⛔ Forbidden: {claims.get('role')} tried to access {request.method} {request.path}")
+            if principal.role not in roles:
+                logger.warning(f"⛔ Forbidden: {principal.role} tried to access {request.method} {request.path}")
                 return {"detail": "Forbidden: insufficient role"}, 403
 
             return fn(*args, **kwargs)
@@ -0,0 +1,61 @@
+# app/core/compression.py
+import gzip
+from flask import request
+from config import Config
+
+try:
+    import brotli
+except ImportError:  # optional; gzip is always available
+    brotli = None
+
+COMPRESSIBLE = {"application/json", "application/x-ndjson", "text/csv", "text/html", "text/plain"}
+
+
+def _choose_encoding():
+    accepted = request.accept_encodings
+    if brotli is not None and accepted.quality("br") > 0:
+        return "br"
+    if accepted.quality("gzip") > 0:
+        return "gzip"
+    return None
+
+
+def compress_response(response):
+    """Compress buffered text responses of at least ``COMPRESS_MIN_SIZE`` bytes."""
+    if response.mimetype not in COMPRESSIBLE:
+        return response
+    response.vary.add("Accept-Encoding")
+
+    if (
+        request.method == "HEAD"
+        or response.status_code != 200
+        or response.direct_passthrough
+        or response.is_streamed
+        or "Content-Encoding" in response.headers
+    ):
+        return response
+
+    body = response.get_data()
+    if len(body) < Config.COMPRESS_MIN_SIZE:
+        return response
+
+    encoding = _choose_encoding()
+    if encoding == "br":
+        body = brotli.compress(body, quality=Config.COMPRESS_BROTLI_QUALITY)
+    elif encoding == "gzip":
+        body = gzip.compress(body, compresslevel=Config.COMPRESS_GZIP_LEVEL)
+    else:
+        return response
+
+    response.set_data(body)
+    response.headers["Content-Encoding"] = encoding
+    # The encoded bytes differ from the identity ones, so a strong validator
+    # would be wrong here; a weak one still matches If-None-Match.
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def register_compression(app):
+    app.after_request(compress_response)
@@ -1,24 +1,155 @@
 import os
+import threading
+import time
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
-from redis import Redis
+from redis import ConnectionPool, Redis
+from redis.commands.core import Script
+from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
 from flask_mail import Mail
+from app.core import metrics
+from app.core.logger import logger
 
 mail = Mail()
 
 # ✅ Use environment variable for Redis URI
 storage_uri = os.getenv("REDIS_URL")
 
+# Short timeouts: a Redis blip should cost milliseconds, not seconds, per request
+REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", 0.25))
+REDIS_CONNECT_TIMEOUT = float(os.getenv("REDIS_CONNECT_TIMEOUT", 0.25))
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", 20))
+REDIS_BREAKER_THRESHOLD = int(os.getenv("REDIS_BREAKER_THRESHOLD", 3))
+REDIS_BREAKER_RESET_SECONDS = float(os.getenv("REDIS_BREAKER_RESET_SECONDS", 15))
+
 def get_ip():
     from flask import request
     return request.headers.get("X-Real-IP") or request.headers.get("X-Forwarded-For") or request.remote_addr
 
-# 🔧 OPTIONAL: Create Redis client (only if needed elsewhere in your app)
-# If you're just using flask-limiter, this isn't strictly necessary.
-redis_client = Redis.from_url(storage_uri)
 
-# 🔒 Configure Limiter with Redis storage
+class RedisUnavailable(RedisConnectionError):
+    """Raised instead of calling Redis while the circuit is open."""
+
+
+class CircuitBreaker:
+    """Closed -> open after ``threshold`` consecutive connection failures.
+
+    While open every call fails fast; after ``reset_seconds`` a single probe
+    is let through (half-open) and its outcome closes or re-opens the circuit.
+    """
+
+    CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+    FAILURES = (RedisConnectionError, RedisTimeoutError)
+
+    def __init__(self, name, threshold, reset_seconds):
+        self.name = name
+        self.threshold = threshold
+        self.reset_seconds = reset_seconds
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_seconds:
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info(f"✅ {self.name} circuit closed")
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.threshold:
+                if self.state != self.OPEN:
+                    logger.warning(f"⚡ {self.name} circuit opened after {self.failures} failures")
+                    metrics.inc("revoubank_circuit_opened_total", help="Times a circuit breaker opened", circuit=self.name)
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def call(self, func, *args, **kwargs):
+        if not self.allow():
+            raise RedisUnavailable(f"{self.name} circuit is open")
+        try:
+            result = func(*args, **kwargs)
+        except self.FAILURES:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
+
+
+class LazyRedis:
+    """Redis client that connects on first use and routes calls through a breaker."""
+
+    def __init__(self, url, breaker):
+        self.url = url
+        self.breaker = breaker
+        self._client = None
+
+    @property
+    def client(self) -> Redis:
+        if self._client is None:
+            if not self.url:
+                raise RedisUnavailable("REDIS_URL is not configured")
+            pool = ConnectionPool.from_url(
+                self.url,
+                max_connections=REDIS_MAX_CONNECTIONS,
+                socket_timeout=REDIS_SOCKET_TIMEOUT,
+                socket_connect_timeout=REDIS_CONNECT_TIMEOUT,
+                health_check_interval=30,
+            )
+            self._client = Redis(connection_pool=pool)
+        return self._client
+
+    def pipeline(self, *args, **kwargs):
+        # Building a pipeline doesn't touch Redis; only execute passes the
+        # breaker, so a half-open probe is asked for (and settled) once
+        pipe = self.client.pipeline(*args, **kwargs)
+        execute = pipe.execute
+        pipe.execute = lambda *a, **kw: self.breaker.call(execute, *a, **kw)
+        return pipe
+
+    def register_script(self, script):
+        # Bytes skip the encoder lookup, which would otherwise need a connection
+        return Script(self, script.encode() if isinstance(script, str) else script)
+
+    def __getattr__(self, name):
+        attr = getattr(self.client, name)
+        if not callable(attr):
+            return attr
+
+        def guarded(*args, **kwargs):
+            return self.breaker.call(attr, *args, **kwargs)
+        return guarded
+
+
+redis_breaker = CircuitBreaker("redis", REDIS_BREAKER_THRESHOLD, REDIS_BREAKER_RESET_SECONDS)
+redis_client = LazyRedis(storage_uri, redis_breaker)
+
+metrics.gauge(
+    "revoubank_redis_circuit_state",
+    lambda: {CircuitBreaker.CLOSED: 0, CircuitBreaker.HALF_OPEN: 1, CircuitBreaker.OPEN: 2}[redis_breaker.state],
+    help="Redis circuit breaker state (0=closed, 1=half-open, 2=open)",
+)
+
+# 🔒 Configure Limiter with Redis storage, falling back to per-worker memory
 limiter = Limiter(
     key_func=get_ip,
-    storage_uri=storage_uri,  # ✅ Use your Upstash Redis URI
+    storage_uri=storage_uri or "memory://",
+    storage_options={
+        "socket_timeout": REDIS_SOCKET_TIMEOUT,
+        "socket_connect_timeout": REDIS_CONNECT_TIMEOUT,
+    },
+    in_memory_fallback_enabled=True,
+    swallow_errors=True,
 )
@@ -0,0 +1,44 @@
+# app/core/http_cache.py
+import hashlib
+from flask import current_app, request
+from sqlalchemy import func
+
+
+def make_etag(*parts) -> str:
+    """Digest of a version marker (e.g. row count and max id), not of the body.
+
+    Callers compute the marker before loading rows. If a write lands in
+    between, the tag is older than the body, which only costs the client one
+    extra full response later, never a stale 304.
+    """
+    return hashlib.sha1(repr(parts).encode()).hexdigest()
+
+
+def etag_matches(etag: str) -> bool:
+    return request.if_none_match.contains_weak(etag)
+
+
+def not_modified(etag: str):
+    response = current_app.response_class(status=304)
+    response.set_etag(etag, weak=True)
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+
+def with_etag(response, etag: str):
+    if response.status_code == 200:
+        response.set_etag(etag, weak=True)
+        response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+
+def query_version(query, model) -> tuple:
+    """``(count, max id[, max updated_at])`` over the rows ``query`` selects.
+
+    Count catches deletes, max id catches inserts and ``updated_at`` catches
+    in-place edits; one aggregate, no rows loaded.
+    """
+    columns = [func.count(model.id), func.max(model.id)]
+    if hasattr(model, "updated_at"):
+        columns.append(func.max(model.updated_at))
+    return tuple(query.order_by(None).with_entities(*columns).one())
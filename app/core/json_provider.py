@@ -0,0 +1,40 @@
+# app/core/json_provider.py
+from decimal import Decimal
+import orjson
+from flask.json.provider import JSONProvider
+
+OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(obj):
+    # Money is stored as Numeric; keep it exact on the wire, as Flask always has
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if hasattr(obj, "__html__"):
+        return str(obj.__html__())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class OrjsonProvider(JSONProvider):
+    """JSON provider backed by orjson.
+
+    datetime/date/UUID/dataclasses are encoded natively (ISO 8601 for
+    datetimes), Decimal as its exact string form.
+    """
+
+    mimetype = "application/json"
+
+    def _options(self):
+        return OPTIONS | orjson.OPT_INDENT_2 if self._app.debug else OPTIONS
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, default=_default, option=self._options()).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        # Hand the bytes straight to the response; no str round trip
+        body = orjson.dumps(obj, default=_default, option=self._options() | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
@@ -0,0 +1,95 @@
+from datetime import datetime
+from redis.exceptions import RedisError
+from app.core import extensions
+from app.core.logger import logger
+
+# Failure counters and lock markers live in Redis so a burst of bad passwords
+# doesn't turn into a burst of UPDATEs on the users table. Only the lock event
+# itself (and the unlock that follows it) is written to the database.
+FAILURES_KEY = "login:failures:{}"
+LOCKED_KEY = "login:locked:{}"
+
+
+def _redis():
+    return extensions.redis_client
+
+
+def _seconds(duration):
+    return max(1, int(duration.total_seconds()))
+
+
+def is_locked_out(username: str) -> bool:
+    """Cheap Redis-only check used before touching the database."""
+    try:
+        return bool(_redis().exists(LOCKED_KEY.format(username)))
+    except RedisError:
+        return False
+
+
+def check_lock(db, user, lock_duration) -> bool:
+    """Return True while ``user`` is locked; lifts the lock once it has expired."""
+    if not user.is_locked:
+        return False
+
+    if user.locked_time and datetime.utcnow() > user.locked_time + lock_duration:
+        user.is_locked = False
+        user.failed_attempts = 0
+        db.commit()
+        logger.info(f"🔓 Account unlocked: {user.username}")
+        return False
+
+    return True
+
+
+def register_failure(db, user, max_attempts, lock_duration):
+    """Count a failed login for ``user`` and lock the account on the last one.
+
+    Returns ``(attempts, locked)``. The counter is an atomic INCR + EXPIRE in
+    Redis; if Redis can't be reached we fall back to the ``failed_attempts``
+    column so the lock rules still hold.
+    """
+    key = FAILURES_KEY.format(user.username)
+    try:
+        pipe = _redis().pipeline(transaction=True)
+        pipe.incr(key)
+        pipe.expire(key, _seconds(lock_duration))
+        attempts = pipe.execute()[0]
+    except RedisError:
+        logger.warning(f"⚠️ Redis unavailable, counting failed login for '{user.username}' in the database")
+        user.failed_attempts = (user.failed_attempts or 0) + 1
+        attempts = user.failed_attempts
+        if attempts < max_attempts:
+            db.commit()
+
+    if attempts < max_attempts:
+        return attempts, False
+
+    user.failed_attempts = attempts
+    user.is_locked = True
+    user.locked_time = datetime.utcnow()
+    db.commit()
+
+    try:
+        pipe = _redis().pipeline(transaction=True)
+        pipe.set(LOCKED_KEY.format(user.username), user.locked_time.isoformat(), ex=_seconds(lock_duration))
+        pipe.delete(key)
+        pipe.execute()
+    except RedisError:
+        logger.warning(f"⚠️ Could not cache lock for '{user.username}' in Redis")
+
+    return attempts, True
+
+
+def clear(db, user):
+    """Reset lockout state after a successful login."""
+    try:
+        _redis().delete(FAILURES_KEY.format(user.username), LOCKED_KEY.format(user.username))
+    except RedisError:
+        logger.warning(f"⚠️ Could not clear login counters for '{user.username}' in Redis")
+
+    # Skip the write entirely on the common path where nothing was set.
+    if user.failed_attempts or user.is_locked or user.locked_time:
+        user.failed_attempts = 0
+        user.is_locked = False
+        user.locked_time = None
+        db.commit()
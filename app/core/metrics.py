@@ -0,0 +1,59 @@
+# app/core/metrics.py
+import threading
+from collections import defaultdict
+
+# Minimal per-worker metrics in Prometheus text format. Counters are bumped
+# from request code; gauges are callables evaluated when /metrics is scraped.
+_lock = threading.Lock()
+_counters = defaultdict(float)
+_gauges = {}
+_help = {}
+
+
+def _labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in sorted(labels.items())) + "}"
+
+
+def inc(name: str, amount: float = 1, help: str = "", **labels):
+    with _lock:
+        _counters[(name, _labels(labels))] += amount
+        if help:
+            _help.setdefault(name, (help, "counter"))
+
+
+def gauge(name: str, func, help: str = ""):
+    """Register ``func`` (no args, returns a number) as a gauge."""
+    _gauges[name] = func
+    if help:
+        _help[name] = (help, "gauge")
+
+
+def value(name: str, **labels) -> float:
+    return _counters.get((name, _labels(labels)), 0)
+
+
+def render() -> str:
+    lines = []
+    seen = set()
+
+    def header(name):
+        if name in seen or name not in _help:
+            return
+        seen.add(name)
+        text, kind = _help[name]
+        lines.append(f"# HELP {name} {text}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    for name, func in sorted(_gauges.items()):
+        header(name)
+        lines.append(f"{name} {func()}")
+
+    with _lock:
+        counters = sorted(_counters.items())
+    for (name, labels), amount in counters:
+        header(name)
+        lines.append(f"{name}{labels} {amount:g}")
+
+    return "\n".join(lines) + "\n"
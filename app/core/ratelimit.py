@@ -0,0 +1,230 @@
+# app/core/ratelimit.py
+import threading
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from typing import Callable, Optional
+from uuid import uuid4
+from flask import current_app, g, jsonify, request
+from limits import parse
+from redis.exceptions import RedisError
+from app.core import extensions, metrics
+from app.core.authorization import current_principal
+from app.core.logger import logger
+
+# Sliding-window log over every key of a request in a single round trip.
+# KEYS: one sorted set per rule. ARGV: now_ms, member, then (limit, window_ms)
+# per key. Nothing is recorded unless every rule allows the request, so a
+# rejected call doesn't eat into the caller's budget.
+SLIDING_WINDOW_LUA = """
+local now = tonumber(ARGV[1])
+local member = ARGV[2]
+local allowed = 1
+local result = {}
+for i, key in ipairs(KEYS) do
+    local limit = tonumber(ARGV[1 + i * 2])
+    local window = tonumber(ARGV[2 + i * 2])
+    redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+    local count = redis.call('ZCARD', key)
+    if count >= limit then
+        allowed = 0
+    end
+    local reset = now + window
+    local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+    if oldest[2] then
+        reset = tonumber(oldest[2]) + window
+    end
+    result[#result + 1] = count
+    result[#result + 1] = reset
+end
+if allowed == 1 then
+    for i, key in ipairs(KEYS) do
+        redis.call('ZADD', key, now, member)
+        redis.call('PEXPIRE', key, tonumber(ARGV[2 + i * 2]))
+        result[i * 2 - 1] = result[i * 2 - 1] + 1
+    end
+end
+table.insert(result, 1, allowed)
+return result
+"""
+
+
+@dataclass
+class SlidingWindow:
+    """One limit (e.g. ``"10 per minute"``) applied to the key ``key_func`` returns."""
+    limit: str
+    key_func: Callable[[], Optional[str]]
+    scope: str
+
+    def __post_init__(self):
+        item = parse(self.limit)
+        self.amount = item.amount
+        self.window_ms = item.get_expiry() * 1000
+
+
+@dataclass
+class RateLimitResult:
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_at: float
+
+
+def identity_key():
+    """Key by JWT identity, falling back to the client IP for anonymous calls."""
+    principal = current_principal()
+    return f"user:{principal.id}" if principal else f"ip:{extensions.get_ip()}"
+
+
+def account_key(*fields):
+    """Key by the caller and the first account id in the JSON body (e.g. ``sender_id``).
+
+    Limits run before the handler checks the account is the caller's, so
+    the caller is part of the key: nobody can spend another user's budget
+    by naming their account.
+    """
+    def key_func():
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return None
+        for field in fields:
+            if data.get(field) is not None:
+                return f"{identity_key()}:account:{data[field]}"
+        return None
+    return key_func
+
+
+def username_key():
+    data = request.get_json(silent=True)
+    username = data.get("username") if isinstance(data, dict) else None
+    return f"username:{username}" if username else None
+
+
+class LocalSlidingWindow:
+    """Per-worker stand-in for the Lua script while Redis is unreachable.
+
+    Same check-all-then-record semantics, but each worker only sees its own
+    traffic, so effective limits are multiplied by the number of workers.
+    """
+
+    SWEEP_EVERY = 1024
+
+    def __init__(self):
+        self._hits = defaultdict(deque)
+        self._lock = threading.Lock()
+        self._calls = 0
+        self._max_window = 0
+
+    def hit(self, keys, args):
+        now, limits = args[0], args[2:]
+        windows = list(zip(limits[::2], limits[1::2]))
+        result = []
+        with self._lock:
+            for key, (_, window) in zip(keys, windows):
+                hits = self._hits[key]
+                while hits and hits[0] <= now - window:
+                    hits.popleft()
+                result += [len(hits), (hits[0] if hits else now) + window]
+
+            allowed = all(count < limit for count, (limit, _) in zip(result[::2], windows))
+            if allowed:
+                for i, key in enumerate(keys):
+                    self._hits[key].append(now)
+                    result[i * 2] += 1
+
+            # Forget idle keys now and then so key-spraying can't grow this forever
+            self._max_window = max([self._max_window] + [w for _, w in windows])
+            self._calls += 1
+            if self._calls % self.SWEEP_EVERY == 0:
+                cutoff = now - self._max_window
+                for key in [k for k, hits in self._hits.items() if not hits or hits[-1] <= cutoff]:
+                    del self._hits[key]
+
+        return [int(allowed)] + result
+
+
+class SlidingWindowLimiter:
+    def __init__(self, prefix: str = "ratelimit"):
+        self.prefix = prefix
+        self._script = None
+        self.fallback = LocalSlidingWindow()
+
+    def _redis(self):
+        return extensions.redis_client
+
+    def _run(self, client, keys, args):
+        if self._script is None or self._script.registered_client is not client:
+            self._script = client.register_script(SLIDING_WINDOW_LUA)
+        return self._script(keys=keys, args=args, client=client)
+
+    def hit(self, windows_and_keys):
+        """Count one request against every ``(SlidingWindow, key)`` pair.
+
+        Returns the most restrictive :class:`RateLimitResult`. When Redis is
+        down (or its circuit is open) the per-worker fallback is used instead.
+        """
+        now_ms = int(time.time() * 1000)
+        keys = [f"{self.prefix}:{window.scope}:{key}" for window, key in windows_and_keys]
+        args = [now_ms, uuid4().hex]
+        for window, _ in windows_and_keys:
+            args += [window.amount, window.window_ms]
+
+        try:
+            raw = self._run(self._redis(), keys, args)
+        except RedisError as e:
+            logger.debug(f"Rate limiter using local fallback: {e}")
+            metrics.inc("revoubank_ratelimit_fallback_total", help="Rate limit checks served by the local fallback")
+            raw = self.fallback.hit(keys, args)
+
+        allowed = bool(raw[0])
+        results = [
+            RateLimitResult(
+                allowed=allowed,
+                limit=window.amount,
+                remaining=max(0, window.amount - int(count)),
+                reset_at=int(reset) / 1000,
+            )
+            for (window, _), count, reset in zip(windows_and_keys, raw[1::2], raw[2::2])
+        ]
+        return min(results, key=lambda r: (r.remaining, -r.reset_at))
+
+
+sliding_limiter = SlidingWindowLimiter()
+
+
+def rate_limit(blueprint, *windows):
+    """Enforce ``windows`` on every request to ``blueprint`` and add limit headers."""
+
+    @blueprint.before_request
+    def _check_rate_limit():
+        # Same switch flask-limiter uses, so one setting turns off all limits
+        if not current_app.config.get("RATELIMIT_ENABLED", True):
+            return None
+
+        pairs = [(window, window.key_func()) for window in windows]
+        pairs = [(window, key) for window, key in pairs if key]
+        if not pairs:
+            return None
+
+        result = sliding_limiter.hit(pairs)
+        g.rate_limit = result
+
+        if not result.allowed:
+            logger.warning(f"🚦 Rate limit exceeded for {request.method} {request.path}")
+            return jsonify({"detail": "Too many requests. Please slow down."}), 429
+        return None
+
+    @blueprint.after_request
+    def _add_rate_limit_headers(response):
+        result = g.pop("rate_limit", None)
+        if result is None:
+            return response
+
+        response.headers["X-RateLimit-Limit"] = str(result.limit)
+        response.headers["X-RateLimit-Remaining"] = str(result.remaining)
+        response.headers["X-RateLimit-Reset"] = str(int(result.reset_at))
+        if response.status_code == 429:
+            response.headers["Retry-After"] = str(max(1, int(result.reset_at - time.time())))
+        return response
+
+    return blueprint
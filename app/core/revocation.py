@@ -0,0 +1,105 @@
+import threading
+import time
+from redis.exceptions import RedisError
+from app.core import extensions
+from app.core.logger import logger
+from app.utils.bloom import BloomFilter
+from config import Config
+
+# One key per revoked JTI, expiring with the token itself, is the source of
+# truth. The log (a sorted set scored by revocation time) lets every worker
+# pull new revocations into its local Bloom filter in one call per interval.
+REVOKED_KEY = "jwt:revoked:{}"
+REVOKED_LOG = "jwt:revoked:log"
+# Tolerates small clock differences between the workers writing the log
+SYNC_OVERLAP_MS = 5_000
+
+
+def _redis():
+    return extensions.redis_client
+
+
+class RevocationStore:
+    """Revoked-token check that costs no network call for tokens never revoked.
+
+    A Bloom miss means "definitely not revoked". A hit is confirmed against
+    Redis, and treated as revoked if Redis can't be asked.
+    """
+
+    def __init__(self, max_token_lifetime: int, sync_seconds: float, capacity: int, error_rate: float):
+        self.max_token_lifetime = max_token_lifetime
+        self.sync_seconds = sync_seconds
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._cursor = 0
+        self._synced_at = 0.0
+        self._built_at = 0.0
+        self._lock = threading.Lock()
+
+    def revoke(self, jti: str, expires_at: int):
+        """Revoke ``jti`` until ``expires_at`` (epoch seconds, the token's ``exp``)."""
+        now_ms = int(time.time() * 1000)
+        ttl = max(1, int(expires_at - now_ms / 1000))
+
+        pipe = _redis().pipeline(transaction=True)
+        pipe.set(REVOKED_KEY.format(jti), 1, ex=ttl)
+        pipe.zadd(REVOKED_LOG, {jti: now_ms})
+        pipe.zremrangebyscore(REVOKED_LOG, "-inf", now_ms - self.max_token_lifetime * 1000)
+        pipe.execute()
+
+        with self._lock:
+            self._add(self._bloom, jti)
+
+    @staticmethod
+    def _add(bloom, jti):
+        if jti not in bloom:
+            bloom.add(jti)
+
+    def _sync(self):
+        client = _redis()
+        rebuild = time.monotonic() - self._built_at > self.max_token_lifetime
+
+        if rebuild:
+            # Bloom filters can't forget, so start over once every token that
+            # could be in the old one has expired anyway.
+            entries = client.zrange(REVOKED_LOG, 0, -1, withscores=True)
+            bloom = BloomFilter(max(self.capacity, len(entries) * 2), self.error_rate)
+        else:
+            entries = client.zrangebyscore(REVOKED_LOG, self._cursor - SYNC_OVERLAP_MS, "+inf", withscores=True)
+            bloom = self._bloom
+
+        with self._lock:
+            for jti, score in entries:
+                self._add(bloom, jti.decode() if isinstance(jti, bytes) else jti)
+                self._cursor = max(self._cursor, int(score))
+            self._bloom = bloom
+            self._synced_at = time.monotonic()
+            if rebuild:
+                self._built_at = self._synced_at
+
+    def is_revoked(self, jti: str) -> bool:
+        if time.monotonic() - self._synced_at > self.sync_seconds:
+            try:
+                self._sync()
+            except RedisError as e:
+                # Keep serving from the filter we have; retry next interval
+                self._synced_at = time.monotonic()
+                logger.debug(f"Revocation sync skipped: {e}")
+
+        if jti not in self._bloom:
+            return False
+
+        try:
+            return bool(_redis().exists(REVOKED_KEY.format(jti)))
+        except RedisError:
+            logger.warning(f"⚠️ Could not confirm revocation of token {jti}, rejecting it")
+            return True
+
+
+revocation_store = RevocationStore(
+    max_token_lifetime=Config.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+    sync_seconds=Config.REVOCATION_SYNC_SECONDS,
+    capacity=Config.REVOCATION_FILTER_CAPACITY,
+    error_rate=Config.REVOCATION_FILTER_FP_RATE,
+)
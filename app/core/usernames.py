@@ -0,0 +1,118 @@
+import threading
+import time
+from datetime import datetime, timedelta
+from uuid import uuid4
+from sqlalchemy import select, func
+from sqlalchemy.exc import SQLAlchemyError
+from app.core.logger import logger
+from app.model.models import User
+from app.utils.bloom import BloomFilter
+from config import Config
+
+MIN_CAPACITY = 1024
+# Rows committed slightly out of order can carry an updated_at older than the
+# last high-water mark, so every refresh re-reads a small overlap window.
+REFRESH_OVERLAP = timedelta(minutes=5)
+
+
+class UsernameFilter:
+    """Per-worker Bloom filter of existing usernames.
+
+    A miss means the username definitely doesn't exist, so login can reject it
+    without querying the users table. Hits (including false positives and
+    renamed-away names) fall through to the normal lookup.
+    """
+
+    def __init__(self, error_rate: float, refresh_seconds: int):
+        self.error_rate = error_rate
+        self.refresh_seconds = refresh_seconds
+        self._bloom = None
+        self._high_water = None
+        self._synced_at = 0.0
+        self._lock = threading.Lock()
+
+    def rebuild(self, db):
+        """Load every username from the database into a fresh filter."""
+        total = db.execute(select(func.count(User.id))).scalar() or 0
+        high_water = db.execute(select(func.max(User.updated_at))).scalar()
+
+        bloom = BloomFilter(max(total * 2, MIN_CAPACITY), self.error_rate)
+        names = db.execute(select(User.username).execution_options(yield_per=10_000)).scalars()
+        for name in names:
+            bloom.add(name)
+
+        with self._lock:
+            self._bloom = bloom
+            self._high_water = high_water or datetime.min
+            self._synced_at = time.monotonic()
+
+        logger.info(f"🧮 Username filter rebuilt with {bloom.count} names ({bloom.size_bytes} bytes)")
+        return bloom
+
+    def _refresh(self, db):
+        since = max(self._high_water, datetime.min + REFRESH_OVERLAP) - REFRESH_OVERLAP
+        rows = db.execute(
+            select(User.username, User.updated_at).where(User.updated_at > since)
+        ).all()
+
+        with self._lock:
+            for name, updated_at in rows:
+                self._add(name)
+                if updated_at and updated_at > self._high_water:
+                    self._high_water = updated_at
+            self._synced_at = time.monotonic()
+
+        if self._bloom.count > self._bloom.capacity:
+            self.rebuild(db)
+
+    def _add(self, username):
+        if username not in self._bloom:
+            self._bloom.add(username)
+
+    def add(self, username: str):
+        """Record a newly registered or renamed username."""
+        if self._bloom is None or not username:
+            return
+        with self._lock:
+            self._add(username)
+
+    def might_exist(self, db, username: str) -> bool:
+        if not username:
+            return False
+
+        try:
+            if self._bloom is None:
+                self.rebuild(db)
+            elif time.monotonic() - self._synced_at > self.refresh_seconds:
+                self._refresh(db)
+        except SQLAlchemyError:
+            # Never turn a filter problem into a false "unknown user".
+            logger.warning("⚠️ Username filter sync failed, falling back to database lookup", exc_info=True)
+            return True
+
+        return username in self._bloom
+
+    def report(self, probes: int = 10_000) -> dict:
+        """Memory and false-positive figures for the current filter."""
+        if self._bloom is None:
+            return {"built": False}
+
+        bloom = self._bloom
+        false_positives = sum(1 for _ in range(probes) if f"probe-{uuid4().hex}" in bloom)
+        return {
+            "built": True,
+            "entries": bloom.count,
+            "capacity": bloom.capacity,
+            "bits": bloom.num_bits,
+            "bytes": bloom.size_bytes,
+            "hashes": bloom.num_hashes,
+            "target_fp_rate": bloom.error_rate,
+            "expected_fp_rate": round(bloom.expected_error_rate(), 6),
+            "measured_fp_rate": false_positives / probes if probes else 0.0,
+        }
+
+
+username_filter = UsernameFilter(
+    error_rate=Config.USERNAME_FILTER_FP_RATE,
+    refresh_seconds=Config.USERNAME_FILTER_REFRESH_SECONDS,
+)
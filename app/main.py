@@ -2,9 +2,20 @@ from app.__init__ import create_app
 from config import Config
 from flask import request, jsonify, redirect
 from flasgger import Swagger
+from sqlalchemy.exc import SQLAlchemyError
+from app.core.logger import logger
+from app.core.usernames import username_filter
+from app.database.dependency import get_db
 
 app = create_app()
 
+# ✅ Build this worker's username filter up front instead of on the first login
+try:
+    with get_db() as db:
+        username_filter.rebuild(db)
+except SQLAlchemyError:
+    logger.warning("⚠️ Username filter not built at startup, it will be built on first login", exc_info=True)
+
 # ✅ Register Swagger immediately (this is the key!)
 swagger_template = {
     "swagger": "2.0",
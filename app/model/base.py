@@ -1,13 +1,23 @@
+from flask import g, has_request_context
 from app.database.db import db
 from app.database.db import SessionLocal
 
 def get_db():
     db_session = SessionLocal()
+    # Routes use next(get_db()), which finalizes this generator straight away;
+    # remember the session so close_request_sessions() can return its
+    # connection to the pool when the request ends.
+    if has_request_context():
+        g.setdefault("_db_sessions", []).append(db_session)
     try:
         yield db_session
     finally:
         db_session.close()
 
+def close_request_sessions(exc=None):
+    for db_session in g.pop("_db_sessions", []):
+        db_session.close()
+
 def create_tables():
     from app.model import models  # ensure models are loaded
     db.create_all()
@@ -1,8 +1,10 @@
 from app.database.db import db
 from datetime import datetime
 from sqlalchemy.orm import relationship
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, Date, Boolean, DateTime, event
+from sqlalchemy import Column, Integer, String, ForeignKey, Date, Boolean, DateTime, Index, event, false, text
 import uuid
+from app.model.types import Money
+from app.utils.money import to_units
 #from app.model.base import Base
 
 class User(db.Model):
@@ -19,7 +21,7 @@ class User(db.Model):
     is_locked = db.Column(db.Boolean, default=False)
     locked_time = db.Column(db.DateTime)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     is_verified = db.Column(db.Boolean, default=False)
     
     accounts = db.relationship(
@@ -36,7 +38,12 @@ class Account(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     account_type = db.Column(db.String(50), nullable=False)
     account_number = db.Column(db.String, nullable=False, unique=True)
-    balance = db.Column(db.Numeric(precision=10, scale=2), nullable=False)
+    # Cached projection of the ledger: the balance including every posting
+    # up to balance_posting_id. Later postings are added on read.
+    balance = db.Column(Money, nullable=False)
+    balance_posting_id = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    # More than one: "hot" account whose credits go to this many sub-balance slots
+    balance_slots = db.Column(db.Integer, nullable=False, default=1, server_default="1")
     is_deleted = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -45,12 +52,13 @@ class Account(db.Model):
     "User",
     back_populates="accounts"
 )
-    def as_dict(self):
+    def as_dict(self, balance):
+        """``balance`` is the live balance; the column lags the ledger."""
         return {
             "id": self.id,
             "user_id": self.user_id,
             "account_type": self.account_type,
-            "balance": float(self.balance),
+            "balance": to_units(balance),
             "account_number": self.account_number
         }
 
@@ -68,44 +76,239 @@ class Transaction(db.Model):
 
     id = Column(Integer, primary_key=True)
     type = Column(String(50), nullable=False)
-    amount = Column(Float, nullable=False)
+    amount = Column(Money, nullable=False)
     timestamp = Column(DateTime, default=datetime.utcnow)
     sender_id = Column(Integer, ForeignKey('accounts.id'), nullable=True)
     receiver_id = Column(Integer, ForeignKey('accounts.id'), nullable=True)
+    # Owners of sender/receiver accounts, copied at write time so per-user
+    # history is an index range scan instead of an IN over every account
+    sender_user_id = Column(Integer, ForeignKey('users.id'), nullable=True)
+    receiver_user_id = Column(Integer, ForeignKey('users.id'), nullable=True)
+    # Account balances right after this transaction, so a historical balance
+    # is the latest row at or before a timestamp
+    sender_balance_after = Column(Money, nullable=True)
+    receiver_balance_after = Column(Money, nullable=True)
 
     sender = relationship("Account", foreign_keys=[sender_id])
     receiver = relationship("Account", foreign_keys=[receiver_id])
     bank_name = Column(String(100), nullable=True)
     external_account_number = Column(String(100), nullable=True)
+    # The partner bank's id for a settled deposit; unique per bank so a
+    # settlement file can be imported twice without crediting twice
+    external_reference = Column(String(64), nullable=True)
+    # External withdrawals stay "pending" until the partner bank settles
+    # (or rejects) the batch they were sent in
+    status = Column(String(20), nullable=False, default="completed", server_default="completed")
+    # Bumped when a status changes in place; part of the listing's ETag version
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    settlement_batch_id = Column(Integer, ForeignKey('settlement_batches.id'), nullable=True, index=True)
     biller_name = Column(String(100), nullable=True)
     payment_method = Column(String(50), nullable=True)
 
+    __table_args__ = (
+        Index('ix_transactions_sender_user_id_timestamp', 'sender_user_id', 'timestamp'),
+        Index('ix_transactions_receiver_user_id_timestamp', 'receiver_user_id', 'timestamp'),
+        Index('ix_transactions_sender_id_timestamp', 'sender_id', 'timestamp'),
+        Index('ix_transactions_receiver_id_timestamp', 'receiver_id', 'timestamp'),
+        Index('ix_transactions_timestamp', 'timestamp'),
+        Index('uq_transactions_bank_name_external_reference', 'bank_name', 'external_reference', unique=True),
+        # Only the few withdrawals still waiting for a batch are indexed
+        Index('ix_transactions_unbatched', 'bank_name', 'id',
+              postgresql_where=text("status = 'pending' AND settlement_batch_id IS NULL"),
+              sqlite_where=text("status = 'pending' AND settlement_batch_id IS NULL")),
+    )
 
-    
     def as_dict(self):
         return {
             "id": self.id,
             "type": self.type,
-            "amount": self.amount,
+            "amount": to_units(self.amount),
             "timestamp": self.timestamp.isoformat(),
             "sender_id": self.sender_id,
             "receiver_id": self.receiver_id,
             "bank_name": self.bank_name,
             "external_account_number": self.external_account_number,
             "biller_name": self.biller_name,
-            "payment_method": self.payment_method
+            "payment_method": self.payment_method,
+            "status": self.status,
+            "sender_balance_after": to_units(self.sender_balance_after),
+            "receiver_balance_after": to_units(self.receiver_balance_after)
         }
 
+
+class LedgerPosting(db.Model):
+    """One leg of a transaction; each transaction appends a debit and a credit summing to zero.
+
+    ``account_id`` is set for customer accounts; the other side of money
+    entering or leaving the bank is booked to a named ``ledger`` instead.
+    """
+    __tablename__ = 'ledger_postings'
+    id = Column(Integer, primary_key=True)
+    transaction_id = Column(Integer, ForeignKey('transactions.id'), nullable=False, index=True)
+    account_id = Column(Integer, ForeignKey('accounts.id'), nullable=True)
+    ledger = Column(String(50), nullable=False)
+    amount = Column(Money, nullable=False)  # signed: debits negative, credits positive
+    # Set on credits to a hot account: counted in that AccountBalanceSlot
+    # instead of the account's projection
+    slot = Column(Integer, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index('ix_ledger_postings_account_id_id', 'account_id', 'id'),
+    )
+
+
+class AccountBalanceSlot(db.Model):
+    """Sub-balance of a hot account: credits since the last fold, spread over slots."""
+    __tablename__ = 'account_balance_slots'
+    account_id = Column(Integer, ForeignKey('accounts.id'), primary_key=True)
+    slot = Column(Integer, primary_key=True)
+    balance = Column(Money, nullable=False, default=0)
+
+
+class Authorization(db.Model):
+    """A card hold: reserves funds on an account until captured, released or expired.
+
+    Held amounts count against the available balance only; the ledger
+    balance changes when a hold is captured into a transaction.
+    """
+    __tablename__ = 'authorizations'
+    id = Column(Integer, primary_key=True)
+    account_id = Column(Integer, ForeignKey('accounts.id'), nullable=False)
+    user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
+    bill_id = Column(Integer, ForeignKey('bills.id'), nullable=True)
+    transaction_id = Column(Integer, ForeignKey('transactions.id'), nullable=True)
+    amount = Column(Money, nullable=False)
+    biller_name = Column(String(100), nullable=True)
+    # held -> captured | released | expired
+    status = Column(String(20), nullable=False, default="held")
+    created_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False)
+    closed_at = Column(DateTime, nullable=True)
+
+    transaction = relationship("Transaction")
+
+    __table_args__ = (
+        # Both only cover live holds: the sweeper walks expires_at from the
+        # oldest, available balances sum an account's holds
+        Index('ix_authorizations_held_expires_at', 'expires_at',
+              postgresql_where=text("status = 'held'"), sqlite_where=text("status = 'held'")),
+        Index('ix_authorizations_held_account_id', 'account_id', 'expires_at',
+              postgresql_where=text("status = 'held'"), sqlite_where=text("status = 'held'")),
+        Index('ix_authorizations_bill_id', 'bill_id'),
+    )
+
+
+class SettlementBatch(db.Model):
+    """External withdrawals sent to one partner bank together, ACH-style.
+
+    open -> submitting -> submitted -> settled. A submission that fails goes
+    back to open and is retried.
+    """
+    __tablename__ = 'settlement_batches'
+    id = Column(Integer, primary_key=True)
+    bank_name = Column(String(100), nullable=False)
+    status = Column(String(20), nullable=False, default="open", index=True)
+    item_count = Column(Integer, nullable=False)
+    total = Column(Money, nullable=False)
+    gateway_reference = Column(String(64), nullable=True, unique=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    submitted_at = Column(DateTime, nullable=True)
+    settled_at = Column(DateTime, nullable=True)
+
+
+class SettlementStagingRow(db.Model):
+    """A validated settlement file row waiting to be applied; removed once its import ends."""
+    __tablename__ = 'settlement_staging'
+    import_id = Column(String(32), primary_key=True)
+    line = Column(Integer, primary_key=True)
+    reference = Column(String(64), nullable=False)
+    account_number = Column(String, nullable=False)
+    external_account_number = Column(String(100), nullable=True)
+    amount = Column(Money, nullable=False)
+    # Set while applying: applied, duplicate or unknown_account
+    status = Column(String(20), nullable=True)
+
+    __table_args__ = (
+        # Repeated references within an import are found through this
+        Index('ix_settlement_staging_import_id_reference', 'import_id', 'reference', 'line'),
+    )
+
+
+class ScheduledTransfer(db.Model):
+    """A transfer to run later, once or as a standing order.
+
+    active -> paused | completed | failed. Runs fall on ``start_at`` plus
+    whole intervals; ``next_run_at`` is the next one due.
+    """
+    __tablename__ = 'scheduled_transfers'
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey('users.id'), nullable=False, index=True)
+    sender_id = Column(Integer, ForeignKey('accounts.id'), nullable=False)
+    receiver_id = Column(Integer, ForeignKey('accounts.id'), nullable=False)
+    amount = Column(Money, nullable=False)
+    # once, daily, weekly or monthly
+    interval = Column(String(10), nullable=False, default="once")
+    start_at = Column(DateTime, nullable=False)
+    end_at = Column(DateTime, nullable=True)
+    next_run_at = Column(DateTime, nullable=True)
+    status = Column(String(20), nullable=False, default="active")
+    # Set while an executor runs it; a claim older than the executor's
+    # timeout is taken over
+    claimed_at = Column(DateTime, nullable=True)
+    last_run_at = Column(DateTime, nullable=True)
+    last_transaction_id = Column(Integer, ForeignKey('transactions.id'), nullable=True)
+    last_error = Column(String(255), nullable=True)
+    run_count = Column(Integer, nullable=False, default=0)
+    # Consecutive failed runs
+    failure_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        # Executors claim due runs from the oldest through this
+        Index('ix_scheduled_transfers_due', 'next_run_at',
+              postgresql_where=text("status = 'active'"), sqlite_where=text("status = 'active'")),
+    )
+
+    def as_dict(self):
+        return {
+            "id": self.id,
+            "sender_id": self.sender_id,
+            "receiver_id": self.receiver_id,
+            "amount": to_units(self.amount),
+            "interval": self.interval,
+            "start_at": self.start_at.isoformat(),
+            "end_at": self.end_at.isoformat() if self.end_at else None,
+            "next_run_at": self.next_run_at.isoformat() if self.next_run_at else None,
+            "status": self.status,
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+            "last_transaction_id": self.last_transaction_id,
+            "last_error": self.last_error,
+            "run_count": self.run_count
+        }
+
+
+class AccountBalanceSnapshot(db.Model):
+    """Closing balance of an account at the end of a day (UTC)."""
+    __tablename__ = 'account_balance_snapshots'
+    account_id = Column(Integer, ForeignKey('accounts.id'), primary_key=True)
+    date = Column(Date, primary_key=True)
+    closing_balance = Column(Money, nullable=False)
+
+
 class Budget(db.Model):
     __tablename__ = 'budgets'
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
     category = db.Column(db.String(50), nullable=False)
     #name = Column(String(100), nullable=False)
-    amount = Column(Float, nullable=False)
+    amount = Column(Money, nullable=False)
     start_date = Column(Date, nullable=True)
     end_date = Column(Date, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 class TransactionCategory(db.Model):
     __tablename__ = 'transaction_categories'
@@ -113,6 +316,7 @@ class TransactionCategory(db.Model):
     user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
     name = Column(String(100), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 class Bill(db.Model):
     __tablename__ = 'bills'
@@ -120,10 +324,25 @@ class Bill(db.Model):
     user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
     biller_name = Column(String(100), nullable=False)
     due_date = Column(Date, nullable=False)
-    amount = Column(Float, nullable=False)
+    amount = Column(Money, nullable=False)
     account_id = Column(Integer, ForeignKey('accounts.id'), nullable=False)
     is_paid = Column(Boolean, default=False)
+    # Paid from account_id by the daily autopay run once due
+    autopay = Column(Boolean, nullable=False, default=False, server_default=false())
+    # Set by the reminder job: once it is past due unpaid, and when the
+    # owner was last reminded of it
+    is_overdue = Column(Boolean, nullable=False, default=False, server_default=false())
+    reminded_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     
-    account = db.relationship('Account', backref='bills')
\ No newline at end of file
+    account = db.relationship('Account', backref='bills')
+
+    __table_args__ = (
+        # Due-date scans (autopay, reminders) only ever want unpaid bills
+        Index('ix_bills_unpaid_due_date', 'due_date',
+              postgresql_where=text("is_paid = false"), sqlite_where=text("is_paid = 0")),
+        # A user's bills, filtered by paid state and paged by due date
+        Index('ix_bills_user_id_is_paid_due_date', 'user_id', 'is_paid', 'due_date'),
+    )
\ No newline at end of file
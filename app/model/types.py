@@ -0,0 +1,24 @@
+from sqlalchemy.types import BigInteger, TypeDecorator
+
+
+class Money(TypeDecorator):
+    """An amount of money as whole cents (minor units) in a BIGINT column.
+
+    Python sees plain ``int`` cents, so handlers add and compare integers and
+    nothing drifts. Anything that isn't a whole number of cents is refused
+    on the way in rather than silently rounded.
+    """
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None or type(value) is int:
+            return value
+        cents = int(value)
+        if cents != value:
+            raise ValueError(f"Money columns hold whole cents, got {value!r}")
+        return cents
+
+    def process_result_value(self, value, dialect):
+        # SUM() of a BIGINT comes back as NUMERIC on PostgreSQL
+        return value if value is None or type(value) is int else int(value)
@@ -9,8 +9,12 @@ from app.core.authorization import role_required
 from app.schemas import AccountCreate, AccountResponse
 from decimal import Decimal
 from datetime import datetime
+from app.services.accounts.balance import balance_as_of, parse_as_of
+from app.services.accounts.series import parse_range, series_cache
+from app.services.ledger.projection import live_balances
 from app.services.accounts.core import create_account_logic, list_user_accounts_logic, get_user_account_by_id_logic, update_user_account_logic, delete_user_account_logic
 from app.utils.pagination import apply_pagination
+from app.utils.money import to_units
 from uuid import uuid4
 
 accounts_bp = Blueprint('accounts', __name__)
@@ -106,12 +110,13 @@ def list_user_accounts():
     try:
         query = db.query(Account).filter_by(is_deleted=False)
         total, paginated_accounts = apply_pagination(query)
+        balances = live_balances(db, [acc.id for acc in paginated_accounts])
 
         return jsonify({
             "total": total,
             "page": request.args.get("page", 1, type=int),
             "per_page": request.args.get("per_page", 10, type=int),
-            "accounts": [acc.as_dict() for acc in paginated_accounts]
+            "accounts": [acc.as_dict(balances[acc.id]) for acc in paginated_accounts]
         })
 
     except Exception as e:
@@ -152,6 +157,87 @@ def get_account(id):
         return make_response(jsonify({"detail": str(e)}), 500)
 
 
+@accounts_bp.route("/<int:id>/balance", methods=["GET"])
+@role_required("user")
+@swag_from({
+    'tags': ['Accounts'],
+    'summary': 'Historical account balance',
+    'description': 'Balance of an account owned by the authenticated user at a point in time.',
+    'parameters': [
+        {'name': 'id', 'in': 'path', 'type': 'integer', 'required': True},
+        {'name': 'as_of', 'in': 'query', 'type': 'string', 'required': False, 'example': '2025-01-31T18:00:00',
+         'description': 'ISO 8601 timestamp; a bare date means the end of that day. Defaults to now.'}
+    ],
+    'responses': {
+        200: {'description': 'Balance at the requested time'},
+        400: {'description': 'Invalid as_of'},
+        404: {'description': 'Account not found or unauthorized'}
+    }
+})
+def get_balance_as_of(id):
+    current_user = get_current_user()
+    db = next(get_db())
+
+    try:
+        as_of = parse_as_of(request.args.get("as_of"))
+    except ValueError as e:
+        return make_response(jsonify({"detail": str(e)}), 400)
+
+    account = db.query(Account).filter_by(id=id, user_id=current_user["id"], is_deleted=False).first()
+    if not account:
+        return make_response(jsonify({"detail": "Account not found or unauthorized"}), 404)
+
+    return jsonify({
+        "account_id": account.id,
+        "as_of": as_of.isoformat(),
+        "balance": to_units(balance_as_of(db, account, as_of))
+    })
+
+
+@accounts_bp.route("/<int:id>/balance-series", methods=["GET"])
+@role_required("user")
+@swag_from({
+    'tags': ['Accounts'],
+    'summary': 'Balance time series',
+    'description': 'Closing balance per day, week or month for an account owned by the authenticated user.',
+    'parameters': [
+        {'name': 'id', 'in': 'path', 'type': 'integer', 'required': True},
+        {'name': 'from', 'in': 'query', 'type': 'string', 'required': False, 'example': '2025-01-01',
+         'description': 'First day (inclusive). Defaults to 29 days before to.'},
+        {'name': 'to', 'in': 'query', 'type': 'string', 'required': False, 'example': '2025-01-31',
+         'description': 'Last day (inclusive). Defaults to today (UTC).'},
+        {'name': 'bucket', 'in': 'query', 'type': 'string', 'enum': ['day', 'week', 'month'], 'default': 'day', 'required': False}
+    ],
+    'responses': {
+        200: {'description': 'Closing balance per bucket'},
+        400: {'description': 'Invalid range or bucket'},
+        404: {'description': 'Account not found or unauthorized'}
+    }
+})
+def get_balance_series(id):
+    current_user = get_current_user()
+    db = next(get_db())
+    bucket = request.args.get("bucket", "day")
+
+    try:
+        first, last = parse_range(request.args.get("from"), request.args.get("to"), bucket)
+    except ValueError as e:
+        return make_response(jsonify({"detail": str(e)}), 400)
+
+    account = db.query(Account).filter_by(id=id, user_id=current_user["id"], is_deleted=False).first()
+    if not account:
+        return make_response(jsonify({"detail": "Account not found or unauthorized"}), 404)
+
+    series = series_cache.get(db, account, first, last, bucket)
+    return jsonify({
+        "account_id": account.id,
+        "bucket": bucket,
+        "from": first.isoformat(),
+        "to": last.isoformat(),
+        "series": series.as_list()
+    })
+
+
 @accounts_bp.route("/<int:id>", methods=["PUT"])
 @swag_from({
     "tags": ["Accounts"],
@@ -1,6 +1,8 @@
 # app/routes/auth.py
 from app.core.logger import logger
 from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt
+from redis.exceptions import RedisError
 from flasgger import swag_from
 from app.core.extensions import limiter
 from app.utils.user import verify_password
@@ -8,14 +10,23 @@ from app.model.models import User
 from app.database.dependency import get_db  
 from app.services.email.utils import send_email_async
 from app.core.auth import generate_access_token
+from app.core import lockout
+from app.core.usernames import username_filter
+from app.core.revocation import revocation_store
+from app.core.ratelimit import rate_limit, SlidingWindow, username_key
 from app.utils.token import confirm_verification_token
 from config import Config
-from datetime import datetime
 from collections import OrderedDict
 
 
 auth_bp = Blueprint("auth", __name__)
 
+# Per-username budget on top of the per-IP limit, so rotating proxies don't help
+rate_limit(
+    auth_bp,
+    SlidingWindow(Config.RATE_LIMIT_PER_USERNAME, key_func=username_key, scope="login:username"),
+)
+
 login_schema = {
     "type": "object",
     "properties": OrderedDict([
@@ -64,9 +75,19 @@ def login():
 
         logger.info(f"🔐 Login attempt for user: {username}")
 
+        # Locked accounts are rejected from Redis before touching the database
+        if lockout.is_locked_out(username):
+            logger.warning(f"🔒 Login blocked: account '{username}' is locked")
+            return jsonify({
+                "detail": "Account is locked due to multiple failed login attempts. Please try again later."
+            }), 403
+
         # Check if the user exists
         with get_db() as db:
-            user = db.query(User).filter_by(username=username).first()
+            # Names the filter has never seen are rejected without a user lookup
+            user = None
+            if username_filter.might_exist(db, username):
+                user = db.query(User).filter_by(username=username).first()
 
             if not user:
                 logger.warning(f"❌ Login failed: username '{username}' not found")
@@ -76,25 +97,19 @@ def login():
                 }), 400
 
             # If account is locked, handle the lock logic
-            if user.is_locked:
-                if user.locked_time and datetime.utcnow() > user.locked_time + Config.LOCK_DURATION:
-                    user.is_locked = False
-                    user.failed_attempts = 0
-                    db.commit()
-                    logger.info(f"🔓 Account unlocked: {username}")
-                else:
-                    logger.warning(f"🔒 Login blocked: account '{username}' is locked")
-                    return jsonify({
-                        "detail": "Account is locked due to multiple failed login attempts. Please try again later."
-                    }), 403
+            if lockout.check_lock(db, user, Config.LOCK_DURATION):
+                logger.warning(f"🔒 Login blocked: account '{username}' is locked")
+                return jsonify({
+                    "detail": "Account is locked due to multiple failed login attempts. Please try again later."
+                }), 403
 
             # Check the password
             if not verify_password(password, user.password):
-                user.failed_attempts += 1
+                attempts, locked = lockout.register_failure(
+                    db, user, Config.MAX_FAILED_ATTEMPTS, Config.LOCK_DURATION
+                )
 
-                if user.failed_attempts >= Config.MAX_FAILED_ATTEMPTS:
-                    user.is_locked = True
-                    user.locked_time = datetime.utcnow()
+                if locked:
                     send_email_async(
                         subject="Your RevouBank Account is Locked",
                         recipient=user.email,
@@ -108,9 +123,8 @@ def login():
                         """
                     )
                     logger.warning(f"🔒 Account locked due to too many failed attempts: {username}")
-                db.commit()
 
-                attempts_left = max(0, Config.MAX_FAILED_ATTEMPTS - user.failed_attempts)
+                attempts_left = max(0, Config.MAX_FAILED_ATTEMPTS - attempts)
                 logger.warning(f"❌ Incorrect password for user '{username}' — {attempts_left} attempts left")
                 return jsonify({
                     "detail": "Incorrect username or password.",
@@ -123,10 +137,7 @@ def login():
                 return jsonify({"detail": "Account not verified. Please check your email."}), 403
 
             # If verification is successful, clear any failed attempts and proceed with login
-            user.failed_attempts = 0
-            user.is_locked = False
-            user.locked_time = None
-            db.commit()
+            lockout.clear(db, user)
 
             access_token = generate_access_token(user)
             logger.info(f"✅ Login successful for user: {username}")
@@ -161,11 +172,23 @@ def verify_email(token):
 @auth_bp.route("/logout", methods=["POST"])
 @swag_from({
     "tags": ["Auth"],
-    "summary": "Logout (client-side only)",
-    "description": "This route simply tells clients to delete the token. JWTs are stateless.",
+    "summary": "Logout",
+    "description": "Revokes the current access token for the rest of its lifetime.",
     "responses": {
-        "200": {"description": "Logout successful (token should be deleted client-side)"}
-    }
+        "200": {"description": "Logout successful, token revoked"},
+        "401": {"description": "Missing, invalid or already revoked token"},
+        "503": {"description": "Token could not be revoked right now"}
+    },
+    "security": [{"Bearer": []}]
 })
+@jwt_required()
 def logout():
-    return jsonify({"message": "Logout successful. Please delete your token on the client side."}), 200
\ No newline at end of file
+    claims = get_jwt()
+    try:
+        revocation_store.revoke(claims["jti"], claims["exp"])
+    except RedisError:
+        logger.error(f"❌ Could not revoke token for user {claims.get('sub')}", exc_info=True)
+        return jsonify({"detail": "Logout is temporarily unavailable. Please try again."}), 503
+
+    logger.info(f"👋 Token revoked for user {claims.get('sub')}")
+    return jsonify({"message": "Logout successful. Token has been revoked."}), 200
\ No newline at end of file
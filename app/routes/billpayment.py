@@ -1,16 +1,30 @@
 from flask import Blueprint, request, jsonify
 from app.core.logger import logger
 from flasgger.utils import swag_from
-from app.services.transactions.core import handle_pay_bill_from_balance, handle_pay_bill_with_card
+from app.services.transactions.core import (
+    handle_authorize_bill_with_card,
+    handle_capture_authorization,
+    handle_pay_bill_from_balance,
+    handle_pay_bill_with_card,
+    handle_release_authorization,
+)
 from app.model.base import get_db
 from app.core.auth import get_current_user
 from app.core.authorization import role_required
+from app.core.ratelimit import rate_limit, SlidingWindow, identity_key
+from app.utils.money import format_money
+from config import Config
 
 
 
 
 billpayment_bp = Blueprint('billpayment', __name__, url_prefix="/bills")
 
+rate_limit(
+    billpayment_bp,
+    SlidingWindow(Config.RATE_LIMIT_PER_USER, key_func=identity_key, scope="billpayment:user"),
+)
+
 @billpayment_bp.route("/<int:bill_id>/pay/card", methods=["POST"])
 @role_required('user')
 @swag_from({
@@ -54,7 +68,7 @@ def pay_bill_with_card(bill_id):
     """Handles bill payment using a credit card."""
     db = next(get_db())
     try:
-        current_user = get_current_user()
+        current_user = get_current_user(fresh=True)
 
         if not request.is_json:
             return jsonify({"detail": "Unsupported Media Type"}), 415
@@ -68,9 +82,9 @@ def pay_bill_with_card(bill_id):
         transaction, account = handle_pay_bill_with_card(db, current_user, bill_id, card_number)
 
         return jsonify({
-            "message": f"Successfully paid ${transaction.amount} to {transaction.biller_name} using credit card",
+            "message": f"Successfully paid ${format_money(transaction.amount)} to {transaction.biller_name} using credit card",
             "transaction_id": transaction.id,
-            "balance": account.balance
+            "balance": format_money(transaction.sender_balance_after)
         })
 
     except Exception as e:
@@ -108,15 +122,148 @@ def pay_bill_from_balance(bill_id):
     """Handles bill payment using current user's account balance."""
     db = next(get_db())
     try:
-        current_user = get_current_user()
+        current_user = get_current_user(fresh=True)
         transaction, account = handle_pay_bill_from_balance(db, current_user, bill_id)
         return jsonify({
-            "message": f"Successfully paid ${transaction.amount} to {transaction.biller_name} from account balance",
+            "message": f"Successfully paid ${format_money(transaction.amount)} to {transaction.biller_name} from account balance",
             "transaction_id": transaction.id,
-            "balance": account.balance
+            "balance": format_money(transaction.sender_balance_after)
         })
 
     except Exception as e:
         db.rollback()
         logger.error("❌ Error during bill payment from balance", exc_info=True)
-        return jsonify({"detail": str(e)}), 400
\ No newline at end of file
+        return jsonify({"detail": str(e)}), 400
+
+
+
+@billpayment_bp.route("/<int:bill_id>/authorize/card", methods=["POST"])
+@role_required('user')
+@swag_from({
+    "tags": ["Bill Payment"],
+    "summary": "Authorize a bill payment on a credit card",
+    "description": "Places a hold for the bill amount. The hold lowers the available balance until it is captured, released or expires.",
+    "consumes": ["application/json"],
+    "produces": ["application/json"],
+    "parameters": [
+        {
+            "name": "bill_id",
+            "in": "path",
+            "type": "integer",
+            "required": True,
+            "description": "ID of the bill to authorize"
+        },
+        {
+            "name": "body",
+            "in": "body",
+            "required": True,
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "card_number": {"type": "string", "example": "4111111111111111"}
+                },
+                "required": ["card_number"]
+            }
+        }
+    ],
+    "responses": {
+        "201": {"description": "Authorization placed"},
+        "400": {"description": "Invalid credit card, insufficient funds or bill already held"},
+        "404": {"description": "Bill not found"}
+    }
+})
+def authorize_bill_with_card(bill_id):
+    """Places a card hold for a bill."""
+    db = next(get_db())
+    try:
+        current_user = get_current_user(fresh=True)
+
+        if not request.is_json:
+            return jsonify({"detail": "Unsupported Media Type"}), 415
+
+        card_number = request.get_json().get("card_number")
+        if not card_number:
+            return jsonify({"detail": "Missing card_number"}), 400
+
+        authorization, account = handle_authorize_bill_with_card(db, current_user, bill_id, card_number)
+        return jsonify({
+            "authorization_id": authorization.id,
+            "amount": format_money(authorization.amount),
+            "status": authorization.status,
+            "expires_at": authorization.expires_at.isoformat()
+        }), 201
+
+    except LookupError as e:
+        return jsonify({"detail": str(e)}), 404
+    except Exception as e:
+        db.rollback()
+        logger.error("❌ Error during card authorization", exc_info=True)
+        return jsonify({"detail": str(e)}), 400
+
+
+@billpayment_bp.route("/authorizations/<int:authorization_id>/capture", methods=["POST"])
+@role_required('user')
+@swag_from({
+    "tags": ["Bill Payment"],
+    "summary": "Capture a card authorization",
+    "description": "Pays the bill held by a live authorization.",
+    "produces": ["application/json"],
+    "parameters": [
+        {"name": "authorization_id", "in": "path", "type": "integer", "required": True}
+    ],
+    "responses": {
+        "200": {"description": "Bill payment successful"},
+        "400": {"description": "Authorization is no longer held"},
+        "404": {"description": "Authorization not found"}
+    }
+})
+def capture_authorization(authorization_id):
+    """Captures a held authorization into its bill payment."""
+    db = next(get_db())
+    try:
+        current_user = get_current_user(fresh=True)
+        transaction, account = handle_capture_authorization(db, current_user, authorization_id)
+        return jsonify({
+            "message": f"Successfully paid ${format_money(transaction.amount)} to {transaction.biller_name} using credit card",
+            "transaction_id": transaction.id,
+            "balance": format_money(transaction.sender_balance_after)
+        })
+
+    except LookupError as e:
+        return jsonify({"detail": str(e)}), 404
+    except Exception as e:
+        db.rollback()
+        logger.error("❌ Error capturing card authorization", exc_info=True)
+        return jsonify({"detail": str(e)}), 400
+
+
+@billpayment_bp.route("/authorizations/<int:authorization_id>/release", methods=["POST"])
+@role_required('user')
+@swag_from({
+    "tags": ["Bill Payment"],
+    "summary": "Release a card authorization",
+    "description": "Drops a held authorization without paying.",
+    "produces": ["application/json"],
+    "parameters": [
+        {"name": "authorization_id", "in": "path", "type": "integer", "required": True}
+    ],
+    "responses": {
+        "200": {"description": "Authorization released"},
+        "400": {"description": "Authorization is no longer held"},
+        "404": {"description": "Authorization not found"}
+    }
+})
+def release_authorization(authorization_id):
+    """Releases a held authorization."""
+    db = next(get_db())
+    try:
+        current_user = get_current_user(fresh=True)
+        authorization, account = handle_release_authorization(db, current_user, authorization_id)
+        return jsonify({"authorization_id": authorization.id, "status": authorization.status})
+
+    except LookupError as e:
+        return jsonify({"detail": str(e)}), 404
+    except Exception as e:
+        db.rollback()
+        logger.error("❌ Error releasing card authorization", exc_info=True)
+        return jsonify({"detail": str(e)}), 400
@@ -3,9 +3,11 @@ from flasgger.utils import swag_from
 from app.model.base import get_db
 from app.core.auth import get_current_user
 from app.core.authorization import role_required
+from app.core.http_cache import make_etag, etag_matches, not_modified, with_etag, query_version
 from app.model.models import Bill
-from decimal import Decimal
-from datetime import datetime
+from app.services.bills.listing import MAX_LIMIT, bill_filters, list_bills_page
+from app.utils.money import to_cents, to_units
+from datetime import date, datetime
 from app.core.logger import logger
 
 
@@ -13,6 +15,13 @@ from app.core.logger import logger
 bills_bp = Blueprint("bills", __name__, url_prefix="/bills")
 
 
+def _autopay_flag(data):
+    autopay = data.get("autopay", False)
+    if not isinstance(autopay, bool):
+        raise ValueError("autopay must be true or false")
+    return autopay
+
+
 @bills_bp.route("/", methods=["POST"])
 @role_required('user')
 @swag_from({
@@ -29,7 +38,8 @@ bills_bp = Blueprint("bills", __name__, url_prefix="/bills")
                     "biller_name": {"type": "string", "example": "Water Utility"},
                     "due_date": {"type": "string", "example": "2025-03-31"},
                     "amount": {"type": "number", "example": 75.25},
-                    "account_id": {"type": "integer", "example": 1}
+                    "account_id": {"type": "integer", "example": 1},
+                    "autopay": {"type": "boolean", "example": False}
                 },
                 "required": ["biller_name", "due_date", "amount", "account_id"]
             }
@@ -51,8 +61,9 @@ def create_bill():
             user_id=current_user["id"],
             biller_name=data["biller_name"],
             due_date=datetime.fromisoformat(data["due_date"]),
-            amount=Decimal(data["amount"]),
-            account_id=data["account_id"]
+            amount=to_cents(data["amount"]),
+            account_id=data["account_id"],
+            autopay=_autopay_flag(data)
         )
         db.add(bill)
         db.commit()
@@ -69,26 +80,52 @@ def create_bill():
 @role_required('user')
 @swag_from({
     "tags": ["Bills"],
-    "summary": "Get all bills for current user",
+    "summary": "List bills for current user",
+    "description": "Bills by due date, earliest first, a page at a time. Pass next_cursor back as cursor for the following page.",
+    "parameters": [
+        {"name": "is_paid", "in": "query", "type": "boolean", "required": False},
+        {"name": "due_from", "in": "query", "type": "string", "example": "2025-03-01", "required": False,
+         "description": "Earliest due date (inclusive)"},
+        {"name": "due_to", "in": "query", "type": "string", "example": "2025-03-31", "required": False,
+         "description": "Latest due date (inclusive)"},
+        {"name": "account_id", "in": "query", "type": "integer", "required": False},
+        {"name": "limit", "in": "query", "type": "integer", "default": 20, "required": False,
+         "description": f"Bills per page, at most {MAX_LIMIT}"},
+        {"name": "cursor", "in": "query", "type": "string", "required": False}
+    ],
     "responses": {
-        "200": {"description": "List of bills"}
+        "200": {"description": "A page of bills"},
+        "400": {"description": "Invalid filter or cursor"}
     }
 })
 def get_bills():
     db = next(get_db())
     current_user = get_current_user()
-    logger.info(f"Fetching all bills for user {current_user['id']}")
-    
+    logger.info(f"Fetching bills for user {current_user['id']}")
+
+    args = request.args
+    try:
+        is_paid = {"true": True, "false": False}[args["is_paid"].lower()] if "is_paid" in args else None
+        due_from = date.fromisoformat(args["due_from"]) if "due_from" in args else None
+        due_to = date.fromisoformat(args["due_to"]) if "due_to" in args else None
+        account_id = int(args["account_id"]) if "account_id" in args else None
+        limit = min(max(int(args.get("limit", 20)), 1), MAX_LIMIT)
+    except (KeyError, ValueError):
+        return jsonify({"detail": "Invalid filter: is_paid is true or false, dates are YYYY-MM-DD, ids and limit are integers"}), 400
+    cursor = args.get("cursor")
+
     try:
-        bills = db.query(Bill).filter_by(user_id=current_user["id"]).all()
+        conditions = bill_filters(current_user["id"], is_paid, due_from, due_to, account_id)
+        etag = make_etag("bills", current_user["id"], sorted(args.items()),
+                         query_version(db.query(Bill).filter(*conditions), Bill))
+        if etag_matches(etag):
+            return not_modified(etag)
+
+        bills, next_cursor = list_bills_page(db, conditions, limit, cursor)
         logger.info(f"Successfully retrieved {len(bills)} bills for user {current_user['id']}")
-        return jsonify([{
-            "id": bill.id,
-            "biller_name": bill.biller_name,
-            "due_date": bill.due_date.isoformat(),
-            "amount": float(bill.amount),
-            "is_paid": bill.is_paid
-        } for bill in bills]), 200
+        return with_etag(jsonify({"bills": bills, "next_cursor": next_cursor}), etag)
+    except ValueError as e:
+        return jsonify({"detail": str(e)}), 400
     except Exception as e:
         logger.error(f"Error fetching bills for user {current_user['id']}: {str(e)}")
         return jsonify({"detail": "Error fetching bills"}), 500
@@ -115,7 +152,8 @@ def get_bills():
                 "properties": {
                     "biller_name": {"type": "string"},
                     "due_date": {"type": "string"},
-                    "amount": {"type": "number"}
+                    "amount": {"type": "number"},
+                    "autopay": {"type": "boolean"}
                 }
             }
         }
@@ -143,8 +181,13 @@ def update_bill(bill_id):
             bill.biller_name = data["biller_name"]
         if "due_date" in data:
             bill.due_date = datetime.fromisoformat(data["due_date"])
+            # Reminded of (and overdue) again against the new date
+            bill.is_overdue = False
+            bill.reminded_at = None
         if "amount" in data:
-            bill.amount = Decimal(data["amount"])
+            bill.amount = to_cents(data["amount"])
+        if "autopay" in data:
+            bill.autopay = _autopay_flag(data)
 
         db.commit()
         logger.info(f"Bill {bill_id} successfully updated by user {current_user['id']}")
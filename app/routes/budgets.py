@@ -3,9 +3,10 @@ from flasgger.utils import swag_from
 from app.model.base import get_db
 from app.core.auth import get_current_user
 from app.core.authorization import role_required
+from app.core.http_cache import make_etag, etag_matches, not_modified, with_etag, query_version
 from app.model.models import Budget
 from app.core.logger import logger
-from decimal import Decimal
+from app.utils.money import to_cents, to_units
 
 budgets_bp = Blueprint("budgets", __name__, url_prefix="/budgets")
 
@@ -47,7 +48,7 @@ def create_budget():
         budget = Budget(
             user_id=current_user["id"],
             category=data["category"],
-            amount=Decimal(data["amount"])
+            amount=to_cents(data["amount"])
         )
         db.add(budget)
         db.commit()
@@ -74,13 +75,18 @@ def get_budgets():
     logger.info(f"Fetching all budgets for user {current_user['id']}")
     
     try:
-        budgets = db.query(Budget).filter_by(user_id=current_user["id"]).all()
+        query = db.query(Budget).filter_by(user_id=current_user["id"])
+        etag = make_etag("budgets", current_user["id"], query_version(query, Budget))
+        if etag_matches(etag):
+            return not_modified(etag)
+
+        budgets = query.all()
         logger.info(f"Successfully retrieved {len(budgets)} budgets for user {current_user['id']}")
-        return jsonify([{
+        return with_etag(jsonify([{
             "id": b.id,
             "category": b.category,
-            "amount": float(b.amount)
-        } for b in budgets])
+            "amount": to_units(b.amount)
+        } for b in budgets]), etag)
     except Exception as e:
         logger.error(f"Error fetching budgets for user {current_user['id']}: {str(e)}")
         return jsonify({"detail": "Error fetching budgets"}), 500
@@ -127,7 +133,7 @@ def update_budget(budget_id):
         if "category" in data:
             budget.category = data["category"]
         if "amount" in data:
-            budget.amount = Decimal(data["amount"])
+            budget.amount = to_cents(data["amount"])
 
         db.commit()
         logger.info(f"Budget {budget_id} successfully updated by user {current_user['id']}")
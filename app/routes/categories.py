@@ -4,6 +4,7 @@ from app.core.logger import logger
 from app.model.base import get_db
 from app.core.auth import get_current_user
 from app.core.authorization import role_required
+from app.core.http_cache import make_etag, etag_matches, not_modified, with_etag, query_version
 from app.model.models import TransactionCategory
 
 categories_bp = Blueprint("categories", __name__, url_prefix="/categories")
@@ -56,12 +57,16 @@ def create_category():
 def get_categories():
     db = next(get_db())
     current_user = get_current_user()
-    categories = db.query(TransactionCategory).filter_by(user_id=current_user["id"]).all()
+    query = db.query(TransactionCategory).filter_by(user_id=current_user["id"])
+    etag = make_etag("categories", current_user["id"], query_version(query, TransactionCategory))
+    if etag_matches(etag):
+        return not_modified(etag)
 
-    return jsonify([{
+    categories = query.all()
+    return with_etag(jsonify([{
         "id": c.id,
         "name": c.name
-    } for c in categories])
+    } for c in categories]), etag)
 
 
 @categories_bp.route("/<int:category_id>", methods=["PUT"])
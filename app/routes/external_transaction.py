@@ -1,3 +1,4 @@
+import io
 from flask import Blueprint, request, jsonify
 from app.core.logger import logger
 from threading import Thread
@@ -9,11 +10,22 @@ from app.model.models import Account, Transaction
 from app.core.auth import get_current_user
 from app.services.email.utils import send_email_async
 from app.services.invoice.invoice_generator import generate_invoice
-from app.services.transactions.core import handle_external_deposit, handle_external_withdrawal
+from app.services.settlements.ingest import import_settlement
+from app.services.settlements.parsing import FORMATS
+from app.services.transactions.batching import deposit_batcher
+from app.services.transactions.core import credited_balance, handle_external_deposit, handle_external_withdrawal
+from app.utils.money import format_money
 from app.core.authorization import role_required
+from app.core.ratelimit import rate_limit, SlidingWindow, identity_key
+from config import Config
 
 external_transaction_bp = Blueprint('external_transaction', __name__)
 
+rate_limit(
+    external_transaction_bp,
+    SlidingWindow(Config.RATE_LIMIT_PER_USER, key_func=identity_key, scope="external:user"),
+)
+
 
 def run_background_task(func, *args, **kwargs):
     thread = Thread(target=func, args=args, kwargs=kwargs)
@@ -65,7 +77,7 @@ def run_background_task(func, *args, **kwargs):
 def external_deposit():
     """Handles Deposit from external bank."""
     db = next(get_db())
-    current_user = get_current_user()
+    current_user = get_current_user(fresh=True)
 
     if not request.is_json:
         logger.warning("❗ Unsupported media type for external deposit request")
@@ -79,12 +91,15 @@ def external_deposit():
         return jsonify({"detail": f"Missing fields: {', '.join(missing)}"}), 400
 
     try:
-        transaction, account = handle_external_deposit(db, current_user, data)
+        if Config.EXTERNAL_DEPOSIT_BATCHING:
+            transaction, account = deposit_batcher.submit(current_user, data)
+        else:
+            transaction, account = handle_external_deposit(db, current_user, data)
 
         return jsonify({
             "message": f"Successfully deposited ${data['amount']} from {data['bank_name']}",
             "transaction_id": transaction.id,
-            "balance": account.balance
+            "balance": format_money(credited_balance(db, transaction))
         })
 
     except ValueError as e:
@@ -133,7 +148,7 @@ def external_deposit():
         }
     ],
     "responses": {
-        "200": {"description": "Withdrawal successful"},
+        "200": {"description": "Withdrawal accepted, pending settlement by the partner bank"},
         "400": {"description": "Insufficient funds"},
         "404": {"description": "RevouBank account not found"}
     }
@@ -142,7 +157,7 @@ def external_deposit():
 def external_withdraw():
     """Handles withdrawal to external bank."""
     db = next(get_db())
-    current_user = get_current_user()
+    current_user = get_current_user(fresh=True)
 
     if not request.is_json:
         logger.warning("❗ Unsupported media type for external withdrawal request")
@@ -160,12 +175,54 @@ def external_withdraw():
     try:
         transaction, account = handle_external_withdrawal(db, current_user, data)
         return jsonify({
-            "message": f"Withdrawal of ${data['amount']} to {data['bank_name']} successful",
+            "message": f"Withdrawal of ${data['amount']} to {data['bank_name']} submitted for settlement",
             "transaction_id": transaction.id,
-            "balance": account.balance
+            "status": transaction.status,
+            "balance": format_money(transaction.sender_balance_after)
         })
 
     except Exception as e:
         db.rollback()
         logger.error("❌ Error during external withdrawal", exc_info=True)
         return jsonify({"detail": f"Error: {str(e)}"}), 400
+
+
+@external_transaction_bp.route("/external/settlements/", methods=["POST"])
+@role_required("admin")
+@swag_from({
+    "tags": ["External Transactions"],
+    "summary": "Import a partner settlement file",
+    "description": "Credits every deposit in a partner bank's CSV or fixed-width settlement file. "
+                   "References already imported for that bank are skipped.",
+    "consumes": ["multipart/form-data"],
+    "produces": ["application/json"],
+    "parameters": [
+        {"in": "formData", "name": "file", "type": "file", "required": True},
+        {"in": "formData", "name": "bank_name", "type": "string", "required": True},
+        {"in": "formData", "name": "format", "type": "string", "enum": list(FORMATS), "default": "csv"}
+    ],
+    "responses": {
+        "200": {"description": "Import report"},
+        "400": {"description": "Missing file or unreadable settlement file"}
+    }
+})
+def import_settlement_file():
+    """Stream-imports an uploaded settlement file."""
+    db = next(get_db())
+    upload = request.files.get("file")
+    bank_name = request.form.get("bank_name")
+    file_format = request.form.get("format", "csv")
+
+    if upload is None or not bank_name:
+        return jsonify({"detail": "file and bank_name are required"}), 400
+
+    try:
+        # Large uploads are spooled to disk by Werkzeug; read them as a text stream
+        stream = io.TextIOWrapper(upload.stream, encoding="utf-8", newline="")
+        return jsonify(import_settlement(db, stream, bank_name, file_format))
+    except (ValueError, UnicodeDecodeError) as e:
+        logger.warning(f"🚫 Rejected settlement file from {bank_name}: {e}")
+        return jsonify({"detail": str(e)}), 400
+    except Exception:
+        logger.error("❌ Unhandled error during settlement import", exc_info=True)
+        return jsonify({"detail": "Internal Server Error"}), 500
@@ -0,0 +1,36 @@
+from flask import Blueprint, request, jsonify
+from app.core.logger import logger
+from app.model.base import get_db
+from app.services.gateway.client import SIGNATURE_HEADER, verify_signature
+from app.services.gateway.settlement import apply_callback
+from config import Config
+
+# Called by the partner bank gateway, not by users: authenticated by the
+# shared-secret signature and kept out of the per-user rate limits
+gateway_bp = Blueprint("gateway", __name__)
+
+
+@gateway_bp.route("/external/gateway/callback", methods=["POST"])
+def settlement_callback():
+    """Settlement outcomes for a submitted batch (not shown in Swagger)."""
+    body = request.get_data()
+    if not verify_signature(body, request.headers.get(SIGNATURE_HEADER, ""), Config.GATEWAY_SECRET):
+        logger.warning("🚫 Settlement callback with a bad signature")
+        return jsonify({"detail": "Invalid signature"}), 401
+
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict):
+        return jsonify({"detail": "Invalid JSON body"}), 400
+
+    db = next(get_db())
+    try:
+        return jsonify(apply_callback(db, payload))
+    except LookupError as e:
+        return jsonify({"detail": str(e)}), 404
+    except (ValueError, TypeError, KeyError) as e:
+        db.rollback()
+        return jsonify({"detail": f"Invalid callback: {e}"}), 400
+    except Exception:
+        db.rollback()
+        logger.error("❌ Unhandled error applying settlement callback", exc_info=True)
+        return jsonify({"detail": "Internal Server Error"}), 500
@@ -0,0 +1,15 @@
+from flask import Blueprint, Response
+from app.core import metrics
+from app.core.authorization import role_required
+
+metrics_bp = Blueprint("metrics", __name__)
+
+
+@metrics_bp.route("/metrics", methods=["GET"])
+@role_required("admin")
+def export_metrics():
+    """Per-worker metrics in Prometheus text format (not shown in Swagger).
+
+    Admin only; scrapers send an admin bearer token.
+    """
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
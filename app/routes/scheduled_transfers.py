@@ -0,0 +1,181 @@
+from flask import Blueprint, request, jsonify
+from flasgger.utils import swag_from
+from app.model.base import get_db
+from app.model.models import ScheduledTransfer
+from app.core.auth import get_current_user
+from app.core.authorization import role_required
+from app.core.logger import logger
+from app.services.scheduled_transfers.schedule import (
+    create_scheduled_transfer,
+    delete_scheduled_transfer,
+    get_scheduled_transfer,
+    update_scheduled_transfer,
+)
+
+scheduled_transfers_bp = Blueprint("scheduled_transfers", __name__, url_prefix="/scheduled-transfers")
+
+SCHEDULE_PROPERTIES = {
+    "amount": {"type": "number", "example": 50.00},
+    "interval": {"type": "string", "enum": ["once", "daily", "weekly", "monthly"], "example": "monthly"},
+    "start_at": {"type": "string", "example": "2026-11-01T09:00:00"},
+    "end_at": {"type": "string", "example": "2027-11-01T09:00:00"},
+}
+
+
+def _error_response(db, e):
+    db.rollback()
+    if isinstance(e, LookupError):
+        return jsonify({"detail": str(e)}), 404
+    if isinstance(e, PermissionError):
+        return jsonify({"detail": str(e)}), 403
+    return jsonify({"detail": str(e)}), 400
+
+
+@scheduled_transfers_bp.route("/", methods=["POST"])
+@role_required('user')
+@swag_from({
+    "tags": ["Scheduled Transfers"],
+    "summary": "Schedule a transfer",
+    "description": "Schedules a one-off transfer, or a standing order repeating daily, weekly or monthly from start_at.",
+    "parameters": [
+        {
+            "name": "body",
+            "in": "body",
+            "required": True,
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "sender_id": {"type": "integer", "example": 1},
+                    "receiver_id": {"type": "integer", "example": 2},
+                    **SCHEDULE_PROPERTIES
+                },
+                "required": ["sender_id", "receiver_id", "amount"]
+            }
+        }
+    ],
+    "responses": {
+        "201": {"description": "Transfer scheduled"},
+        "400": {"description": "Invalid input"},
+        "403": {"description": "Sender account not owned by the user"},
+        "404": {"description": "Receiver account not found"}
+    }
+})
+def create_schedule():
+    db = next(get_db())
+    current_user = get_current_user()
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"detail": "Invalid JSON payload."}), 400
+
+    try:
+        schedule = create_scheduled_transfer(db, current_user, data)
+        return jsonify(schedule.as_dict()), 201
+    except (ValueError, LookupError, PermissionError) as e:
+        return _error_response(db, e)
+
+
+@scheduled_transfers_bp.route("/", methods=["GET"])
+@role_required('user')
+@swag_from({
+    "tags": ["Scheduled Transfers"],
+    "summary": "List scheduled transfers",
+    "responses": {
+        "200": {"description": "The user's scheduled transfers"}
+    }
+})
+def list_schedules():
+    db = next(get_db())
+    current_user = get_current_user()
+    schedules = (
+        db.query(ScheduledTransfer)
+        .filter_by(user_id=current_user["id"])
+        .order_by(ScheduledTransfer.id)
+        .all()
+    )
+    return jsonify([schedule.as_dict() for schedule in schedules])
+
+
+@scheduled_transfers_bp.route("/<int:schedule_id>", methods=["GET"])
+@role_required('user')
+@swag_from({
+    "tags": ["Scheduled Transfers"],
+    "summary": "Get a scheduled transfer",
+    "parameters": [
+        {"name": "schedule_id", "in": "path", "type": "integer", "required": True}
+    ],
+    "responses": {
+        "200": {"description": "The scheduled transfer"},
+        "404": {"description": "Scheduled transfer not found"}
+    }
+})
+def get_schedule(schedule_id):
+    db = next(get_db())
+    try:
+        return jsonify(get_scheduled_transfer(db, get_current_user(), schedule_id).as_dict())
+    except LookupError as e:
+        return _error_response(db, e)
+
+
+@scheduled_transfers_bp.route("/<int:schedule_id>", methods=["PUT"])
+@role_required('user')
+@swag_from({
+    "tags": ["Scheduled Transfers"],
+    "summary": "Update a scheduled transfer",
+    "description": "Changes the amount or timing, or pauses and resumes it with status.",
+    "parameters": [
+        {"name": "schedule_id", "in": "path", "type": "integer", "required": True},
+        {
+            "name": "body",
+            "in": "body",
+            "schema": {
+                "type": "object",
+                "properties": {
+                    **SCHEDULE_PROPERTIES,
+                    "status": {"type": "string", "enum": ["active", "paused"]}
+                }
+            }
+        }
+    ],
+    "responses": {
+        "200": {"description": "Scheduled transfer updated"},
+        "400": {"description": "Invalid input"},
+        "404": {"description": "Scheduled transfer not found"}
+    }
+})
+def update_schedule(schedule_id):
+    db = next(get_db())
+    current_user = get_current_user()
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"detail": "Invalid JSON payload."}), 400
+
+    try:
+        return jsonify(update_scheduled_transfer(db, current_user, schedule_id, data).as_dict())
+    except (ValueError, LookupError) as e:
+        return _error_response(db, e)
+
+
+@scheduled_transfers_bp.route("/<int:schedule_id>", methods=["DELETE"])
+@role_required('user')
+@swag_from({
+    "tags": ["Scheduled Transfers"],
+    "summary": "Delete a scheduled transfer",
+    "parameters": [
+        {"name": "schedule_id", "in": "path", "type": "integer", "required": True}
+    ],
+    "responses": {
+        "200": {"description": "Scheduled transfer deleted"},
+        "404": {"description": "Scheduled transfer not found"}
+    }
+})
+def delete_schedule(schedule_id):
+    db = next(get_db())
+    try:
+        delete_scheduled_transfer(db, get_current_user(), schedule_id)
+        return jsonify({"message": "Scheduled transfer deleted"}), 200
+    except LookupError as e:
+        return _error_response(db, e)
+    except Exception:
+        db.rollback()
+        logger.error(f"❌ Error deleting scheduled transfer {schedule_id}", exc_info=True)
+        return jsonify({"detail": "Error deleting scheduled transfer"}), 500
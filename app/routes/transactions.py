@@ -1,16 +1,22 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from app.core.logger import logger
 from flasgger.utils import swag_from
 from werkzeug.exceptions import BadRequest, NotFound
-from decimal import Decimal
 from datetime import datetime
 from sqlalchemy.orm import Session
 from app.model.base import get_db
 from app.model.models import Account, Transaction, User
 from app.core.auth import get_current_user
-from app.services.transactions.core import handle_deposit, handle_withdrawal, handle_transfer
+from app.services.transactions.core import credited_balance, handle_deposit, handle_withdrawal, handle_transfer
+from app.services.transactions.export import EXPORT_FORMATS, iter_export, parse_bound
+from app.services.transactions.listing import list_transactions_page, transaction_row
+from app.services.ledger.projection import current_balance
+from app.services.authorizations.balance import ledger_and_available
 from app.core.authorization import role_required
-from app.utils.pagination import apply_pagination
+from app.core.http_cache import make_etag, etag_matches, not_modified, with_etag
+from app.core.ratelimit import rate_limit, SlidingWindow, identity_key, account_key
+from app.utils.money import format_money, to_cents
+from config import Config
 
 transactions_bp = Blueprint('transactions', __name__)
 
@@ -29,6 +35,13 @@ def validate_content_type():
             return jsonify({"detail": "Invalid JSON payload."}), 400
 
 
+rate_limit(
+    transactions_bp,
+    SlidingWindow(Config.RATE_LIMIT_PER_USER, key_func=identity_key, scope="transactions:user"),
+    SlidingWindow(Config.RATE_LIMIT_PER_ACCOUNT, key_func=account_key("sender_id", "receiver_id"), scope="transactions:account"),
+)
+
+
 @transactions_bp.route('/deposit/', methods=['POST'])
 @role_required('user')
 @swag_from({
@@ -71,16 +84,15 @@ def validate_content_type():
 def deposit():
     """Handles Deposit for authenticated users."""
     db = next(get_db())
-    current_user = get_current_user()
+    current_user = get_current_user(fresh=True)
 
     if not request.is_json:
         return jsonify({"detail": "Unsupported Media Type"}), 415
 
     try:
         data = request.get_json()
-        amount = Decimal(str(data.get("amount")))
+        amount = to_cents(data.get("amount"))
         receiver_id = int(data.get("receiver_id"))
-        current_user = get_current_user()
 
         logger.info(f"📥 Deposit attempt by {current_user['username']} to account {receiver_id}")
 
@@ -89,7 +101,7 @@ def deposit():
         return jsonify({
             "message": "Deposit successful",
             "transaction_id": transaction.id,
-            "balance": account.balance
+            "balance": format_money(credited_balance(db, transaction))
         })
 
     except ValueError as e:
@@ -163,23 +175,23 @@ def withdraw():
 
         try:
             data = request.get_json()
-            amount = Decimal(str(data["amount"]))
+            amount = to_cents(data["amount"])
             sender_id = int(data["sender_id"])
-            current_user = get_current_user()
-        except (ValueError, TypeError, Decimal.InvalidOperation):
+            current_user = get_current_user(fresh=True)
+        except (ValueError, TypeError):
             return jsonify({"detail": "Invalid amount or sender_id format"}), 400
 
         transaction, account = handle_withdrawal(db, current_user, amount, sender_id)
 
         logger.info(
-                    f"✅ Withdrawal of ${amount} successful from account {sender_id} by user {current_user['username']} - Transaction ID: {transaction.id}"
+                    f"✅ Withdrawal of ${format_money(amount)} successful from account {sender_id} by user {current_user['username']} - Transaction ID: {transaction.id}"
 )
 
 
         return jsonify({
             "message": "Withdrawal successful",
             "transaction_id": transaction.id,
-            "balance": account.balance
+            "balance": format_money(transaction.sender_balance_after)
         })
 
     except (TypeError, ValueError) as e:
@@ -250,13 +262,13 @@ def transfer():
             return jsonify({"detail": "Missing required fields: sender_id, receiver_id, amount"}), 400
 
         try:
-            amount = Decimal(str(data["amount"]))
+            amount = to_cents(data["amount"])
             sender_id = int(data["sender_id"])
             receiver_id = int(data["receiver_id"])
-        except (ValueError, TypeError, Decimal.InvalidOperation):
+        except (ValueError, TypeError):
             return jsonify({"detail": "Invalid amount, sender_id, or receiver_id format"}), 400
 
-        current_user = get_current_user()
+        current_user = get_current_user(fresh=True)
 
         result = handle_transfer(db, current_user, amount, sender_id, receiver_id)
 
@@ -269,7 +281,7 @@ def transfer():
         return jsonify({
             "message": "Transfer successful",
             "transaction_id": transaction.id,
-            "sender_balance": sender.balance
+            "sender_balance": format_money(transaction.sender_balance_after)
         })
 
     except Exception as e:
@@ -316,28 +328,68 @@ def list_transactions():
 
     db = next(get_db())
 
-    accounts = db.query(Account).filter_by(user_id=current_user["id"]).all()
-    account_ids = [acc.id for acc in accounts]
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = max(request.args.get('per_page', 10, type=int), 1)
 
-    if not account_ids:
-        return jsonify([])
+    total, version, rows = list_transactions_page(db, current_user["id"], page, per_page)
 
-    page = request.args.get('page', 1, type=int)
-    per_page = request.args.get('per_page', 10, type=int)
+    # New rows move count + max id; in-place status changes (settlement
+    # callbacks) move the latest updated_at; the page's ids catch reordering.
+    # Rows are only converted once a 304 is ruled out.
+    etag = make_etag("transactions", current_user["id"], page, per_page, version)
+    if etag_matches(etag):
+        return not_modified(etag)
 
-    transactions_query = db.query(Transaction).filter(
-        (Transaction.sender_id.in_(account_ids)) |
-        (Transaction.receiver_id.in_(account_ids))
-    ).order_by(Transaction.timestamp.desc())
-
-    total, transactions = apply_pagination(transactions_query, page, per_page)
-
-    return jsonify({
+    return with_etag(jsonify({
         "total": total,
         "page": page,
         "per_page": per_page,
-        "transactions": [t.as_dict() for t in transactions]
-    })
+        "transactions": [transaction_row(row) for row in rows]
+    }), etag)
+
+
+@transactions_bp.route('/export', methods=['GET'])
+@role_required('user')
+@swag_from({
+    "tags": ["Transactions"],
+    "summary": "Export Transaction History",
+    "description": "Streams every transaction of the authenticated user's accounts as CSV or NDJSON.",
+    "produces": ["text/csv", "application/x-ndjson"],
+    "parameters": [
+        {"name": "format", "in": "query", "type": "string", "enum": ["csv", "ndjson"], "default": "csv", "required": False},
+        {"name": "from", "in": "query", "type": "string", "example": "2025-01-01", "required": False,
+         "description": "Earliest timestamp (inclusive, ISO 8601)"},
+        {"name": "to", "in": "query", "type": "string", "example": "2025-01-31", "required": False,
+         "description": "Latest timestamp (exclusive; a bare date includes that whole day)"}
+    ],
+    "responses": {
+        "200": {"description": "Transaction history stream"},
+        "400": {"description": "Invalid format or date"}
+    },
+    "security": [{"Bearer": []}]
+})
+def export_transactions():
+    current_user = get_current_user()
+    fmt = request.args.get("format", "csv")
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({"detail": f"Unsupported format: {fmt}. Use csv or ndjson."}), 400
+
+    try:
+        start = parse_bound(request.args.get("from"))
+        end = parse_bound(request.args.get("to"), end=True)
+    except ValueError as e:
+        return jsonify({"detail": str(e)}), 400
+
+    logger.info(f"📤 Exporting transactions for user {current_user['username']} as {fmt}")
+    db = next(get_db())
+
+    # stream_with_context keeps the request (and its DB session) open until the last chunk
+    response = Response(
+        stream_with_context(iter_export(db, current_user["id"], fmt, start, end)),
+        mimetype=EXPORT_FORMATS[fmt],
+    )
+    response.headers["Content-Disposition"] = f"attachment; filename=transactions.{fmt}"
+    return response
 
 
 @transactions_bp.route('/check-balance/', methods=['GET'])
@@ -345,7 +397,7 @@ def list_transactions():
 @swag_from({
     "tags": ["Transactions"],
     'summary': 'Check Account Balance',
-    'description': 'Fetches the balance of a user account.',
+    'description': 'Fetches the ledger balance of a user account and its available balance (ledger minus pending card holds).',
     'parameters': [
         {'name': 'account_id', 'in': 'query', 'type': 'integer', 'required': True}
     ],
@@ -371,7 +423,8 @@ def check_balance():
     if not account:
         raise NotFound("Account not found or unauthorized")
 
-    return jsonify({"account_id": account_id, "balance": account.balance})
+    balance, available = ledger_and_available(db, account.id)
+    return jsonify({"account_id": account_id, "balance": format_money(balance), "available_balance": format_money(available)})
 
 @transactions_bp.route('/<int:id>/check-balance', methods=['GET'])
 @swag_from({
@@ -412,4 +465,4 @@ def check_transaction_balance_by_id(id):
     if not account:
         return jsonify({"detail": "Account not found"}), 404
 
-    return jsonify({"transaction_id": id, "balance": account.balance})
+    return jsonify({"transaction_id": id, "balance": format_money(current_balance(db, account.id))})
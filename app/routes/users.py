@@ -8,6 +8,7 @@ from app import db
 from app.utils.user import hash_password
 from app.core.auth import get_current_user
 from app.core.authorization import role_required
+from app.core.usernames import username_filter
 from app.utils.token import generate_verification_token
 from app.services.email.utils import send_email_async
 from flask import url_for
@@ -113,6 +114,7 @@ def register_user():
 
         db.session.add(new_user)
         db.session.commit()
+        username_filter.add(new_user.username)
 
         return jsonify({
             "id": new_user.id,
@@ -246,6 +248,7 @@ def update_profile():
         user.phone_number = updated_user.phone_number
 
         db.session.commit()
+        username_filter.add(user.username)
 
         return jsonify({
             "id": user.id,
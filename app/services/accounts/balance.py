@@ -0,0 +1,82 @@
+from datetime import datetime, time, timedelta
+from sqlalchemy import func, select, type_coerce, union_all
+from app.model.models import Transaction
+from app.model.types import Money
+from app.services.ledger.projection import current_balance
+from app.services.accounts.snapshots import account_movements, balance_from_snapshot
+
+
+def parse_as_of(value):
+    """``as_of`` query value; a bare date means the end of that day, missing means now."""
+    if not value:
+        return datetime.utcnow()
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"Invalid as_of: {value}. Use ISO 8601, e.g. 2025-01-31T23:59:59")
+    if len(value) == 10:
+        parsed = datetime.combine(parsed.date(), time.max)
+    return parsed
+
+
+def _nearest_movement(db, account_id, as_of, before):
+    """The account's last transaction at/before ``as_of``, or its first one after.
+
+    Each side (sent, received) is a single probe on its (account, timestamp)
+    index; the closer of the two wins.
+    """
+    if before:
+        condition = Transaction.timestamp <= as_of
+        order = [Transaction.timestamp.desc(), Transaction.id.desc()]
+    else:
+        condition = Transaction.timestamp > as_of
+        order = [Transaction.timestamp.asc(), Transaction.id.asc()]
+
+    sides = [
+        select(
+            Transaction.timestamp,
+            Transaction.id,
+            balance.label("balance_after"),
+            type_coerce(Transaction.amount * sign, Money).label("delta"),
+        ).where(account_column == account_id, condition).order_by(*order).limit(1).subquery()
+        for account_column, balance, sign in (
+            (Transaction.sender_id, Transaction.sender_balance_after, -1),
+            (Transaction.receiver_id, Transaction.receiver_balance_after, 1),
+        )
+    ]
+    both = union_all(*[select(side) for side in sides]).subquery()
+    if before:
+        outer = [both.c.timestamp.desc(), both.c.id.desc()]
+    else:
+        outer = [both.c.timestamp.asc(), both.c.id.asc()]
+    return db.execute(select(both).order_by(*outer).limit(1)).first()
+
+
+def balance_as_of(db, account, as_of: datetime) -> int:
+    """Balance of ``account`` at ``as_of`` in cents, read from stored running balances.
+
+    The latest transaction at or before ``as_of`` carries the answer, with
+    the daily snapshots as fallback. Before the first transaction, that
+    transaction's balance minus its own effect is the opening balance; an
+    account without transactions never changed. Rows predating running
+    balances, with no snapshot, cost a scan of everything since ``as_of``.
+    """
+    latest = _nearest_movement(db, account.id, as_of, before=True)
+    if latest is not None and latest.balance_after is not None:
+        return latest.balance_after
+
+    # Rows without a stored running balance: nearest snapshot plus the delta
+    from_snapshot = balance_from_snapshot(db, account.id, as_of)
+    if from_snapshot is not None:
+        return from_snapshot
+
+    first = _nearest_movement(db, account.id, as_of, before=False)
+    if first is None:
+        return current_balance(db, account.id)
+    if first.balance_after is not None:
+        return first.balance_after - first.delta
+
+    # No stored balances to go on: undo everything since as_of
+    moves = account_movements(as_of + timedelta(microseconds=1), account_id=account.id)
+    since = db.execute(select(func.coalesce(func.sum(moves.c.delta), 0))).scalar()
+    return current_balance(db, account.id) - since
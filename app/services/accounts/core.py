@@ -1,9 +1,11 @@
-from decimal import Decimal
 from flask import jsonify, request
 from app.model.models import Account
 from app.core.logger import logger
 from app.schemas import AccountResponse, AccountCreate
 from app.utils.pagination import apply_pagination
+from app.utils.money import to_cents, to_units
+from app.services.ledger.projection import current_balance, live_balances
+from app.services.transactions.core import adjust_balance
 from uuid import uuid4
 
 
@@ -14,7 +16,7 @@ def create_account_logic(db, current_user, data):
     new_account = Account(
         user_id=current_user["id"],
         account_type=account_data.account_type.value,
-        balance=Decimal(str(account_data.initial_balance)),
+        balance=to_cents(account_data.initial_balance),
         account_number=uuid4().hex[:10]
     )
 
@@ -26,7 +28,7 @@ def create_account_logic(db, current_user, data):
         id=new_account.id,
         user_id=new_account.user_id,
         account_type=new_account.account_type,
-        balance=float(new_account.balance),
+        balance=to_units(new_account.balance),
         account_number=new_account.account_number
     )
 
@@ -37,6 +39,7 @@ def list_user_accounts_logic(db, current_user):
 
     query = db.query(Account).filter_by(user_id=current_user["id"], is_deleted=False)
     total, accounts = apply_pagination(query, page, per_page)
+    balances = live_balances(db, [acc.id for acc in accounts])
 
     return {
         "total": total,
@@ -46,7 +49,7 @@ def list_user_accounts_logic(db, current_user):
             id=acc.id,
             user_id=acc.user_id,
             account_type=acc.account_type,
-            balance=float(acc.balance),
+            balance=to_units(balances[acc.id]),
             account_number=acc.account_number
         ).dict() for acc in accounts]
     }
@@ -66,7 +69,7 @@ def get_user_account_by_id_logic(db, current_user, account_id):
         id=account.id,
         user_id=account.user_id,
         account_type=account.account_type,
-        balance=float(account.balance),
+        balance=to_units(current_balance(db, account.id)),
         account_number=account.account_number
     ).dict()
 
@@ -81,7 +84,7 @@ def update_user_account_logic(db, current_user, account_id, update_data: dict):
         raise LookupError("Account not found or unauthorized")
 
     account_update = AccountCreate(**update_data)
-    account.balance = Decimal(str(account_update.initial_balance))
+    adjust_balance(db, account, to_cents(account_update.initial_balance))
     account.account_type = account_update.account_type.value
 
     db.commit()
@@ -91,7 +94,7 @@ def update_user_account_logic(db, current_user, account_id, update_data: dict):
         id=account.id,
         user_id=account.user_id,
         account_type=account.account_type,
-        balance=float(account.balance),
+        balance=to_units(current_balance(db, account.id)),
         account_number=account.account_number
     ).dict()
 
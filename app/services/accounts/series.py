@@ -0,0 +1,178 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from datetime import date, datetime, time, timedelta
+import numpy as np
+from sqlalchemy import select
+from app.services.accounts.balance import balance_as_of
+from app.services.accounts.snapshots import account_movements
+from app.utils.money import to_units
+
+BUCKETS = ("day", "week", "month")
+MAX_BUCKETS = 1000
+
+
+# Transactions get their timestamp before they commit, so one can become
+# visible slightly "in the past"; refreshes re-read this much history
+REFRESH_OVERLAP = timedelta(minutes=5)
+
+
+@dataclass
+class Series:
+    starts: np.ndarray     # datetime64[D], first day of each bucket
+    ends: np.ndarray       # datetime64[us], exclusive end of each bucket
+    closing: np.ndarray    # int64 closing balance per bucket, in cents
+    last_ts: datetime      # newest movement folded in
+    recent: dict           # id -> timestamp of movements within REFRESH_OVERLAP of last_ts
+    synced_at: datetime    # when movements were last read
+
+    def as_list(self):
+        return [
+            {"start": str(start), "closing_balance": to_units(int(balance))}
+            for start, balance in zip(self.starts, self.closing)
+        ]
+
+
+def _recent(ids, stamps, last_ts, previous=None):
+    cutoff = np.datetime64(last_ts - REFRESH_OVERLAP, "us")
+    recent = {i: t for i, t in (previous or {}).items() if t >= cutoff}
+    recent.update((int(i), t) for i, t in zip(ids, stamps) if t >= cutoff)
+    return recent
+
+
+def parse_range(start_value, end_value, bucket):
+    """``from``/``to`` as dates (inclusive); defaults to the last 30 days."""
+    if bucket not in BUCKETS:
+        raise ValueError(f"Unsupported bucket: {bucket}. Use day, week or month.")
+    try:
+        last = date.fromisoformat(end_value) if end_value else datetime.utcnow().date()
+        first = date.fromisoformat(start_value) if start_value else last - timedelta(days=29)
+    except ValueError:
+        raise ValueError("from and to must be dates, e.g. 2025-01-31")
+    if first > last:
+        raise ValueError("from must not be after to")
+    if len(bucket_starts(first, last, bucket)) > MAX_BUCKETS:
+        raise ValueError(f"Range too large: at most {MAX_BUCKETS} {bucket} buckets")
+    return first, last
+
+
+def bucket_starts(first: date, last: date, bucket: str) -> np.ndarray:
+    if bucket == "month":
+        months = np.arange(np.datetime64(first, "M"), np.datetime64(last, "M") + np.timedelta64(1, "M"))
+        return months.astype("datetime64[D]")
+    step = np.timedelta64(7 if bucket == "week" else 1, "D")
+    start = first - timedelta(days=first.weekday()) if bucket == "week" else first
+    return np.arange(np.datetime64(start, "D"), np.datetime64(last, "D") + np.timedelta64(1, "D"), step)
+
+
+def _bucket_ends(starts, last: date, bucket: str) -> np.ndarray:
+    if bucket == "month":
+        after = (starts[-1].astype("datetime64[M]") + np.timedelta64(1, "M")).astype("datetime64[D]")
+    else:
+        after = starts[-1] + np.timedelta64(7 if bucket == "week" else 1, "D")
+    ends = np.append(starts[1:], after)
+    # The last bucket closes at the end of the requested range
+    return np.minimum(ends, np.datetime64(last, "D") + np.timedelta64(1, "D")).astype("datetime64[us]")
+
+
+def _load(db, account_id, start, end=None):
+    moves = account_movements(start, end, account_id=account_id)
+    rows = db.execute(
+        select(moves.c.id, moves.c.timestamp, moves.c.delta).order_by(moves.c.timestamp, moves.c.id)
+    ).all()
+    ids = np.fromiter((row.id for row in rows), dtype=np.int64, count=len(rows))
+    stamps = np.array([row.timestamp for row in rows], dtype="datetime64[us]")
+    deltas = np.fromiter((row.delta for row in rows), dtype=np.int64, count=len(rows))
+    return ids, stamps, deltas
+
+
+def compute_series(db, account, first: date, last: date, bucket: str) -> Series:
+    """Closing balance per bucket from one scan of the range's movements.
+
+    Running balances are ``opening + cumsum(deltas)`` over int64 cents, so
+    the sums are exact however many movements there are; each bucket's closing
+    balance is the running balance of the last movement before its end,
+    found for all buckets at once with ``searchsorted``.
+    """
+    starts = bucket_starts(first, last, bucket)
+    ends = _bucket_ends(starts, last, bucket)
+    range_start = datetime.combine(starts[0].astype(date), time.min)
+
+    synced_at = datetime.utcnow()
+    opening = balance_as_of(db, account, range_start - timedelta(microseconds=1))
+    ids, stamps, deltas = _load(db, account.id, range_start, ends[-1].astype(datetime))
+
+    running = np.concatenate(([opening], opening + np.cumsum(deltas)))
+    closing = running[np.searchsorted(stamps, ends, side="left")]
+
+    last_ts = stamps[-1].astype(datetime) if len(stamps) else range_start
+    return Series(starts, ends, closing, last_ts, _recent(ids, stamps, last_ts), synced_at)
+
+
+def apply_movements(series: Series, stamps, deltas) -> np.ndarray:
+    """Closing balances after adding movements: each shifts every bucket ending after it."""
+    first_bucket = np.searchsorted(series.ends, stamps, side="right")
+    shift = np.zeros(len(series.ends) + 1, dtype=np.int64)
+    np.add.at(shift, first_bucket, deltas)
+    return series.closing + np.cumsum(shift)[:-1]
+
+
+class BalanceSeriesCache:
+    """Per-worker LRU of computed series keyed by ``(account, bucket, first, last)``.
+
+    Transactions are appended with the current time, so a range stops
+    changing once it has ended (plus REFRESH_OVERLAP for late commits). Until
+    a series has been read after that point, each read brings it up to date
+    by folding in only the movements newer than the last one seen.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, db, account, first: date, last: date, bucket: str) -> Series:
+        key = (account.id, bucket, first, last)
+        with self._lock:
+            series = self._entries.get(key)
+            if series is not None:
+                self._entries.move_to_end(key)
+
+        if series is None:
+            series = compute_series(db, account, first, last, bucket)
+        elif series.synced_at < series.ends[-1].astype(datetime) + REFRESH_OVERLAP:
+            series = self._refresh(db, account.id, series)
+        else:
+            return series
+
+        with self._lock:
+            self._entries[key] = series
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return series
+
+    def _refresh(self, db, account_id, series: Series) -> Series:
+        synced_at = datetime.utcnow()
+        ids, stamps, deltas = _load(db, account_id, series.last_ts - REFRESH_OVERLAP)
+        new = np.array([int(i) not in series.recent for i in ids], dtype=bool)
+        if not new.any():
+            return replace(series, synced_at=synced_at)
+
+        ids, stamps, deltas = ids[new], stamps[new], deltas[new]
+        last_ts = max(series.last_ts, stamps.max().astype(datetime))
+        return Series(
+            series.starts,
+            series.ends,
+            apply_movements(series, stamps, deltas),
+            last_ts,
+            _recent(ids, stamps, last_ts, series.recent),
+            synced_at,
+        )
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+series_cache = BalanceSeriesCache()
@@ -0,0 +1,46 @@
+from datetime import datetime
+from sqlalchemy import func, select, type_coerce
+from app.model.models import Account, Authorization
+from app.model.types import Money
+from app.services.ledger.projection import balance_expression
+
+
+def held_expression(now):
+    """SQL for the total of an account's live holds, from the partial index on held holds."""
+    return (
+        select(func.coalesce(func.sum(Authorization.amount), 0))
+        .where(
+            Authorization.account_id == Account.id,
+            Authorization.status == "held",
+            # A hold past its expiry frees the funds even before the sweeper marks it
+            Authorization.expires_at > now,
+        )
+        .correlate(Account)
+        .scalar_subquery()
+    )
+
+
+def _balances(now):
+    ledger = balance_expression()
+    available = type_coerce(ledger - held_expression(now or datetime.utcnow()), Money)
+    return select(Account.id, ledger, available)
+
+
+def ledger_and_available(db, account_id, now=None) -> tuple:
+    """``(ledger, available)`` balance of an account in cents, from one statement.
+
+    The ledger balance is what has been posted; the available balance is
+    that minus live holds, and is what debits are checked against.
+    """
+    _, ledger, available = db.execute(_balances(now).where(Account.id == account_id)).one()
+    return ledger, available
+
+
+def ledger_and_available_many(db, account_ids, now=None) -> dict:
+    """:func:`ledger_and_available` for many accounts, keyed by id, still in one statement."""
+    rows = db.execute(_balances(now).where(Account.id.in_(account_ids)))
+    return {account_id: (ledger, available) for account_id, ledger, available in rows}
+
+
+def available_balance(db, account_id, now=None) -> int:
+    return ledger_and_available(db, account_id, now)[1]
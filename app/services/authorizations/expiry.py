@@ -0,0 +1,41 @@
+from datetime import datetime
+from sqlalchemy import select, update
+from app.core.logger import logger
+from app.model.models import Authorization
+
+# Holds expired per statement, so one run never locks an unbounded set
+SWEEP_BATCH = 1_000
+
+
+def expire_authorizations(db, now=None, batch_size: int = SWEEP_BATCH) -> int:
+    """Mark holds past ``expires_at`` as expired; returns how many.
+
+    Each statement takes the oldest expired holds from the partial index on
+    held holds' ``expires_at``, so a run reads only holds that have actually
+    expired, however many live ones there are. Holds locked by a concurrent
+    capture are skipped and picked up next run if still held.
+    """
+    now = now or datetime.utcnow()
+    total = 0
+    while True:
+        expired = (
+            select(Authorization.id)
+            .where(Authorization.status == "held", Authorization.expires_at <= now)
+            .order_by(Authorization.expires_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        count = db.execute(
+            update(Authorization)
+            .where(Authorization.id.in_(expired), Authorization.status == "held")
+            .values(status="expired", closed_at=now)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.commit()
+        total += count
+        if count < batch_size:
+            break
+
+    if total:
+        logger.info(f"⌛ Expired {total} card authorizations")
+    return total
@@ -0,0 +1,122 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from itertools import groupby
+from sqlalchemy import false, select, true
+from app.core.logger import logger
+from app.database.db import SessionLocal, engine
+from app.model.models import Account, Bill, User
+from app.services.transactions.core import pay_bills_from_balance
+from app.utils.email_invoice import send_invoice_with_email
+from app.utils.money import format_money
+
+# Bills paid per database transaction; an account's bills never span two
+CHUNK_BILLS = 500
+
+
+def due_autopay_bills(db, day) -> list:
+    """``(bill id, account id)`` of unpaid autopay bills due on or before ``day``.
+
+    Read from the partial index on unpaid bills' due dates, so paid history
+    is never scanned. Bills missed by an earlier run are picked up too.
+    """
+    return db.execute(
+        select(Bill.id, Bill.account_id)
+        .where(Bill.is_paid == false(), Bill.due_date <= day, Bill.autopay == true())
+        .order_by(Bill.account_id, Bill.due_date, Bill.id)
+    ).all()
+
+
+def chunk_by_account(rows, chunk_bills: int = CHUNK_BILLS) -> list:
+    """Split ``(bill id, account id)`` rows into lists of bill ids, keeping each account in one chunk."""
+    chunks, current = [], []
+    for _, account_rows in groupby(rows, key=lambda row: row.account_id):
+        current.extend(row.id for row in account_rows)
+        if len(current) >= chunk_bills:
+            chunks.append(current)
+            current = []
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def pay_chunk(db, bill_ids) -> dict:
+    """Pay one chunk of bills in a single transaction; returns its share of the run report.
+
+    Chunks hold disjoint accounts, so they can run side by side without
+    waiting on each other's locks. A bill paid since it was selected is left
+    alone.
+    """
+    rows = db.execute(
+        select(Bill, Account)
+        .join(Account, Account.id == Bill.account_id)
+        .where(Bill.id.in_(bill_ids), Bill.is_paid == false(), Bill.autopay == true())
+        .order_by(Bill.account_id, Bill.due_date, Bill.id)
+        .with_for_update(of=Bill)
+    ).all()
+    report = {"paid": 0, "amount": 0, "failed": []}
+    try:
+        results = pay_bills_from_balance(db, [(bill, account) for bill, account in rows])
+        db.commit()
+    except Exception:
+        db.rollback()
+        logger.error(f"❌ Autopay chunk of {len(bill_ids)} bills failed", exc_info=True)
+        report["failed"] = [{"bill_id": bill_id, "reason": "Internal error"} for bill_id in bill_ids]
+        return report
+
+    users = {user.id: user for user in db.query(User).filter(User.id.in_({bill.user_id for bill, _ in rows}))}
+    for (bill, account), result in zip(rows, results):
+        if isinstance(result, Exception):
+            report["failed"].append({"bill_id": bill.id, "reason": str(result)})
+            continue
+        report["paid"] += 1
+        report["amount"] += result.amount
+        user = users[bill.user_id]
+        send_invoice_with_email(result, user={"username": user.username, "email": user.email}, account=account)
+    return report
+
+
+def _init_worker():
+    # Connections inherited from the parent process must not be reused
+    engine.dispose(close=False)
+
+
+def _pay_chunk_in_worker(bill_ids) -> dict:
+    with SessionLocal() as db:
+        return pay_chunk(db, bill_ids)
+
+
+def run_autopay(session_factory=SessionLocal, day=None, chunk_bills: int = CHUNK_BILLS, workers: int = 1) -> dict:
+    """Pay every autopay bill due by ``day`` (today by default); returns the run report.
+
+    With more than one worker, chunks are paid in that many processes,
+    each with its own connections.
+    """
+    day = day or date.today()
+    started = time.perf_counter()
+    with session_factory() as db:
+        chunks = chunk_by_account(due_autopay_bills(db, day), chunk_bills)
+
+    if workers > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            reports = list(pool.map(_pay_chunk_in_worker, chunks))
+    else:
+        reports = []
+        for chunk in chunks:
+            with session_factory() as db:
+                reports.append(pay_chunk(db, chunk))
+
+    report = {
+        "day": day.isoformat(),
+        "due": sum(len(chunk) for chunk in chunks),
+        "chunks": len(chunks),
+        "paid": sum(r["paid"] for r in reports),
+        "amount": sum(r["amount"] for r in reports),
+        "failed": [failure for r in reports for failure in r["failed"]],
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+    logger.info(
+        f"🧾 Autopay for {report['day']}: paid {report['paid']} of {report['due']} bills "
+        f"(${format_money(report['amount'])}), {len(report['failed'])} failed"
+    )
+    return report
@@ -0,0 +1,69 @@
+import base64
+from datetime import date
+from sqlalchemy import select, tuple_
+from app.model.models import Bill
+from app.utils.money import to_units
+
+# What a listing shows, selected as plain columns rather than Bill objects
+BILL_COLUMNS = [
+    Bill.id,
+    Bill.biller_name,
+    Bill.due_date,
+    Bill.amount,
+    Bill.account_id,
+    Bill.is_paid,
+    Bill.autopay,
+    Bill.is_overdue,
+]
+MAX_LIMIT = 100
+
+
+def encode_cursor(due_date, bill_id) -> str:
+    return base64.urlsafe_b64encode(f"{due_date.isoformat()}:{bill_id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """``(due_date, id)`` of the last bill a previous page ended on."""
+    try:
+        due_date, bill_id = base64.urlsafe_b64decode(cursor.encode()).decode().split(":")
+        return date.fromisoformat(due_date), int(bill_id)
+    except (ValueError, UnicodeError):
+        raise ValueError("Invalid cursor")
+
+
+def bill_filters(user_id, is_paid=None, due_from=None, due_to=None, account_id=None) -> list:
+    """Conditions for a user's bills; user, paid state and due dates follow the (user_id, is_paid, due_date) index."""
+    conditions = [Bill.user_id == user_id]
+    if is_paid is not None:
+        conditions.append(Bill.is_paid == is_paid)
+    if due_from is not None:
+        conditions.append(Bill.due_date >= due_from)
+    if due_to is not None:
+        conditions.append(Bill.due_date <= due_to)
+    if account_id is not None:
+        conditions.append(Bill.account_id == account_id)
+    return conditions
+
+
+def bill_row(row) -> dict:
+    data = dict(row._mapping)
+    data["due_date"] = data["due_date"].isoformat()
+    data["amount"] = to_units(data["amount"])
+    return data
+
+
+def list_bills_page(db, conditions, limit: int, cursor=None) -> tuple:
+    """Return ``(rows, next_cursor)`` for one page of bills by due date, earliest first.
+
+    Keyset pagination: a page starts after the ``(due_date, id)`` its cursor
+    names, so deep pages cost the same as the first. ``next_cursor`` is None
+    on the last page.
+    """
+    stmt = select(*BILL_COLUMNS).where(*conditions)
+    if cursor:
+        stmt = stmt.where(tuple_(Bill.due_date, Bill.id) > tuple_(*decode_cursor(cursor)))
+    # One extra row tells whether another page follows
+    rows = db.execute(stmt.order_by(Bill.due_date, Bill.id).limit(limit + 1)).all()
+
+    next_cursor = encode_cursor(rows[limit - 1].due_date, rows[limit - 1].id) if len(rows) > limit else None
+    return [bill_row(row) for row in rows[:limit]], next_cursor
@@ -0,0 +1,102 @@
+from datetime import date, datetime, timedelta
+from itertools import groupby
+from sqlalchemy import and_, false, or_, select, update
+from app.core.logger import logger
+from app.model.models import Bill, User
+from app.services.email.utils import send_emails
+from app.utils.money import format_money
+from config import Config
+
+# reminded_at updates per statement
+UPDATE_BATCH = 1_000
+
+
+def bills_to_remind(db, today, days: int) -> list:
+    """Unpaid bills a reminder should mention, with their owners, ordered by user.
+
+    One range scan of the partial index on unpaid bills' due dates, up to
+    ``days`` ahead: bills coming due that haven't been reminded, and past-due
+    bills not yet marked overdue.
+    """
+    return db.execute(
+        select(Bill.id, Bill.user_id, Bill.biller_name, Bill.amount, Bill.due_date, User.username, User.email)
+        .join(User, User.id == Bill.user_id)
+        .where(
+            Bill.is_paid == false(),
+            Bill.due_date <= today + timedelta(days=days),
+            or_(
+                and_(Bill.due_date >= today, Bill.reminded_at.is_(None)),
+                and_(Bill.due_date < today, Bill.is_overdue == false()),
+            ),
+        )
+        .order_by(Bill.user_id, Bill.due_date, Bill.id)
+    ).all()
+
+
+def mark_overdue(db, today) -> int:
+    """Flag every unpaid bill past its due date with one UPDATE; the caller commits."""
+    return db.execute(
+        update(Bill)
+        .where(Bill.is_paid == false(), Bill.due_date < today, Bill.is_overdue == false())
+        # Bill's onupdate bumps updated_at, which the listing caches on
+        .values(is_overdue=True)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+
+def reminder_message(username, email, bills, today) -> tuple:
+    def line(bill):
+        return f"{bill.biller_name}: ${format_money(bill.amount)} due {bill.due_date.isoformat()}"
+
+    overdue = [line(bill) for bill in bills if bill.due_date < today]
+    upcoming = [line(bill) for bill in bills if bill.due_date >= today]
+    sections = []
+    if overdue:
+        sections.append("Overdue:<br>" + "<br>".join(overdue))
+    if upcoming:
+        sections.append("Due soon:<br>" + "<br>".join(upcoming))
+
+    subject = f"{'Overdue bills' if overdue else 'Upcoming bills'}: {len(bills)} to pay"
+    body = f"""
+        Dear {username},
+
+        {'<br><br>'.join(sections)}
+
+        Pay them from the app, or turn on autopay for a bill.
+
+        Thank you for using RevouBank.
+    """
+    return subject, email, body
+
+
+def send_bill_reminders(db, today=None, days: int = Config.BILL_REMINDER_DAYS) -> dict:
+    """Email each user one reminder of their upcoming and newly overdue bills, and mark overdue bills.
+
+    A bill is reminded of once before it is due and once when it becomes
+    overdue. Flags are committed before the emails go out, so a rerun never
+    sends the same reminder twice.
+    """
+    today = today or date.today()
+    now = datetime.utcnow()
+    rows = bills_to_remind(db, today, days)
+    messages = [
+        reminder_message(username, email, list(bills), today)
+        for (_, username, email), bills in groupby(rows, key=lambda row: (row.user_id, row.username, row.email))
+    ]
+
+    marked = mark_overdue(db, today)
+    ids = [row.id for row in rows]
+    for start in range(0, len(ids), UPDATE_BATCH):
+        db.execute(
+            update(Bill)
+            .where(Bill.id.in_(ids[start:start + UPDATE_BATCH]))
+            # Not a change listings show, so updated_at is kept as it was
+            .values(reminded_at=now, updated_at=Bill.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+    db.commit()
+
+    sent = send_emails(messages) if messages else 0
+    report = {"bills": len(rows), "users": len(messages), "sent": sent, "marked_overdue": marked}
+    logger.info(f"🔔 Bill reminders: {len(rows)} bills for {len(messages)} users, {sent} sent, {marked} marked overdue")
+    return report
@@ -6,6 +6,9 @@ from app.core.extensions import mail
 from flask import current_app
 from config import Config
 
+# Messages sent over one SMTP connection; servers cap how many a session may send
+MAIL_BATCH = 100
+
 def send_email(subject, recipient, body, attachment_path=None):
     if Config.MOCK_EMAIL:
         print("📧 [MOCK EMAIL] Triggered")
@@ -38,3 +41,29 @@ def send_email_async(subject: str, recipient: str, body: str, attachment_path: s
     else:
         thread = threading.Thread(target=send_email, args=(subject, recipient, body, attachment_path))
         thread.start()
+
+
+def send_emails(messages):
+    """Send many ``(subject, recipient, body)`` messages, reusing an SMTP connection per batch.
+
+    Returns how many were sent; a failed message doesn't stop the rest.
+    """
+    if Config.MOCK_EMAIL:
+        for subject, recipient, body in messages:
+            send_email(subject, recipient, body)
+        return len(messages)
+
+    sent = 0
+    for start in range(0, len(messages), MAIL_BATCH):
+        try:
+            with mail.connect() as connection:
+                for subject, recipient, body in messages[start:start + MAIL_BATCH]:
+                    try:
+                        connection.send(Message(subject=subject, recipients=[recipient], html=body))
+                        sent += 1
+                    except Exception as e:
+                        print(f"❌ Error sending email to {recipient}: {e}")
+        except Exception as e:
+            print(f"❌ Error connecting to mail server: {e}")
+    print(f"📧 Sent {sent} of {len(messages)} emails")
+    return sent
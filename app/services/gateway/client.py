@@ -0,0 +1,74 @@
+import abc
+import hashlib
+import hmac
+import urllib.error
+import urllib.request
+import orjson
+from config import Config
+
+SIGNATURE_HEADER = "X-Gateway-Signature"
+
+
+class GatewayError(Exception):
+    """The partner bank gateway could not take a batch; it will be resubmitted."""
+
+
+def sign(body: bytes, secret: str) -> str:
+    return hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+def verify_signature(body: bytes, signature: str, secret: str) -> bool:
+    return bool(signature) and hmac.compare_digest(sign(body, secret), signature)
+
+
+class ExternalGateway(abc.ABC):
+    """Where settlement batches are sent.
+
+    ``submit`` hands over one batch and returns the gateway's reference for
+    it. Outcomes arrive later, through the signed callback.
+    """
+
+    @abc.abstractmethod
+    def submit(self, batch: dict) -> str:
+        ...
+
+
+class HttpGateway(ExternalGateway):
+    """JSON over HTTP, signed with the shared secret both ways.
+
+    The batch id doubles as the idempotency key, so resubmitting a batch
+    whose first response was lost doesn't pay it twice.
+    """
+
+    def __init__(self, url: str, secret: str, callback_url: str, timeout: float):
+        self.url = url.rstrip("/")
+        self.secret = secret
+        self.callback_url = callback_url
+        self.timeout = timeout
+
+    def submit(self, batch: dict) -> str:
+        body = orjson.dumps({**batch, "callback_url": self.callback_url})
+        request = urllib.request.Request(
+            f"{self.url}/batches",
+            data=body,
+            method="POST",
+            headers={
+                "Content-Type": "application/json",
+                "Idempotency-Key": f"batch-{batch['batch_id']}",
+                SIGNATURE_HEADER: sign(body, self.secret),
+            },
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return orjson.loads(response.read())["reference"]
+        except (urllib.error.URLError, TimeoutError, KeyError, orjson.JSONDecodeError) as e:
+            raise GatewayError(f"Gateway rejected batch {batch['batch_id']}: {e}") from e
+
+
+def get_gateway() -> ExternalGateway:
+    return HttpGateway(
+        url=Config.GATEWAY_URL,
+        secret=Config.GATEWAY_SECRET,
+        callback_url=Config.GATEWAY_CALLBACK_URL,
+        timeout=Config.GATEWAY_TIMEOUT_SECONDS,
+    )
@@ -0,0 +1,166 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from itertools import groupby, islice
+from sqlalchemy import func, or_, select, update
+from app.core.logger import logger
+from app.model.models import SettlementBatch, Transaction
+from app.services.gateway.client import GatewayError
+from app.services.transactions.core import reverse_external_withdrawals
+from app.utils.money import format_money
+
+# A batch claimed for submission by a worker that died is retried after this
+SUBMIT_TIMEOUT = timedelta(minutes=5)
+OUTCOMES = ("settled", "rejected")
+
+
+def batch_pending_withdrawals(db, max_items: int) -> int:
+    """Group pending, unbatched withdrawals into open batches per bank; returns batches created.
+
+    Rows are claimed with SKIP LOCKED, so concurrent runs build disjoint
+    batches. Each batch is one INSERT and one UPDATE.
+    """
+    rows = db.execute(
+        select(Transaction.id, Transaction.bank_name, Transaction.amount)
+        .where(Transaction.status == "pending", Transaction.settlement_batch_id.is_(None))
+        .order_by(Transaction.bank_name, Transaction.id)
+        .with_for_update(skip_locked=True)
+    ).all()
+
+    created = 0
+    for bank_name, bank_rows in groupby(rows, key=lambda row: row.bank_name):
+        bank_rows = iter(bank_rows)
+        while chunk := list(islice(bank_rows, max_items)):
+            batch = SettlementBatch(bank_name=bank_name, item_count=len(chunk), total=sum(row.amount for row in chunk))
+            db.add(batch)
+            db.flush()
+            db.execute(
+                update(Transaction)
+                .where(Transaction.id.in_([row.id for row in chunk]))
+                .values(settlement_batch_id=batch.id)
+                .execution_options(synchronize_session=False)
+            )
+            created += 1
+    db.commit()
+
+    if created:
+        logger.info(f"📦 Grouped {len(rows)} pending withdrawals into {created} settlement batches")
+    return created
+
+
+def _claim(db, batch_id) -> bool:
+    """Move a batch to "submitting" unless another worker got there first."""
+    claimed = db.execute(
+        update(SettlementBatch)
+        .where(
+            SettlementBatch.id == batch_id,
+            or_(
+                SettlementBatch.status == "open",
+                (SettlementBatch.status == "submitting") & (SettlementBatch.submitted_at < datetime.utcnow() - SUBMIT_TIMEOUT),
+            ),
+        )
+        .values(status="submitting", submitted_at=datetime.utcnow(), attempts=SettlementBatch.attempts + 1)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.commit()
+    return bool(claimed)
+
+
+def batch_payload(db, batch) -> dict:
+    items = db.execute(
+        select(Transaction.id, Transaction.amount, Transaction.external_account_number)
+        .where(Transaction.settlement_batch_id == batch.id)
+        .order_by(Transaction.id)
+    ).all()
+    return {
+        "batch_id": batch.id,
+        "bank_name": batch.bank_name,
+        "total": batch.total,
+        "items": [{"transaction_id": id, "amount": amount, "account_number": number} for id, amount, number in items],
+    }
+
+
+def submit_batch(session_factory, gateway, batch_id) -> bool:
+    """Send one batch to the gateway on its own session; returns whether it was taken.
+
+    No row lock is held during the network call: the batch is claimed and
+    committed first, and released back to "open" if the gateway fails.
+    """
+    db = session_factory()
+    try:
+        if not _claim(db, batch_id):
+            return False
+        batch = db.get(SettlementBatch, batch_id)
+        try:
+            reference = gateway.submit(batch_payload(db, batch))
+        except GatewayError as e:
+            batch.status = "open"
+            db.commit()
+            logger.warning(f"⚠️ Settlement batch {batch_id} not accepted (attempt {batch.attempts}): {e}")
+            return False
+
+        batch.status = "submitted"
+        batch.gateway_reference = reference
+        db.commit()
+        logger.info(f"📤 Submitted settlement batch {batch_id} to {batch.bank_name}: {batch.item_count} items, ${format_money(batch.total)}")
+        return True
+    finally:
+        db.close()
+
+
+def submit_open_batches(session_factory, gateway, max_concurrency: int) -> int:
+    """Submit every open (or stuck) batch, at most ``max_concurrency`` at a time; returns how many were taken."""
+    with session_factory() as db:
+        batch_ids = db.execute(
+            select(SettlementBatch.id)
+            .where(SettlementBatch.status.in_(("open", "submitting")))
+            .order_by(SettlementBatch.id)
+        ).scalars().all()
+    if not batch_ids:
+        return 0
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+        taken = sum(pool.map(lambda batch_id: submit_batch(session_factory, gateway, batch_id), batch_ids))
+    return taken
+
+
+def apply_callback(db, payload) -> dict:
+    """Finalize a batch's withdrawals from the gateway's callback; returns counts.
+
+    Settled withdrawals are marked with one UPDATE; rejected ones are marked
+    failed and credited back. Only withdrawals still pending change, so a
+    repeated callback is harmless.
+    """
+    batch = db.execute(
+        select(SettlementBatch).where(SettlementBatch.gateway_reference == payload.get("reference")).with_for_update()
+    ).scalar_one_or_none()
+    if batch is None:
+        raise LookupError("Settlement batch not found")
+
+    outcomes = {outcome: [] for outcome in OUTCOMES}
+    for result in payload.get("results", []):
+        if result.get("status") not in outcomes:
+            raise ValueError(f"Unknown settlement status {result.get('status')!r}")
+        outcomes[result["status"]].append(int(result["transaction_id"]))
+
+    pending = (Transaction.settlement_batch_id == batch.id, Transaction.status == "pending")
+    settled = db.execute(
+        update(Transaction)
+        .where(Transaction.id.in_(outcomes["settled"]), *pending)
+        .values(status="settled")
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+    rejected = db.query(Transaction).filter(Transaction.id.in_(outcomes["rejected"]), *pending).with_for_update().all()
+    for withdrawal in rejected:
+        withdrawal.status = "failed"
+    if rejected:
+        reverse_external_withdrawals(db, rejected)
+
+    remaining = db.execute(select(func.count()).select_from(Transaction).where(*pending)).scalar()
+    if not remaining:
+        batch.status = "settled"
+        batch.settled_at = datetime.utcnow()
+    db.commit()
+
+    logger.info(f"📥 Settlement batch {batch.id}: {settled} settled, {len(rejected)} rejected, {remaining} still pending")
+    return {"batch_id": batch.id, "settled": settled, "rejected": len(rejected), "pending": remaining}
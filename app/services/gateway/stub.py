@@ -0,0 +1,55 @@
+import random
+import threading
+import time
+import urllib.request
+import uuid
+import orjson
+from flask import Flask, jsonify, request
+from app.services.gateway.client import SIGNATURE_HEADER, sign, verify_signature
+
+
+def create_stub_app(secret: str, settle_after: float = 1.0, reject_rate: float = 0.02, seed=None) -> Flask:
+    """A stand-in partner bank for local runs and benchmarks.
+
+    Accepts signed batches on ``POST /batches`` and answers at once with a
+    reference; ``settle_after`` seconds later it posts the outcome of every
+    item to the batch's callback URL, rejecting about ``reject_rate`` of them.
+    Resubmitting a batch id returns the original reference.
+    """
+    app = Flask("gateway_stub")
+    rng = random.Random(seed)
+    references = {}
+    lock = threading.Lock()
+
+    def settle(batch, reference):
+        time.sleep(settle_after)
+        body = orjson.dumps({
+            "reference": reference,
+            "results": [
+                {"transaction_id": item["transaction_id"], "status": "rejected" if rng.random() < reject_rate else "settled"}
+                for item in batch["items"]
+            ],
+        })
+        callback = urllib.request.Request(
+            batch["callback_url"], data=body, method="POST",
+            headers={"Content-Type": "application/json", SIGNATURE_HEADER: sign(body, secret)},
+        )
+        try:
+            urllib.request.urlopen(callback, timeout=10).close()
+        except OSError as e:
+            app.logger.warning(f"Callback for {reference} failed: {e}")
+
+    @app.post("/batches")
+    def receive_batch():
+        if not verify_signature(request.get_data(), request.headers.get(SIGNATURE_HEADER, ""), secret):
+            return jsonify({"detail": "Bad signature"}), 401
+
+        batch = request.get_json()
+        with lock:
+            if batch["batch_id"] in references:
+                return jsonify({"reference": references[batch["batch_id"]]})
+            reference = references[batch["batch_id"]] = uuid.uuid4().hex
+        threading.Thread(target=settle, args=(batch, reference), daemon=True).start()
+        return jsonify({"reference": reference}), 202
+
+    return app
@@ -0,0 +1,70 @@
+from sqlalchemy import func, insert, or_, select
+from app.model.models import LedgerPosting, Transaction
+
+ACCOUNT = "account"
+# Where the other side of money entering or leaving the bank is booked
+COUNTERPARTY = {
+    "deposit": "cash",
+    "withdrawal": "cash",
+    "external_deposit": "external_bank",
+    "external_withdrawal": "external_bank",
+    "external_withdrawal_reversal": "external_bank",
+    "bill_payment": "biller",
+    "adjustment": "adjustment",
+}
+
+
+def _leg(transaction, account_id, amount, slot=None):
+    return {
+        "transaction_id": transaction.id,
+        "account_id": account_id,
+        "ledger": ACCOUNT if account_id else COUNTERPARTY[transaction.type],
+        "amount": amount,
+        "slot": slot,
+    }
+
+
+def legs(transaction, receiver_slot=None) -> list:
+    """The debit (sender side) and credit (receiver side) of ``transaction``."""
+    return [
+        _leg(transaction, transaction.sender_id, -transaction.amount),
+        _leg(transaction, transaction.receiver_id, transaction.amount, receiver_slot),
+    ]
+
+
+def post_transaction(db, transaction, receiver_slot=None):
+    """Append both legs of a flushed ``transaction`` with a single INSERT.
+
+    Postings are never updated or deleted; balances are derived from them.
+    ``receiver_slot`` marks a credit already added to a hot account's slot.
+    """
+    db.execute(insert(LedgerPosting), legs(transaction, receiver_slot))
+
+
+def post_transactions(db, transactions, receiver_slots):
+    """:func:`post_transaction` for a batch, still with a single INSERT."""
+    db.execute(
+        insert(LedgerPosting),
+        [leg for transaction, slot in zip(transactions, receiver_slots) for leg in legs(transaction, slot)],
+    )
+
+
+def unbalanced_transactions(db, limit=100):
+    """Ids of transactions whose postings are missing or don't net to zero."""
+    totals = (
+        select(
+            LedgerPosting.transaction_id,
+            func.count().label("legs"),
+            func.sum(LedgerPosting.amount).label("net"),
+        )
+        .group_by(LedgerPosting.transaction_id)
+        .subquery()
+    )
+    stmt = (
+        select(Transaction.id)
+        .outerjoin(totals, totals.c.transaction_id == Transaction.id)
+        .where(or_(totals.c.legs.is_(None), totals.c.legs != 2, totals.c.net != 0))
+        .order_by(Transaction.id)
+        .limit(limit)
+    )
+    return db.execute(stmt).scalars().all()
@@ -0,0 +1,87 @@
+from datetime import datetime, timedelta
+from sqlalchemy import func, select, type_coerce, update
+from app.core.logger import logger
+from app.model.models import Account, AccountBalanceSlot, LedgerPosting
+from app.model.types import Money
+
+# Posting ids are handed out before commit, so a lower id can become visible
+# after a higher one; the projection leaves the newest postings for next run
+PROJECTION_LAG = timedelta(seconds=5)
+
+
+def balance_expression():
+    """SQL for an account's live balance: its projection plus postings not folded in yet.
+
+    The tail is a range scan on ``(account_id, id)``, kept short by
+    :func:`project_balances`. Hot accounts add their slot sub-balances; the
+    credits behind those are already counted there, so the tail skips them.
+    """
+    tail = (
+        select(func.coalesce(func.sum(LedgerPosting.amount), 0))
+        .where(
+            LedgerPosting.account_id == Account.id,
+            LedgerPosting.id > Account.balance_posting_id,
+            LedgerPosting.slot.is_(None),
+        )
+        .correlate(Account)
+        .scalar_subquery()
+    )
+    slots = (
+        select(func.coalesce(func.sum(AccountBalanceSlot.balance), 0))
+        .where(AccountBalanceSlot.account_id == Account.id)
+        .correlate(Account)
+        .scalar_subquery()
+    )
+    return type_coerce(Account.balance + tail + slots, Money)
+
+
+def current_balance(db, account_id) -> int:
+    """Live balance of one account in cents, from a single statement."""
+    return db.execute(select(balance_expression()).where(Account.id == account_id)).scalar_one()
+
+
+def live_balances(db, account_ids) -> dict:
+    rows = db.execute(select(Account.id, balance_expression()).where(Account.id.in_(account_ids)))
+    return dict(rows.all())
+
+
+def project_balances(db, lag: timedelta = PROJECTION_LAG) -> int:
+    """Fold new postings into ``Account.balance``; returns accounts updated.
+
+    One set-based UPDATE adds each account's postings since its checkpoint
+    and advances the checkpoint. An account whose checkpoint moved since the
+    sums were taken (a concurrent run) is left alone, so nothing is added twice.
+    Slotted credits are folded by :func:`app.services.ledger.slots.fold_slots`.
+    """
+    ceiling = db.execute(
+        select(func.max(LedgerPosting.id)).where(LedgerPosting.created_at <= datetime.utcnow() - lag)
+    ).scalar()
+    if ceiling is None:
+        return 0
+
+    pending = (
+        select(
+            LedgerPosting.account_id,
+            Account.balance_posting_id.label("seen"),
+            func.sum(LedgerPosting.amount).label("delta"),
+            func.max(LedgerPosting.id).label("last_id"),
+        )
+        .join(Account, Account.id == LedgerPosting.account_id)
+        .where(
+            LedgerPosting.id > Account.balance_posting_id,
+            LedgerPosting.id <= ceiling,
+            LedgerPosting.slot.is_(None),
+        )
+        .group_by(LedgerPosting.account_id, Account.balance_posting_id)
+        .subquery()
+    )
+    updated = db.execute(
+        update(Account)
+        .where(Account.id == pending.c.account_id, Account.balance_posting_id == pending.c.seen)
+        .values(balance=Account.balance + pending.c.delta, balance_posting_id=pending.c.last_id)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.commit()
+
+    logger.info(f"📒 Projected ledger postings up to {ceiling} into {updated} account balances")
+    return updated
@@ -0,0 +1,91 @@
+from collections import defaultdict
+from sqlalchemy import bindparam, insert, select, update
+from app.core.logger import logger
+from app.model.models import Account, AccountBalanceSlot
+
+# Hot accounts (a merchant receiving many payments at once) spread credits
+# over several sub-balance rows instead of serializing on the account row.
+# Debits still lock the account and read the full balance, slots included.
+MAX_SLOTS = 64
+
+accounts = Account.__table__
+slots = AccountBalanceSlot.__table__
+
+
+def is_hot(account) -> bool:
+    return account.balance_slots > 1
+
+
+def credit_slot(db, account, transaction) -> int:
+    """Add a credit to one of ``account``'s slots, picked from the transaction id.
+
+    Consecutive transactions land on different slots, so concurrent credits
+    mostly update different rows. Returns the slot used.
+    """
+    slot = transaction.id % account.balance_slots
+    db.execute(
+        update(AccountBalanceSlot)
+        .where(AccountBalanceSlot.account_id == account.id, AccountBalanceSlot.slot == slot)
+        .values(balance=AccountBalanceSlot.balance + transaction.amount)
+        .execution_options(synchronize_session=False)
+    )
+    return slot
+
+
+def set_slots(db, account, count: int):
+    """Switch ``account`` to ``count`` credit slots; 1 turns hot mode off.
+
+    Slot rows are created up front and never deleted, so a credit that picked
+    a slot before the change still finds its row; :func:`fold_slots` merges
+    whatever lands there.
+    """
+    if not 1 <= count <= MAX_SLOTS:
+        raise ValueError(f"Slots must be between 1 and {MAX_SLOTS}")
+
+    existing = set(db.execute(
+        select(AccountBalanceSlot.slot).where(AccountBalanceSlot.account_id == account.id)
+    ).scalars())
+    missing = [{"account_id": account.id, "slot": slot, "balance": 0}
+               for slot in range(count) if count > 1 and slot not in existing]
+    if missing:
+        db.execute(insert(AccountBalanceSlot), missing)
+    account.balance_slots = count
+    db.commit()
+
+    logger.info(f"🔥 Account {account.id} now credits {count} balance slots")
+
+
+def fold_slots(db) -> int:
+    """Move slot sub-balances into ``Account.balance``; returns accounts updated.
+
+    Each slot is reduced by the amount read rather than zeroed, so credits
+    arriving meanwhile stay in the slot for the next run. Both executemany
+    UPDATEs only add and subtract, and commit together.
+    """
+    rows = db.execute(
+        select(AccountBalanceSlot.account_id, AccountBalanceSlot.slot, AccountBalanceSlot.balance)
+        .where(AccountBalanceSlot.balance != 0)
+    ).all()
+    if not rows:
+        return 0
+
+    totals = defaultdict(int)
+    for account_id, _, balance in rows:
+        totals[account_id] += balance
+
+    db.execute(
+        update(slots)
+        .where(slots.c.account_id == bindparam("slot_account_id"), slots.c.slot == bindparam("slot_number"))
+        .values(balance=slots.c.balance - bindparam("folded")),
+        [{"slot_account_id": a, "slot_number": s, "folded": b} for a, s, b in rows],
+    )
+    db.execute(
+        update(accounts)
+        .where(accounts.c.id == bindparam("folded_account_id"))
+        .values(balance=accounts.c.balance + bindparam("folded")),
+        [{"folded_account_id": a, "folded": total} for a, total in totals.items()],
+    )
+    db.commit()
+
+    logger.info(f"🔥 Folded {len(rows)} balance slots into {len(totals)} accounts")
+    return len(totals)
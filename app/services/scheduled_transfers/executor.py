@@ -0,0 +1,138 @@
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import or_, select, update
+from app.core.logger import logger
+from app.model.models import ScheduledTransfer, User
+from app.services.scheduled_transfers.schedule import reschedule
+from app.services.transactions.core import handle_transfer
+
+# Runs claimed per statement
+CLAIM_BATCH = 100
+# A run claimed by an executor that died is taken over after this
+CLAIM_TIMEOUT = timedelta(minutes=5)
+# Consecutive failed runs before a standing order stops
+MAX_FAILURES = 3
+
+
+def claim_due(db, now, limit: int) -> list:
+    """Claim up to ``limit`` due runs, oldest first; returns ``(id, next_run_at)`` rows.
+
+    Rows come from the partial index on active ``next_run_at`` and are
+    taken with SKIP LOCKED, so executors running side by side claim
+    disjoint runs. The claim is committed straight away: each run then
+    gets its own transaction.
+    """
+    rows = db.execute(
+        select(ScheduledTransfer.id, ScheduledTransfer.next_run_at)
+        .where(
+            ScheduledTransfer.status == "active",
+            ScheduledTransfer.next_run_at <= now,
+            or_(ScheduledTransfer.claimed_at.is_(None), ScheduledTransfer.claimed_at < now - CLAIM_TIMEOUT),
+        )
+        .order_by(ScheduledTransfer.next_run_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    ).all()
+    if rows:
+        db.execute(
+            update(ScheduledTransfer)
+            .where(ScheduledTransfer.id.in_([row.id for row in rows]))
+            .values(claimed_at=now)
+            .execution_options(synchronize_session=False)
+        )
+    db.commit()
+    return rows
+
+
+def _locked(db, schedule_id):
+    return db.query(ScheduledTransfer).filter_by(id=schedule_id).with_for_update().first()
+
+
+def run_claimed(db, schedule_id, due_at, now) -> str:
+    """Run one claimed transfer through ``handle_transfer``: executed, failed or skipped.
+
+    The schedule moves to its next run in the transfer's own commit, so a
+    crash can't leave a run that was paid but is still due.
+    """
+    schedule = _locked(db, schedule_id)
+    if not schedule or schedule.status != "active" or schedule.next_run_at != due_at:
+        # Paused, edited or deleted since it was claimed
+        if schedule:
+            schedule.claimed_at = None
+            db.commit()
+        return "skipped"
+
+    user = db.get(User, schedule.user_id)
+    current_user = {"id": user.id, "username": user.username, "email": user.email}
+    # Missed runs aren't made up: the next one is the first still ahead
+    after = max(due_at, now)
+    schedule.last_run_at = now
+    schedule.claimed_at = None
+    reschedule(schedule, after)
+    try:
+        transaction, _ = handle_transfer(db, current_user, schedule.amount, schedule.sender_id, schedule.receiver_id)
+    except (ValueError, PermissionError, LookupError) as e:
+        db.rollback()
+        schedule = _locked(db, schedule_id)
+        schedule.last_run_at = now
+        schedule.claimed_at = None
+        reschedule(schedule, after)
+        schedule.failure_count += 1
+        schedule.last_error = str(e)[:255]
+        if schedule.next_run_at is None or schedule.failure_count >= MAX_FAILURES:
+            schedule.status = "failed"
+        db.commit()
+        logger.warning(f"⚠️ Scheduled transfer {schedule_id} failed ({schedule.failure_count} in a row): {e}")
+        return "failed"
+
+    schedule.run_count += 1
+    schedule.failure_count = 0
+    schedule.last_error = None
+    schedule.last_transaction_id = transaction.id
+    db.commit()
+    return "executed"
+
+
+def run_due_transfers(session_factory, batch_size: int = CLAIM_BATCH, now=None) -> dict:
+    """Run every transfer due at ``now``, a batch at a time; returns a run report.
+
+    Lag is how long after its due time each run started; several executors
+    can share the work, each gets its own report.
+    """
+    started = time.perf_counter()
+    counts = {"executed": 0, "failed": 0, "skipped": 0}
+    lags = []
+    cutoff = now or datetime.utcnow()
+    with session_factory() as db:
+        while True:
+            claimed = claim_due(db, cutoff, batch_size)
+            for schedule_id, due_at in claimed:
+                ran_at = now or datetime.utcnow()
+                try:
+                    outcome = run_claimed(db, schedule_id, due_at, ran_at)
+                except Exception:
+                    # Left claimed: it is retried once the claim times out
+                    db.rollback()
+                    logger.error(f"❌ Unhandled error running scheduled transfer {schedule_id}", exc_info=True)
+                    outcome = "failed"
+                counts[outcome] += 1
+                if outcome != "skipped":
+                    lags.append((ran_at - due_at).total_seconds())
+            if len(claimed) < batch_size:
+                break
+
+    elapsed = time.perf_counter() - started
+    ran = counts["executed"] + counts["failed"]
+    report = {
+        **counts,
+        "seconds": round(elapsed, 3),
+        "per_second": round(ran / elapsed, 1) if elapsed else 0.0,
+        "max_lag_seconds": round(max(lags), 3) if lags else 0.0,
+        "mean_lag_seconds": round(sum(lags) / len(lags), 3) if lags else 0.0,
+    }
+    if ran:
+        logger.info(
+            f"🗓️ Ran {ran} scheduled transfers ({counts['failed']} failed) at {report['per_second']}/s, "
+            f"lag max {report['max_lag_seconds']}s"
+        )
+    return report
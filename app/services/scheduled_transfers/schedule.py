@@ -0,0 +1,135 @@
+import calendar
+from datetime import datetime, timedelta
+from app.core.logger import logger
+from app.model.models import Account, ScheduledTransfer
+from app.utils.money import format_money, to_cents
+
+INTERVALS = ("once", "daily", "weekly", "monthly")
+STEPS = {"daily": timedelta(days=1), "weekly": timedelta(weeks=1)}
+# Statuses a user can set; completed and failed are set by the executor
+USER_STATUSES = ("active", "paused")
+
+
+def _add_months(moment, months):
+    month = moment.month - 1 + months
+    year, month = moment.year + month // 12, month % 12 + 1
+    # The 31st runs on the last day of shorter months without drifting
+    return moment.replace(year=year, month=month, day=min(moment.day, calendar.monthrange(year, month)[1]))
+
+
+def next_run(start_at, interval, after):
+    """First run of a schedule later than ``after``; None once a one-off has run.
+
+    Runs are counted from ``start_at``, so a late run doesn't shift later ones.
+    """
+    if after < start_at:
+        return start_at
+    if interval == "once":
+        return None
+    if interval in STEPS:
+        step = STEPS[interval]
+        return start_at + ((after - start_at) // step + 1) * step
+    months = (after.year - start_at.year) * 12 + after.month - start_at.month
+    candidate = _add_months(start_at, months)
+    return candidate if candidate > after else _add_months(start_at, months + 1)
+
+
+def reschedule(schedule, after):
+    """Point ``next_run_at`` at the first run after ``after``, completing the schedule if there is none."""
+    upcoming = next_run(schedule.start_at, schedule.interval, after)
+    if upcoming is None or (schedule.end_at is not None and upcoming > schedule.end_at):
+        schedule.status = "completed"
+        schedule.next_run_at = None
+    else:
+        schedule.next_run_at = upcoming
+
+
+def _moment(value, field):
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid {field}: {value!r}")
+
+
+def _apply_fields(schedule, data):
+    if "amount" in data:
+        schedule.amount = to_cents(data["amount"])
+        if schedule.amount <= 0:
+            raise ValueError("Amount must be greater than zero")
+    if "interval" in data:
+        if data["interval"] not in INTERVALS:
+            raise ValueError(f"Interval must be one of {', '.join(INTERVALS)}")
+        schedule.interval = data["interval"]
+    if "start_at" in data:
+        schedule.start_at = _moment(data["start_at"], "start_at")
+    if "end_at" in data:
+        schedule.end_at = _moment(data["end_at"], "end_at") if data["end_at"] else None
+    if schedule.end_at is not None and schedule.end_at < schedule.start_at:
+        raise ValueError("end_at must not be before start_at")
+
+
+def create_scheduled_transfer(db, current_user, data):
+    if "amount" not in data:
+        raise ValueError("Missing amount")
+    sender = db.query(Account).filter_by(id=data.get("sender_id")).first()
+    if not sender or sender.user_id != current_user["id"]:
+        raise PermissionError("Sender account not found or unauthorized")
+    if not db.query(Account).filter_by(id=data.get("receiver_id")).first():
+        raise LookupError("Receiver account not found")
+    if sender.id == data["receiver_id"]:
+        raise ValueError("Sender and receiver cannot be the same")
+
+    schedule = ScheduledTransfer(
+        user_id=current_user["id"],
+        sender_id=sender.id,
+        receiver_id=data["receiver_id"],
+        interval="once",
+        start_at=datetime.utcnow(),
+        status="active"
+    )
+    _apply_fields(schedule, data)
+    schedule.next_run_at = schedule.start_at
+    db.add(schedule)
+    db.commit()
+
+    logger.info(f"🗓️ Scheduled {schedule.interval} transfer {schedule.id} of ${format_money(schedule.amount)} by user {current_user['username']}")
+    return schedule
+
+
+def get_scheduled_transfer(db, current_user, schedule_id, lock=False):
+    query = db.query(ScheduledTransfer).filter_by(id=schedule_id, user_id=current_user["id"])
+    # Locking waits for an executor that is running it
+    schedule = (query.with_for_update() if lock else query).first()
+    if not schedule:
+        raise LookupError("Scheduled transfer not found")
+    return schedule
+
+
+def update_scheduled_transfer(db, current_user, schedule_id, data):
+    """Change amount, timing or status; the next run is worked out again from the schedule."""
+    schedule = get_scheduled_transfer(db, current_user, schedule_id, lock=True)
+    if schedule.status == "completed":
+        raise ValueError("Scheduled transfer is completed")
+    if "status" in data and data["status"] not in USER_STATUSES:
+        raise ValueError(f"Status must be one of {', '.join(USER_STATUSES)}")
+
+    _apply_fields(schedule, data)
+    if "status" in data:
+        schedule.status = data["status"]
+        schedule.failure_count = 0
+    if schedule.last_run_at is None:
+        schedule.next_run_at = schedule.start_at
+    else:
+        reschedule(schedule, schedule.last_run_at)
+    schedule.claimed_at = None
+    db.commit()
+
+    logger.info(f"🗓️ Scheduled transfer {schedule.id} updated by user {current_user['username']}")
+    return schedule
+
+
+def delete_scheduled_transfer(db, current_user, schedule_id):
+    schedule = get_scheduled_transfer(db, current_user, schedule_id, lock=True)
+    db.delete(schedule)
+    db.commit()
+    logger.info(f"🗑️ Scheduled transfer {schedule_id} deleted by user {current_user['username']}")
@@ -0,0 +1,188 @@
+import csv
+import io
+import uuid
+from datetime import datetime
+from itertools import repeat
+from sqlalchemy import and_, case, delete, exists, func, insert, literal, null, select, union_all, update
+from sqlalchemy.orm import aliased
+from app.core.logger import logger
+from app.model.models import Account, LedgerPosting, SettlementStagingRow, Transaction
+from app.services.ledger.postings import ACCOUNT, COUNTERPARTY
+from app.services.ledger.projection import balance_expression
+from app.services.settlements.parsing import CHUNK_ROWS, read_chunks, validate_chunk
+
+STAGING_COLUMNS = ("import_id", "line", "reference", "account_number", "external_account_number", "amount")
+# Rejected lines kept for the report; the rest are only counted
+MAX_REPORTED_REJECTS = 100
+
+Staging = SettlementStagingRow
+
+
+def _copy_chunk(db, rows):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {Staging.__tablename__} ({', '.join(STAGING_COLUMNS)}) FROM STDIN WITH (FORMAT csv)", buffer
+        )
+    finally:
+        cursor.close()
+
+
+def _insert_chunk(db, rows):
+    # Straight to the driver: per-row ORM parameter handling would cost more
+    # than the INSERT itself on a million-row file
+    db.connection().exec_driver_sql(
+        f"INSERT INTO {Staging.__tablename__} ({', '.join(STAGING_COLUMNS)}) "
+        f"VALUES ({', '.join('?' * len(STAGING_COLUMNS))})",
+        list(rows),
+    )
+
+
+def stage_chunk(db, import_id, valid):
+    """Bulk-load validated rows: COPY on PostgreSQL, one executemany INSERT on SQLite."""
+    rows = zip(
+        repeat(import_id),
+        valid["line"].tolist(),
+        valid["reference"].tolist(),
+        valid["account_number"].tolist(),
+        valid["external_account_number"].tolist(),
+        valid["amount"].tolist(),
+    )
+    if db.get_bind().dialect.name == "postgresql":
+        _copy_chunk(db, rows)
+    else:
+        _insert_chunk(db, rows)
+
+
+def _mark(db, import_id, status, condition):
+    db.execute(
+        update(Staging)
+        .where(Staging.import_id == import_id, Staging.status.is_(None), condition)
+        .values(status=status)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def apply_staged(db, import_id, bank_name) -> dict:
+    """Turn an import's staged rows into transactions and postings, set-based.
+
+    Rows for unknown accounts, references this bank already settled, and
+    repeats of a reference within the file are marked and skipped. Every
+    step is one statement over the whole import, whatever its size; the
+    balance projection picks the postings up like any others.
+    """
+    in_import = Staging.import_id == import_id
+    account_match = and_(Account.account_number == Staging.account_number, Account.is_deleted == False)  # noqa: E712
+    earlier = aliased(Staging)
+
+    _mark(db, import_id, "unknown_account", ~exists().where(account_match))
+    _mark(db, import_id, "duplicate", exists().where(
+        Transaction.bank_name == bank_name, Transaction.external_reference == Staging.reference
+    ))
+    _mark(db, import_id, "duplicate", exists().where(
+        earlier.import_id == import_id, earlier.reference == Staging.reference, earlier.line < Staging.line
+    ))
+    _mark(db, import_id, "applied", literal(True))
+
+    applied = and_(in_import, Staging.status == "applied")
+    credited = Account.account_number.in_(select(Staging.account_number).where(applied))
+    # Settlement credits take the account lock like any other credit
+    db.execute(select(Account.id).where(credited).order_by(Account.id).with_for_update()).all()
+
+    # Live balance of each credited account, computed once rather than per row
+    opening = (
+        select(Account.id.label("account_id"), balance_expression().label("balance"))
+        .where(credited)
+        .subquery()
+    )
+    now = datetime.utcnow()
+    running = func.sum(Staging.amount).over(partition_by=Account.id, order_by=Staging.line)
+    db.execute(
+        insert(Transaction).from_select(
+            ["type", "amount", "timestamp", "receiver_id", "receiver_user_id", "receiver_balance_after",
+             "bank_name", "external_account_number", "external_reference"],
+            select(
+                literal("external_deposit"),
+                Staging.amount,
+                literal(now),
+                Account.id,
+                Account.user_id,
+                # Hot accounts' credits go unlocked, so no exact running balance
+                case((Account.balance_slots > 1, null()), else_=opening.c.balance + running),
+                literal(bank_name),
+                Staging.external_account_number,
+                Staging.reference,
+            )
+            .join(Account, account_match)
+            .join(opening, opening.c.account_id == Account.id)
+            .where(applied)
+            .order_by(Staging.line),
+        )
+    )
+
+    settled = (
+        select(Transaction.id, Transaction.receiver_id, Transaction.amount)
+        .join(Staging, and_(Transaction.external_reference == Staging.reference, Transaction.bank_name == bank_name))
+        .where(applied)
+        .subquery()
+    )
+    # Both legs of every new transaction in one INSERT, as post_transaction does
+    db.execute(insert(LedgerPosting).from_select(
+        ["transaction_id", "account_id", "ledger", "amount", "created_at"],
+        union_all(
+            select(settled.c.id, null(), literal(COUNTERPARTY["external_deposit"]), -settled.c.amount, literal(now)),
+            select(settled.c.id, settled.c.receiver_id, literal(ACCOUNT), settled.c.amount, literal(now)),
+        ),
+    ))
+
+    counts = dict(db.execute(
+        select(Staging.status, func.count()).where(in_import).group_by(Staging.status)
+    ).all())
+    total = db.execute(select(func.coalesce(func.sum(Staging.amount), 0)).where(applied)).scalar()
+    return {
+        "applied": counts.get("applied", 0),
+        "duplicates": counts.get("duplicate", 0),
+        "unknown_accounts": counts.get("unknown_account", 0),
+        "applied_amount": int(total),
+    }
+
+
+def import_settlement(db, stream, bank_name, file_format="csv", chunk_rows=CHUNK_ROWS) -> dict:
+    """Stream a settlement file into transactions; returns an import report.
+
+    Chunks are validated and staged one at a time, so memory stays flat
+    whatever the file size. Everything is applied and committed at the end,
+    in one database transaction: a failed import leaves nothing behind.
+    """
+    import_id = uuid.uuid4().hex
+    rows = 0
+    rejected = []
+    rejected_count = 0
+
+    try:
+        for lines, columns in read_chunks(stream, file_format, chunk_rows):
+            valid, bad = validate_chunk(lines, columns)
+            rows += len(lines)
+            rejected_count += len(bad)
+            rejected.extend(bad[:MAX_REPORTED_REJECTS - len(rejected)])
+            if len(valid["line"]):
+                stage_chunk(db, import_id, valid)
+
+        report = apply_staged(db, import_id, bank_name)
+        db.execute(delete(Staging).where(Staging.import_id == import_id))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    report.update(rows=rows, rejected=rejected_count, rejected_lines=[
+        {"line": line, "reason": reason} for line, reason in rejected
+    ])
+    logger.info(
+        f"🧾 Settlement import {import_id} from {bank_name}: {report['applied']} of {rows} rows applied, "
+        f"{rejected_count} rejected, {report['duplicates']} duplicates, {report['unknown_accounts']} unknown accounts"
+    )
+    return report
@@ -0,0 +1,122 @@
+import csv
+from itertools import islice
+import numpy as np
+
+# Fields of a settlement row. Amounts are decimal text in currency units
+# ("1234.50"), always credits to the RevouBank account.
+FIELDS = ("reference", "account_number", "external_account_number", "amount")
+# Fixed-width records: field -> (start, end) columns, 0-based, right-padded
+FIXED_WIDTH_LAYOUT = {
+    "reference": (0, 20),
+    "account_number": (20, 40),
+    "external_account_number": (40, 60),
+    "amount": (60, 75),
+}
+FORMATS = ("csv", "fixed")
+CHUNK_ROWS = 50_000
+MAX_REFERENCE_LENGTH = 64
+# Digits before the decimal point; keeps cents well inside int64
+MAX_WHOLE_DIGITS = 15
+
+
+def _csv_rows(stream):
+    reader = csv.reader(stream)
+    header = [name.strip() for name in next(reader, [])]
+    missing = [field for field in FIELDS if field not in header]
+    if missing:
+        raise ValueError(f"Settlement file is missing columns: {', '.join(missing)}")
+    positions = [header.index(field) for field in FIELDS]
+    width = max(positions) + 1
+
+    for line, row in enumerate(reader, start=2):
+        if not row:
+            continue
+        if len(row) < width:
+            row = row + [""] * (width - len(row))
+        yield line, [row[position] for position in positions]
+
+
+def _fixed_width_rows(stream):
+    spans = [FIXED_WIDTH_LAYOUT[field] for field in FIELDS]
+    for line, text in enumerate(stream, start=1):
+        text = text.rstrip("\r\n")
+        if not text.strip():
+            continue
+        yield line, [text[start:end] for start, end in spans]
+
+
+def read_chunks(stream, file_format, chunk_rows=CHUNK_ROWS):
+    """Yield the rows of a text ``stream`` in chunks of at most ``chunk_rows``.
+
+    Each chunk is ``(lines, columns)``: the file line numbers and one list
+    of raw strings per field. Only one chunk is held at a time.
+    """
+    if file_format not in FORMATS:
+        raise ValueError(f"Unknown settlement format {file_format!r}")
+    rows = _csv_rows(stream) if file_format == "csv" else _fixed_width_rows(stream)
+
+    while True:
+        chunk = list(islice(rows, chunk_rows))
+        if not chunk:
+            return
+        lines, values = zip(*chunk)
+        yield list(lines), dict(zip(FIELDS, map(list, zip(*values))))
+
+
+def validate_chunk(lines, columns):
+    """Check a chunk with whole-array operations.
+
+    Returns ``(valid, rejected)``: ``valid`` maps ``line`` and each field to
+    arrays of the good rows, with ``amount`` in cents; ``rejected`` is a list
+    of ``(line, reason)``.
+    """
+    lines = np.asarray(lines, dtype=np.int64)
+    reference = np.char.strip(np.asarray(columns["reference"], dtype=str))
+    account_number = np.char.strip(np.asarray(columns["account_number"], dtype=str))
+    external_account_number = np.char.strip(np.asarray(columns["external_account_number"], dtype=str))
+    amount = np.char.strip(np.asarray(columns["amount"], dtype=str))
+
+    parts = np.char.partition(amount, ".")
+    whole, fraction = parts[:, 0], parts[:, 2]
+    fraction_length = np.char.str_len(fraction)
+    well_formed = (
+        np.char.isdigit(whole)
+        & (np.char.str_len(whole) <= MAX_WHOLE_DIGITS)
+        & ((fraction_length == 0) | np.char.isdigit(fraction))
+        & (fraction_length <= 2)
+    )
+
+    cents = np.zeros(len(lines), dtype=np.int64)
+    if well_formed.any():
+        cents[well_formed] = (
+            whole[well_formed].astype(np.int64) * 100
+            + np.char.ljust(fraction[well_formed], 2, "0").astype(np.int64)
+        )
+
+    reference_length = np.char.str_len(reference)
+    reason = np.select(
+        [
+            (reference_length == 0) | (reference_length > MAX_REFERENCE_LENGTH),
+            np.char.str_len(account_number) == 0,
+            ~well_formed,
+            cents <= 0,
+        ],
+        [
+            f"reference must be 1-{MAX_REFERENCE_LENGTH} characters",
+            "account_number is required",
+            "amount must be a number with at most 2 decimal places",
+            "amount must be greater than zero",
+        ],
+        default="",
+    )
+    ok = reason == ""
+
+    valid = {
+        "line": lines[ok],
+        "reference": reference[ok],
+        "account_number": account_number[ok],
+        "external_account_number": external_account_number[ok],
+        "amount": cents[ok],
+    }
+    rejected = list(zip(lines[~ok].tolist(), reason[~ok].tolist()))
+    return valid, rejected
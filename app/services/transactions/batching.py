@@ -0,0 +1,104 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from app.core.logger import logger
+from app.database.db import SessionLocal
+from app.services.transactions.core import handle_external_deposits
+from app.utils.email_invoice import send_invoice_with_email
+from config import Config
+
+
+class DepositBatcher:
+    """Per-worker group commit for external deposits.
+
+    Request threads queue their deposit and wait; one flusher thread records
+    whatever arrived within ``max_wait_ms`` (at most ``max_items``) in a
+    single DB transaction, then hands each caller its own result. A rejected
+    deposit fails only its own request. If the batch itself fails, its
+    deposits are retried one at a time so only the culprit errors.
+    """
+
+    def __init__(self, max_items: int, max_wait_ms: float, session_factory=SessionLocal):
+        self.max_items = max_items
+        self.max_wait = max_wait_ms / 1000
+        self.session_factory = session_factory
+        self._queue = queue.Queue()
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def submit(self, current_user, data):
+        """Record one deposit through the next batch; returns ``(transaction, account)``."""
+        self._ensure_flusher()
+        future = Future()
+        self._queue.put((current_user, data, future))
+        transaction, account = future.result()
+
+        send_invoice_with_email(transaction, user=current_user, account=account)
+        return transaction, account
+
+    def _ensure_flusher(self):
+        # Threads don't survive a fork, so each worker process starts its own
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                self._queue = queue.Queue()
+                threading.Thread(target=self._run, args=(self._queue,), daemon=True, name="deposit-batcher").start()
+                self._pid = os.getpid()
+
+    def _run(self, pending):
+        while True:
+            batch = [pending.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_items:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(pending.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                self._flush(batch)
+            except Exception as e:
+                # Never leave a request waiting on a flusher that gave up
+                logger.error("❌ External deposit batch could not be recorded", exc_info=True)
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _flush(self, batch):
+        requests = [(current_user, data) for current_user, data, _ in batch]
+        # Results are read by the request threads after this session is closed
+        db = self.session_factory(expire_on_commit=False)
+        try:
+            try:
+                results = handle_external_deposits(db, requests)
+            except Exception:
+                db.rollback()
+                logger.error(f"❌ External deposit batch of {len(batch)} failed, retrying one by one", exc_info=True)
+                results = [self._record_one(db, request) for request in requests]
+        finally:
+            db.close()
+
+        for (_, _, future), result in zip(batch, results):
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    @staticmethod
+    def _record_one(db, request):
+        try:
+            return handle_external_deposits(db, [request])[0]
+        except Exception as e:
+            db.rollback()
+            return e
+
+
+deposit_batcher = DepositBatcher(
+    max_items=Config.EXTERNAL_DEPOSIT_BATCH_SIZE,
+    max_wait_ms=Config.EXTERNAL_DEPOSIT_BATCH_WAIT_MS,
+)
@@ -1,19 +1,80 @@
+from datetime import datetime, timedelta
 from flask import jsonify
-from decimal import Decimal
+from sqlalchemy import select
 from app.model.base import get_db
-from app.model.models import Account, Transaction, User, Bill
+from app.model.models import Account, Authorization, Transaction, User, Bill
 from app.services.invoice.invoice_generator import generate_invoice
 from app.services.email.utils import send_email_async
 from app.core.logger import logger
 from app.core.auth import get_current_user
 from app.utils.email_invoice import send_invoice_with_email
+from app.utils.money import format_money, to_cents
+from app.services.ledger.postings import post_transaction, post_transactions
+from app.services.ledger.projection import current_balance, live_balances
+from app.services.ledger.slots import credit_slot, is_hot
+from app.services.authorizations.balance import ledger_and_available, ledger_and_available_many
 from app.utils.verification import verify_card_number
+from config import Config
+
+# Handlers take and store amounts as integer cents; routes convert at the edge.
+# Balances are never updated in place: each handler appends the transaction
+# and its two ledger postings, and reads the live balance from the ledger.
+# Accounts are row-locked (in id order) before their balance is read, so
+# overdraft checks and running balances hold under concurrent requests.
+# Debits are checked against the available balance (ledger minus live card
+# holds); running balances record the ledger balance.
+# Bill payments lock the bill before the account, as autopay does, so a bill
+# is paid once and the two paths never wait on each other in a cycle.
+
+def _lock(db, *accounts):
+    ids = sorted(account.id for account in accounts)
+    db.execute(select(Account.id).where(Account.id.in_(ids)).order_by(Account.id).with_for_update()).all()
+
+
+def _lock_bill(db, bill_id, user_id):
+    """The user's bill, row-locked and read afresh (not from the session's copy)."""
+    return (
+        db.query(Bill)
+        .filter_by(id=bill_id, user_id=user_id)
+        .with_for_update()
+        .populate_existing()
+        .first()
+    )
+
+
+def _balance_after_credit(db, account, amount):
+    """Lock ``account`` and return its balance once ``amount`` arrives.
+
+    Hot accounts aren't locked for credits; the credit goes to a balance slot
+    and no running balance is recorded, so this returns None.
+    """
+    if is_hot(account):
+        return None
+    _lock(db, account)
+    return current_balance(db, account.id) + amount
+
+
+def credited_balance(db, transaction):
+    """The receiver's balance after ``transaction``; hot accounts record none, so theirs is read live."""
+    if transaction.receiver_balance_after is not None:
+        return transaction.receiver_balance_after
+    return current_balance(db, transaction.receiver_id)
+
+
+def _record(db, transaction, receiver=None):
+    db.add(transaction)
+    db.flush()
+    slot = credit_slot(db, receiver, transaction) if receiver is not None and is_hot(receiver) else None
+    post_transaction(db, transaction, receiver_slot=slot)
+    db.commit()
+    db.refresh(transaction)
+
 
 def handle_deposit(db, current_user, amount, receiver_id):
-    logger.info(f"💰 Deposit attempt of ${amount} by user {current_user['username']} to account {receiver_id}")
+    logger.info(f"💰 Deposit attempt of ${format_money(amount)} by user {current_user['username']} to account {receiver_id}")
     
     if amount <= 0:
-        logger.warning(f"⚠️ Invalid deposit amount ${amount} by user {current_user['username']}")
+        logger.warning(f"⚠️ Invalid deposit amount ${format_money(amount)} by user {current_user['username']}")
         raise ValueError("Amount must be greater than zero")
 
     account = db.query(Account).filter_by(id=receiver_id).first()
@@ -25,19 +86,16 @@ def handle_deposit(db, current_user, amount, receiver_id):
         logger.warning(f"🚫 Unauthorized deposit attempt to account {receiver_id} by user {current_user['username']}")
         raise PermissionError("Unauthorized to deposit to this account")
 
-    account.balance += Decimal(str(amount))
-
     transaction = Transaction(
         type="deposit",
-        amount=float(amount),
-        receiver_id=receiver_id
+        amount=amount,
+        receiver_id=receiver_id,
+        receiver_user_id=account.user_id,
+        receiver_balance_after=_balance_after_credit(db, account, amount)
     )
+    _record(db, transaction, receiver=account)
 
-    db.add(transaction)
-    db.commit()
-    db.refresh(transaction)
-
-    logger.info(f"✅ Deposit of ${amount} to account {receiver_id} by {current_user['username']}")
+    logger.info(f"✅ Deposit of ${format_money(amount)} to account {receiver_id} by {current_user['username']}")
 
     send_invoice_with_email(transaction, user=current_user, account=account)
 
@@ -56,20 +114,19 @@ def handle_withdrawal(db, current_user, amount, sender_id):
     if not account or account.user_id != current_user["id"]:
         raise PermissionError("Account not found or unauthorized")
 
-    if account.balance < amount:
+    _lock(db, account)
+    balance, available = ledger_and_available(db, account.id)
+    if available < amount:
         raise ValueError("Insufficient funds")
 
-    account.balance -= Decimal(str(amount))
-
     transaction = Transaction(
         type="withdrawal",
-        amount=float(amount),
-        sender_id=sender_id
+        amount=amount,
+        sender_id=sender_id,
+        sender_user_id=account.user_id,
+        sender_balance_after=balance - amount
     )
-
-    db.add(transaction)
-    db.commit()
-    db.refresh(transaction)
+    _record(db, transaction)
 
     send_invoice_with_email(transaction, user=current_user, account=account)
 
@@ -96,26 +153,27 @@ def handle_transfer (db, current_user, amount, sender_id, receiver_id):
         raise PermissionError("Sender account not found or unauthorized")
     if not receiver:
          raise PermissionError("Receiver account not found")
-    if sender.balance < amount:
-        raise ValueError("Insufficient funds")
-    
     if sender_id == receiver_id:
         raise ValueError("Sender and receiver cannot be the same")
 
+    # A hot receiver isn't locked, so paying a busy merchant only waits on the sender
+    hot_receiver = is_hot(receiver)
+    _lock(db, sender, *([] if hot_receiver else [receiver]))
+    sender_balance, available = ledger_and_available(db, sender.id)
+    if available < amount:
+        raise ValueError("Insufficient funds")
 
-    sender.balance -= Decimal(amount)
-    receiver.balance += Decimal(amount)
-    
     transaction = Transaction(
         type="transfer",
-        amount=float(amount),
+        amount=amount,
         sender_id=sender_id,
-        receiver_id=receiver_id
+        receiver_id=receiver_id,
+        sender_user_id=sender.user_id,
+        receiver_user_id=receiver.user_id,
+        sender_balance_after=sender_balance - amount,
+        receiver_balance_after=None if hot_receiver else current_balance(db, receiver.id) + amount
     )
-    
-    db.add(transaction)
-    db.commit()
-    db.refresh(transaction)
+    _record(db, transaction, receiver=receiver)
 
     send_invoice_with_email(transaction, user=current_user, account=sender)
 
@@ -126,12 +184,39 @@ def handle_transfer (db, current_user, amount, sender_id, receiver_id):
     return transaction, sender
 
 
-def handle_external_deposit(db, current_user, data):
+def adjust_balance(db, account, balance):
+    """Book whatever moves ``account`` to ``balance`` as an adjustment; the caller commits.
+
+    The difference is a transaction with its two postings like any other, so
+    the projection, snapshots and history all see it. Returns None when the
+    balance is already right.
+    """
+    _lock(db, account)
+    current = current_balance(db, account.id)
+    if balance == current:
+        return None
+
+    side = "receiver" if balance > current else "sender"
+    transaction = Transaction(
+        type="adjustment",
+        amount=abs(balance - current),
+        **{f"{side}_id": account.id, f"{side}_user_id": account.user_id, f"{side}_balance_after": balance},
+    )
+    db.add(transaction)
+    db.flush()
+    post_transaction(db, transaction)
+
+    logger.info(f"🧮 Account {account.id} adjusted from ${format_money(current)} to ${format_money(balance)} (txn_id={transaction.id})")
+    return transaction
+
+
+def prepare_external_deposit(db, current_user, data):
+    """Validate an external deposit; returns its unsaved transaction and the account."""
     logger.info(f"🏦 External deposit attempt of ${data['amount']} from {data['bank_name']} by user {current_user['username']}")
     
-    amount = Decimal(data["amount"])
+    amount = to_cents(data["amount"])
     if amount <= 0:
-        logger.warning(f"⚠️ Invalid external deposit amount ${amount} by user {current_user['username']}")
+        logger.warning(f"⚠️ Invalid external deposit amount ${format_money(amount)} by user {current_user['username']}")
         raise ValueError("Amount must be greater than zero")
     
     account = db.query(Account).filter_by(user_id=current_user["id"]).first()
@@ -139,35 +224,91 @@ def handle_external_deposit(db, current_user, data):
         logger.error(f"❌ Account not found for external deposit by user {current_user['username']}")
         raise ValueError("User account not found")
 
-    account.balance += amount
-
     transaction = Transaction(
         type="external_deposit",
-        amount=float(amount),
+        amount=amount,
         receiver_id=account.id,
+        receiver_user_id=account.user_id,
         bank_name=data["bank_name"],
         external_account_number=data["account_number"]
     )
+    return transaction, account
 
-    db.add(transaction)
-    db.commit()
-    db.refresh(transaction)
 
+def _log_external_deposit(current_user, data, transaction):
     logger.info(
-        f"💸 External deposit of ${amount} from {data['bank_name']} by user {current_user['username']} (txn_id={transaction.id})"
+        f"💸 External deposit of ${format_money(transaction.amount)} from {data['bank_name']} by user {current_user['username']} (txn_id={transaction.id})"
     )
 
+
+def handle_external_deposit(db, current_user, data):
+    transaction, account = prepare_external_deposit(db, current_user, data)
+    transaction.receiver_balance_after = _balance_after_credit(db, account, transaction.amount)
+    _record(db, transaction, receiver=account)
+
+    _log_external_deposit(current_user, data, transaction)
+
     send_invoice_with_email(transaction, user=current_user, account=account)
 
     return transaction, account
 
 
+def _record_credits(db, credits):
+    """Add and post many ``(transaction, receiving account)`` credits; the caller commits.
+
+    Each receiving account is locked and read once; running balances are
+    then carried through ``credits`` in order.
+    """
+    locked = {account.id: account for _, account in credits if not is_hot(account)}
+    if locked:
+        _lock(db, *locked.values())
+    running = live_balances(db, list(locked))
+    for transaction, account in credits:
+        if account.id in running:
+            running[account.id] += transaction.amount
+            transaction.receiver_balance_after = running[account.id]
+
+    transactions = [transaction for transaction, _ in credits]
+    db.add_all(transactions)
+    db.flush()
+    slots = [credit_slot(db, account, transaction) if is_hot(account) else None for transaction, account in credits]
+    post_transactions(db, transactions, slots)
+
+
+def handle_external_deposits(db, requests):
+    """Record many external deposits with one commit; no emails are sent.
+
+    ``requests`` is a list of ``(current_user, data)``. Returns one entry per
+    request, in order: ``(transaction, account)``, or the ValueError that
+    rejected it.
+    """
+    results = [None] * len(requests)
+    prepared = []
+    for index, (current_user, data) in enumerate(requests):
+        try:
+            transaction, account = prepare_external_deposit(db, current_user, data)
+        except ValueError as e:
+            results[index] = e
+            continue
+        prepared.append((index, transaction, account))
+    if not prepared:
+        return results
+
+    _record_credits(db, [(transaction, account) for _, transaction, account in prepared])
+    db.commit()
+
+    for index, transaction, account in prepared:
+        _log_external_deposit(*requests[index], transaction)
+        results[index] = (transaction, account)
+    return results
+
+
 def handle_external_withdrawal(db, current_user, data):
     logger.info(f"🏦 External withdrawal attempt of ${data['amount']} to {data['bank_name']} by user {current_user['username']}")
     
-    amount = Decimal(data["amount"])
+    amount = to_cents(data["amount"])
     if amount <= 0:
-        logger.warning(f"⚠️ Invalid external withdrawal amount ${amount} by user {current_user['username']}")
+        logger.warning(f"⚠️ Invalid external withdrawal amount ${format_money(amount)} by user {current_user['username']}")
         raise ValueError("Amount must be greater than zero")
     
     account = db.query(Account).filter_by(user_id=current_user["id"]).first()
@@ -175,27 +316,28 @@ def handle_external_withdrawal(db, current_user, data):
         logger.error(f"❌ Account not found for external withdrawal by user {current_user['username']}")
         raise ValueError("User account not found")
     
-    if account.balance < amount:
+    _lock(db, account)
+    balance, available = ledger_and_available(db, account.id)
+    if available < amount:
         logger.warning(f"⚠️ Insufficient funds for external withdrawal by user {current_user['username']}")
         raise ValueError("Insufficient funds")
-    
-    account.balance -= Decimal(str(amount))
 
-    # Store transaction
+    # The money leaves the account now; the partner bank settles it later
+    # in a batch, and a rejection credits it back
     transaction = Transaction(
         type="external_withdrawal",
-        amount=float(amount),
+        amount=amount,
         sender_id=account.id,
+        sender_user_id=account.user_id,
+        sender_balance_after=balance - amount,
         bank_name=data["bank_name"],
-        external_account_number=data["account_number"]
+        external_account_number=data["account_number"],
+        status="pending"
     )
-
-    db.add(transaction)
-    db.commit()
-    db.refresh(transaction)
+    _record(db, transaction)
 
     logger.info(
-        f"💸 External withdrawal of ${amount} to {data['bank_name']} by user {current_user['username']} (txn_id={transaction.id})"
+        f"💸 External withdrawal of ${format_money(amount)} to {data['bank_name']} by user {current_user['username']} (txn_id={transaction.id})"
     )
 
     send_invoice_with_email(transaction, user=current_user, account=account)
@@ -203,50 +345,80 @@ def handle_external_withdrawal(db, current_user, data):
     return transaction, account
 
 
+def reverse_external_withdrawals(db, withdrawals):
+    """Credit rejected external withdrawals back to their accounts; the caller commits.
+
+    Each gets an ``external_withdrawal_reversal`` transaction of its own.
+    """
+    accounts = {
+        account.id: account
+        for account in db.query(Account).filter(Account.id.in_({w.sender_id for w in withdrawals}))
+    }
+    reversals = [
+        (Transaction(
+            type="external_withdrawal_reversal",
+            amount=withdrawal.amount,
+            receiver_id=withdrawal.sender_id,
+            receiver_user_id=withdrawal.sender_user_id,
+            bank_name=withdrawal.bank_name,
+            external_account_number=withdrawal.external_account_number
+        ), accounts[withdrawal.sender_id])
+        for withdrawal in withdrawals
+    ]
+    _record_credits(db, reversals)
+
+    for withdrawal in withdrawals:
+        logger.info(f"↩️ External withdrawal {withdrawal.id} of ${format_money(withdrawal.amount)} rejected by {withdrawal.bank_name}, credited back")
+    return [transaction for transaction, _ in reversals]
+
+
 def handle_pay_bill_with_card(db, current_user, bill_id, card_number):
     # Verify card format
     if not verify_card_number(card_number):
         raise ValueError("Invalid card number")
 
     # Fetch the bill
-    bill = db.query(Bill).filter_by(id=bill_id, user_id=current_user["id"]).first()
+    bill = _lock_bill(db, bill_id, current_user["id"])
     if not bill:
         raise LookupError("Bill not found")
     if bill.is_paid:
         logger.warning(f"⚠️ Attempt to pay already paid bill {bill_id} by user {current_user['username']}")
         raise ValueError("Bill is already paid")
+    if _held_authorization(db, bill.id):
+        raise ValueError("Bill has a pending card authorization")
 
     amount = bill.amount
     if amount <= 0:
-        logger.error(f"❌ Invalid bill amount ${amount} for bill {bill_id}")
+        logger.error(f"❌ Invalid bill amount ${format_money(amount)} for bill {bill_id}")
         raise ValueError("Bill amount must be greater than zero")
 
     # Fetch account
     account = db.query(Account).filter_by(user_id=current_user["id"]).first()
-    if not account or account.balance < amount:
+    if account:
+        _lock(db, account)
+    balance, available = ledger_and_available(db, account.id) if account else (None, None)
+    if not account or available < amount:
         logger.warning(f"⚠️ Insufficient balance for bill payment by user {current_user['username']}")
         raise ValueError("Insufficient balance or account not found")
 
-    logger.info(f"💳 Processing bill payment of ${amount} for bill {bill_id} by user {current_user['username']}")
+    logger.info(f"💳 Processing bill payment of ${format_money(amount)} for bill {bill_id} by user {current_user['username']}")
 
-    # Deduct balance and mark bill as paid
-    account.balance -= Decimal(str(amount))
+    # Mark bill as paid and debit the account
     bill.is_paid = True
 
     # Create transaction
     transaction = Transaction(
         type="bill_payment",
-        amount=float(amount),
+        amount=amount,
         sender_id=account.id,
+        sender_user_id=account.user_id,
+        sender_balance_after=balance - amount,
         biller_name=bill.biller_name,
         payment_method="credit_card"
     )
-
-    db.add(transaction)
-    db.commit()
-    db.refresh(transaction)
+    _record(db, transaction)
     
-    logger.info(f"✅ Bill payment successful: ${amount} paid to {bill.biller_name} (txn_id={transaction.id})")
+    logger.info(f"✅ Bill payment successful: ${format_money(amount)} paid to {bill.biller_name} (txn_id={transaction.id})")
 
     send_invoice_with_email(transaction, user=current_user, account=account)
     return transaction, account
@@ -254,36 +426,205 @@ def handle_pay_bill_with_card(db, current_user, bill_id, card_number):
 
 
 def handle_pay_bill_from_balance(db, current_user, bill_id):
-    bill = db.query(Bill).filter_by(id=bill_id, user_id=current_user["id"]).first()
+    bill = _lock_bill(db, bill_id, current_user["id"])
     if not bill:
         raise LookupError("Bill not found")
     if bill.is_paid:
         logger.warning(f"⚠️ Attempt to pay already paid bill {bill_id} by user {current_user['username']}")
         raise ValueError("Bill already paid")
+    if _held_authorization(db, bill.id):
+        raise ValueError("Bill has a pending card authorization")
 
     account = db.query(Account).filter_by(user_id=current_user["id"]).first()
-    if not account or account.balance < bill.amount:
+    if account:
+        _lock(db, account)
+    balance, available = ledger_and_available(db, account.id) if account else (None, None)
+    if not account or available < bill.amount:
         logger.warning(f"⚠️ Insufficient balance for bill payment by user {current_user['username']}")
         raise ValueError("Insufficient balance or no account found")
 
-    logger.info(f"💳 Processing bill payment of ${bill.amount} for bill {bill_id} by user {current_user['username']}")
+    logger.info(f"💳 Processing bill payment of ${format_money(bill.amount)} for bill {bill_id} by user {current_user['username']}")
 
-    account.balance -= Decimal(str(bill.amount))
     bill.is_paid = True
 
     transaction = Transaction(
         type="bill_payment",
-        amount=float(bill.amount),
+        amount=bill.amount,
         sender_id=account.id,
+        sender_user_id=account.user_id,
+        sender_balance_after=balance - bill.amount,
         biller_name=bill.biller_name,
         payment_method="account_balance"
     )
+    _record(db, transaction)
 
-    db.add(transaction)
+    logger.info(f"✅ Bill payment successful: ${format_money(bill.amount)} paid to {bill.biller_name} (txn_id={transaction.id})")
+
+    send_invoice_with_email(transaction, user=current_user, account=account)
+    return transaction, account
+
+
+def pay_bills_from_balance(db, bills, payment_method="autopay"):
+    """Pay many bills from the accounts they are billed to; the caller commits. No emails are sent.
+
+    ``bills`` is a list of ``(bill, account)``, paid in that order. Each
+    account is locked and read once; a bill is skipped if the available
+    balance left doesn't cover it. Returns one entry per bill: its
+    transaction, or the error that skipped it.
+    """
+    accounts = {account.id: account for _, account in bills}
+    if not accounts:
+        return []
+    _lock(db, *accounts.values())
+    balances = ledger_and_available_many(db, list(accounts))
+    held = set(db.execute(
+        select(Authorization.bill_id)
+        .where(Authorization.bill_id.in_([bill.id for bill, _ in bills]), Authorization.status == "held")
+    ).scalars())
+
+    results = []
+    for bill, account in bills:
+        ledger, available = balances[account.id]
+        if account.user_id != bill.user_id:
+            results.append(PermissionError("Account not found or unauthorized"))
+            continue
+        if bill.id in held:
+            results.append(ValueError("Bill has a pending card authorization"))
+            continue
+        if available < bill.amount:
+            results.append(ValueError("Insufficient balance"))
+            continue
+
+        balances[account.id] = (ledger - bill.amount, available - bill.amount)
+        bill.is_paid = True
+        results.append(Transaction(
+            type="bill_payment",
+            amount=bill.amount,
+            sender_id=account.id,
+            sender_user_id=account.user_id,
+            sender_balance_after=ledger - bill.amount,
+            biller_name=bill.biller_name,
+            payment_method=payment_method
+        ))
+
+    transactions = [result for result in results if isinstance(result, Transaction)]
+    if transactions:
+        db.add_all(transactions)
+        db.flush()
+        post_transactions(db, transactions, [None] * len(transactions))
+    return results
+
+
+def _held_authorization(db, bill_id):
+    return db.query(Authorization).filter_by(bill_id=bill_id, status="held").first()
+
+
+def handle_authorize_bill_with_card(db, current_user, bill_id, card_number):
+    """Place a hold for a bill's amount; nothing is posted until it is captured.
+
+    The hold lowers the available balance straight away and lapses after
+    ``Config.AUTHORIZATION_TTL_MINUTES`` unless captured or released.
+    """
+    if not verify_card_number(card_number):
+        raise ValueError("Invalid card number")
+
+    bill = _lock_bill(db, bill_id, current_user["id"])
+    if not bill:
+        raise LookupError("Bill not found")
+    if bill.is_paid:
+        logger.warning(f"⚠️ Attempt to authorize already paid bill {bill_id} by user {current_user['username']}")
+        raise ValueError("Bill is already paid")
+    if bill.amount <= 0:
+        logger.error(f"❌ Invalid bill amount ${format_money(bill.amount)} for bill {bill_id}")
+        raise ValueError("Bill amount must be greater than zero")
+
+    account = db.query(Account).filter_by(user_id=current_user["id"]).first()
+    if not account:
+        raise ValueError("Insufficient balance or account not found")
+    # The account lock also serialises holds on the same bill
+    _lock(db, account)
+    if _held_authorization(db, bill.id):
+        raise ValueError("Bill has a pending card authorization")
+    now = datetime.utcnow()
+    _, available = ledger_and_available(db, account.id, now)
+    if available < bill.amount:
+        logger.warning(f"⚠️ Insufficient available balance for card authorization by user {current_user['username']}")
+        raise ValueError("Insufficient balance or account not found")
+
+    authorization = Authorization(
+        account_id=account.id,
+        user_id=account.user_id,
+        bill_id=bill.id,
+        amount=bill.amount,
+        biller_name=bill.biller_name,
+        created_at=now,
+        expires_at=now + timedelta(minutes=Config.AUTHORIZATION_TTL_MINUTES)
+    )
+    db.add(authorization)
     db.commit()
-    db.refresh(transaction)
+    db.refresh(authorization)
+
+    logger.info(f"🔒 Card authorization {authorization.id} holds ${format_money(bill.amount)} for bill {bill_id} by user {current_user['username']}")
+    return authorization, account
+
+
+def _open_authorization(db, current_user, authorization_id):
+    """The caller's held authorization, locked along with its bill (if any) and account."""
+    authorization = db.query(Authorization).filter_by(id=authorization_id, user_id=current_user["id"]).first()
+    if not authorization:
+        raise LookupError("Authorization not found")
+    if authorization.bill_id:
+        _lock_bill(db, authorization.bill_id, authorization.user_id)
+    account = db.get(Account, authorization.account_id)
+    _lock(db, account)
+    db.refresh(authorization)
+    if authorization.status != "held" or authorization.expires_at <= datetime.utcnow():
+        raise ValueError(f"Authorization is {'expired' if authorization.status == 'held' else authorization.status}")
+    return authorization, account
+
+
+def handle_capture_authorization(db, current_user, authorization_id):
+    """Turn a held authorization into its bill payment.
+
+    The funds were reserved when it was authorized, so this only checks
+    the hold is still live.
+    """
+    authorization, account = _open_authorization(db, current_user, authorization_id)
+    bill = db.get(Bill, authorization.bill_id) if authorization.bill_id else None
+    if bill and bill.is_paid:
+        raise ValueError("Bill is already paid")
+
+    logger.info(f"💳 Capturing card authorization {authorization.id} of ${format_money(authorization.amount)} by user {current_user['username']}")
+
+    if bill:
+        bill.is_paid = True
+    balance = current_balance(db, account.id)
+    transaction = Transaction(
+        type="bill_payment",
+        amount=authorization.amount,
+        sender_id=account.id,
+        sender_user_id=account.user_id,
+        sender_balance_after=balance - authorization.amount,
+        biller_name=authorization.biller_name,
+        payment_method="credit_card"
+    )
+    authorization.status = "captured"
+    authorization.closed_at = datetime.utcnow()
+    authorization.transaction = transaction
+    _record(db, transaction)
 
-    logger.info(f"✅ Bill payment successful: ${bill.amount} paid to {bill.biller_name} (txn_id={transaction.id})")
+    logger.info(f"✅ Bill payment successful: ${format_money(transaction.amount)} paid to {transaction.biller_name} (txn_id={transaction.id})")
 
     send_invoice_with_email(transaction, user=current_user, account=account)
     return transaction, account
+
+
+def handle_release_authorization(db, current_user, authorization_id):
+    """Drop a held authorization, returning its amount to the available balance."""
+    authorization, account = _open_authorization(db, current_user, authorization_id)
+    authorization.status = "released"
+    authorization.closed_at = datetime.utcnow()
+    db.commit()
+
+    logger.info(f"🔓 Card authorization {authorization.id} released by user {current_user['username']}")
+    return authorization, account
@@ -0,0 +1,81 @@
+import csv
+import io
+from datetime import datetime, timedelta
+import orjson
+from sqlalchemy import select
+from app.model.models import Transaction
+from app.services.transactions.listing import MONEY_FIELDS, TRANSACTION_COLUMNS, involves_user, transaction_row
+from app.utils.money import format_money
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+FIELDS = [column.key for column in TRANSACTION_COLUMNS]
+TIMESTAMP_INDEX = FIELDS.index("timestamp")
+MONEY_INDEXES = [FIELDS.index(key) for key in MONEY_FIELDS]
+
+
+def parse_bound(value, end=False):
+    """Parse ``from``/``to``; a bare date as ``to`` covers that whole day."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"Invalid date: {value}. Use ISO 8601, e.g. 2025-01-31")
+    if end and len(value) == 10:
+        parsed += timedelta(days=1)
+    return parsed
+
+
+def export_statement(user_id, start=None, end=None):
+    stmt = select(*TRANSACTION_COLUMNS).where(involves_user(user_id))
+    if start:
+        stmt = stmt.where(Transaction.timestamp >= start)
+    if end:
+        stmt = stmt.where(Transaction.timestamp < end)
+    # Primary key order: no sort buffer, and ids follow insertion time
+    return stmt.order_by(Transaction.id)
+
+
+def iter_export(db, user_id, fmt, start=None, end=None, batch_size=1000):
+    """Yield the user's transactions as CSV or NDJSON, one chunk per batch.
+
+    ``yield_per`` turns on a server-side cursor (``stream_results``), so only
+    ``batch_size`` rows are held in memory at a time whatever the history size.
+    """
+    result = db.execute(export_statement(user_id, start, end).execution_options(yield_per=batch_size))
+    encode = _csv_chunks if fmt == "csv" else _ndjson_chunks
+    try:
+        yield from encode(result.partitions())
+    finally:
+        result.close()
+
+
+def _csv_row(row):
+    values = list(row)
+    values[TIMESTAMP_INDEX] = row.timestamp.isoformat() if row.timestamp else ""
+    # Exact two-decimal text, so spreadsheets never see a float
+    for i in MONEY_INDEXES:
+        if values[i] is not None:
+            values[i] = format_money(values[i])
+    return values
+
+
+def _csv_chunks(partitions):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(FIELDS)
+    for rows in partitions:
+        writer.writerows(_csv_row(row) for row in rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _ndjson_chunks(partitions):
+    for rows in partitions:
+        yield b"".join(orjson.dumps(transaction_row(row), option=orjson.OPT_APPEND_NEWLINE) for row in rows)
@@ -0,0 +1,71 @@
+from sqlalchemy import select, or_, func
+from app.model.models import Transaction
+from app.utils.money import to_units
+
+# Everything Transaction.as_dict() returns, selected as plain columns
+TRANSACTION_COLUMNS = [
+    Transaction.id,
+    Transaction.type,
+    Transaction.amount,
+    Transaction.timestamp,
+    Transaction.sender_id,
+    Transaction.receiver_id,
+    Transaction.bank_name,
+    Transaction.external_account_number,
+    Transaction.biller_name,
+    Transaction.payment_method,
+    Transaction.sender_balance_after,
+    Transaction.receiver_balance_after,
+    Transaction.status,
+]
+# Stored as cents, returned in major units
+MONEY_FIELDS = ("amount", "sender_balance_after", "receiver_balance_after")
+
+
+def involves_user(user_id):
+    """Transactions sent or received by the user (owner columns, indexed with timestamp)."""
+    return or_(Transaction.sender_user_id == user_id, Transaction.receiver_user_id == user_id)
+
+
+def transaction_row(row) -> dict:
+    data = dict(row._mapping)
+    data.pop("total", None)
+    data.pop("max_id", None)
+    data.pop("last_updated", None)
+    data["timestamp"] = data["timestamp"].isoformat() if data["timestamp"] else None
+    for key in MONEY_FIELDS:
+        data[key] = to_units(data[key])
+    return data
+
+
+def list_transactions_page(db, user_id, page, per_page):
+    """Return ``(total, version, rows)`` for one page of the user's history.
+
+    A single statement over the owner columns; window aggregates carry the
+    total and the ETag version on every row. Only a page past the end needs
+    a second, aggregate-only query. Rows come back unconverted (see
+    :func:`transaction_row`) so a 304 can be answered without that work.
+    """
+    condition = involves_user(user_id)
+    stmt = (
+        select(
+            *TRANSACTION_COLUMNS,
+            func.count().over().label("total"),
+            func.max(Transaction.id).over().label("max_id"),
+            func.max(Transaction.updated_at).over().label("last_updated"),
+        )
+        .where(condition)
+        .order_by(Transaction.timestamp.desc(), Transaction.id.desc())
+        .offset((page - 1) * per_page)
+        .limit(per_page)
+    )
+    rows = db.execute(stmt).all()
+
+    if rows:
+        total, max_id, last_updated = rows[0].total, rows[0].max_id, rows[0].last_updated
+    else:
+        total, max_id, last_updated = db.execute(
+            select(func.count(Transaction.id), func.max(Transaction.id), func.max(Transaction.updated_at)).where(condition)
+        ).one()
+
+    return total, (total, max_id, last_updated, [row.id for row in rows]), rows
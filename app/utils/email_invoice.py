@@ -1,13 +1,23 @@
 def send_invoice_with_email(transaction, user, account):
     from app.services.invoice.invoice_generator import generate_invoice
     from app.services.email.utils import send_email_async
+    from app.utils.money import format_money
+
+    amount = format_money(transaction.amount)
+    # The account's balance right after this transaction, as recorded with it
+    if account.id == transaction.receiver_id:
+        balance = transaction.receiver_balance_after
+    else:
+        balance = transaction.sender_balance_after
+    # Credits to hot accounts don't record one
+    balance_line = f"New Balance: ${format_money(balance)}" if balance is not None else "Your balance will reflect this shortly."
 
     invoice_filename = f"invoice_{transaction.id}.pdf"
     invoice_path = generate_invoice(
         transaction_details={
             "id": transaction.id,
             "transaction_type": transaction.type,
-            "amount": str(transaction.amount),
+            "amount": amount,
             "timestamp": transaction.timestamp.isoformat()
         },
         filename=invoice_filename,
@@ -27,9 +37,9 @@ def send_invoice_with_email(transaction, user, account):
         "deposit": f"""
             Dear {user['username']},
 
-            Your deposit of ${transaction.amount} has been processed.
+            Your deposit of ${amount} has been processed.
             Transaction ID: {transaction.id}
-            New Balance: ${account.balance}
+            {balance_line}
 
             Invoice attached.
 
@@ -38,9 +48,9 @@ def send_invoice_with_email(transaction, user, account):
         "withdrawal": f"""
             Dear {user['username']},
 
-            Your withdrawal of ${transaction.amount} has been processed.
+            Your withdrawal of ${amount} has been processed.
             Transaction ID: {transaction.id}
-            New Balance: ${account.balance}
+            {balance_line}
 
             Invoice attached.
 
@@ -49,9 +59,9 @@ def send_invoice_with_email(transaction, user, account):
         "bill_payment": f"""
             Dear {user['username']},
 
-            Your bill payment of ${transaction.amount} has been processed.
+            Your bill payment of ${amount} has been processed.
             Transaction ID: {transaction.id}
-            New Balance: ${account.balance}
+            {balance_line}
 
             Invoice attached.
 
@@ -61,9 +71,9 @@ def send_invoice_with_email(transaction, user, account):
     }.get(transaction.type, f"""
         Dear {user['username']},
 
-        Your transaction of ${transaction.amount} has been processed.
+        Your transaction of ${amount} has been processed.
         Transaction ID: {transaction.id}
-        New Balance: ${account.balance}
+        {balance_line}
 
         Invoice attached.
 
@@ -0,0 +1,49 @@
+# app/utils/money.py
+from decimal import Decimal, InvalidOperation
+
+# Amounts are integer cents from the request parser down to the database;
+# major units (dollars) only exist in request bodies and responses.
+CENTS = 100
+
+
+def to_cents(value) -> int:
+    """Parse a major-unit amount (``"12.34"``, ``12.34``, ``12``) into cents.
+
+    A float means the decimal it prints as, so ``0.1`` is ten cents, not its
+    binary approximation. More than two decimal places is an error, not a
+    rounding.
+    """
+    if isinstance(value, bool):
+        raise ValueError(f"Invalid amount: {value!r}")
+    if isinstance(value, int):
+        return value * CENTS
+    if isinstance(value, float) and abs(value) < 1e13:
+        # The nearest cent reproduces the float only if it had at most two
+        # decimals; this avoids a str/Decimal round trip per request
+        cents = round(value * CENTS)
+        if cents / CENTS == value:
+            return cents
+        raise ValueError("Amount can have at most two decimal places")
+    try:
+        amount = value if isinstance(value, Decimal) else Decimal(str(value).strip())
+    except (InvalidOperation, TypeError):
+        raise ValueError(f"Invalid amount: {value!r}")
+    if not amount.is_finite():
+        raise ValueError(f"Invalid amount: {value!r}")
+
+    cents = amount * CENTS
+    if cents != cents.to_integral_value():
+        raise ValueError("Amount can have at most two decimal places")
+    return int(cents)
+
+
+def to_units(cents):
+    """Cents as a major-unit float for JSON responses (``1999`` -> ``19.99``)."""
+    return cents / CENTS if cents is not None else None
+
+
+def format_money(cents) -> str:
+    """Cents as fixed two-decimal text for messages and invoices (``-5`` -> ``-0.05``)."""
+    sign = "-" if cents < 0 else ""
+    whole, part = divmod(abs(cents), CENTS)
+    return f"{sign}{whole}.{part:02d}"
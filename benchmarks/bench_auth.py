@@ -0,0 +1,98 @@
+"""Per-endpoint cost of resolving the caller: JWT-claims principal vs. DB load.
+
+    python -m benchmarks.bench_auth [--requests 500]
+
+"fresh" mode forces every handler through ``get_current_user(fresh=True)``,
+which is what all endpoints did before the principal middleware.
+"""
+import argparse
+import functools
+import os
+import tempfile
+import time
+
+_tmp = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmp.name}")
+os.environ.setdefault("SECRET_KEY", "bench")
+
+from flask_jwt_extended import create_access_token  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from app import create_app  # noqa: E402
+from app.core.auth import get_current_user  # noqa: E402
+from app.database.db import db, engine  # noqa: E402
+from app.model.models import Account, Bill, Budget, TransactionCategory, User  # noqa: E402
+from app.routes import bills, budgets, categories, transactions  # noqa: E402
+
+ENDPOINTS = [
+    "/bills/",
+    "/budgets/",
+    "/categories/",
+    "/transactions/check-balance/?account_id=1",
+]
+ROUTE_MODULES = [bills, budgets, categories, transactions]
+
+
+def seed(app):
+    with app.app_context():
+        db.create_all()
+        user = User(id=1, username="bench", password="x", email="bench@example.com", is_verified=True)
+        account = Account(id=1, user_id=1, account_type="savings", balance=1000, account_number="bench00001")
+        db.session.add_all([user, account])
+        db.session.flush()
+        db.session.add_all([
+            Bill(user_id=1, biller_name="Water", due_date=__import__("datetime").date.today(), amount=10, account_id=1),
+            Budget(user_id=1, category="Food", amount=100),
+            TransactionCategory(user_id=1, name="Groceries"),
+        ])
+        db.session.commit()
+        return create_access_token(identity="1", additional_claims={"role": "user", "username": "bench"})
+
+
+def run(client, headers, path, requests):
+    statements = []
+    listener = lambda *a, **kw: statements.append(1)  # noqa: E731
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        client.get(path, headers=headers)  # warm-up
+        statements.clear()
+        start = time.perf_counter()
+        for _ in range(requests):
+            client.get(path, headers=headers)
+        elapsed = time.perf_counter() - start
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    return elapsed / requests * 1000, len(statements) / requests
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    app = create_app()
+    app.config["RATELIMIT_ENABLED"] = False
+    token = seed(app)
+    headers = {"Authorization": f"Bearer {token}"}
+    client = app.test_client()
+
+    results = {}
+    for mode in ("fresh", "principal"):
+        originals = {m: m.get_current_user for m in ROUTE_MODULES}
+        if mode == "fresh":
+            for module in ROUTE_MODULES:
+                module.get_current_user = functools.partial(get_current_user, fresh=True)
+        try:
+            results[mode] = {path: run(client, headers, path, args.requests) for path in ENDPOINTS}
+        finally:
+            for module, original in originals.items():
+                module.get_current_user = original
+
+    print(f"{'endpoint':45} {'fresh ms':>9} {'principal ms':>13} {'saved':>7} {'queries':>12}")
+    for path in ENDPOINTS:
+        (fresh_ms, fresh_q), (principal_ms, principal_q) = results["fresh"][path], results["principal"][path]
+        saved = (1 - principal_ms / fresh_ms) * 100
+        print(f"{path:45} {fresh_ms:9.3f} {principal_ms:13.3f} {saved:6.1f}% {fresh_q:5.1f} -> {principal_q:.1f}")
+
+
+if __name__ == "__main__":
+    main()
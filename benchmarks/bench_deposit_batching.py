@@ -0,0 +1,93 @@
+"""Sustained external deposits per second: one commit per request vs. group commit.
+
+    python -m benchmarks.bench_deposit_batching [--threads 32] [--seconds 5] [--batch 200] [--wait-ms 5]
+
+Each thread plays a request worker depositing into its own account, either
+through ``handle_external_deposit`` (its own transaction and commit) or
+``DepositBatcher.submit`` (shared commits). Emails are disabled in both.
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+_tmp = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmp.name}")
+os.environ.setdefault("SECRET_KEY", "bench")
+
+from sqlalchemy.exc import OperationalError  # noqa: E402
+from app import create_app  # noqa: E402
+from app.database.db import SessionLocal, db  # noqa: E402
+from app.model.models import Account, LedgerPosting, Transaction, User  # noqa: E402
+from app.services.transactions import batching, core  # noqa: E402
+from app.services.transactions.batching import DepositBatcher  # noqa: E402
+
+DEPOSIT = {"amount": "12.34", "bank_name": "Bench Bank", "account_number": "1"}
+
+
+def seed(app, users):
+    with app.app_context():
+        db.create_all()
+        for model in (LedgerPosting, Transaction, Account, User):
+            db.session.query(model).delete()
+        db.session.add_all(
+            [User(id=i, username=f"bench{i}", password="x", email=f"bench{i}@example.com") for i in range(1, users + 1)]
+            + [Account(id=i, user_id=i, account_type="checking", balance=0, account_number=f"bench{i:05d}")
+               for i in range(1, users + 1)]
+        )
+        db.session.commit()
+
+
+def direct(user):
+    session = SessionLocal()
+    try:
+        core.handle_external_deposit(session, user, DEPOSIT)
+    finally:
+        session.close()
+
+
+def run(threads, seconds, deposit):
+    counts = []
+
+    def worker(user_id):
+        user = {"id": user_id, "username": f"bench{user_id}"}
+        done = failed = 0
+        while time.perf_counter() < deadline:
+            try:
+                deposit(user)
+                done += 1
+            except OperationalError:
+                failed += 1
+        counts.append((done, failed))
+
+    deadline = time.perf_counter() + seconds
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(1, threads + 1)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    return sum(done for done, _ in counts), sum(failed for _, failed in counts)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--batch", type=int, default=200)
+    parser.add_argument("--wait-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    app = create_app()
+    core.send_invoice_with_email = batching.send_invoice_with_email = lambda *a, **kw: None
+    batcher = DepositBatcher(args.batch, args.wait_ms)
+
+    print(f"{'mode':10} {'deposits/s':>12} {'failed':>8}")
+    for mode, deposit in (("direct", direct), ("batched", lambda user: batcher.submit(user, DEPOSIT))):
+        seed(app, args.threads)
+        done, failed = run(args.threads, args.seconds, deposit)
+        print(f"{mode:10} {done / args.seconds:12.0f} {failed:8}")
+
+
+if __name__ == "__main__":
+    main()
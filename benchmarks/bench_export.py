@@ -0,0 +1,87 @@
+"""Peak Python memory of the streaming export vs. loading the history with .all().
+
+    python -m benchmarks.bench_export [--rows 50000 200000]
+
+The streaming peak should stay flat as the row count grows; the ``.all()``
+peak grows linearly with it.
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+_tmp = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmp.name}")
+os.environ.setdefault("SECRET_KEY", "bench")
+
+from flask_jwt_extended import create_access_token  # noqa: E402
+from app import create_app  # noqa: E402
+from app.database.db import SessionLocal, db  # noqa: E402
+from app.model.models import Account, Transaction, User  # noqa: E402
+
+
+def seed(app, rows):
+    with app.app_context():
+        db.create_all()
+        db.session.query(Transaction).delete()
+        if not db.session.get(User, 1):
+            db.session.add_all([
+                User(id=1, username="bench", password="x", email="bench@example.com", is_verified=True),
+                Account(id=1, user_id=1, account_type="savings", balance=100_000, account_number="bench00001"),
+            ])
+        start = datetime(2020, 1, 1)
+        db.session.execute(
+            Transaction.__table__.insert(),
+            [{"type": "deposit", "amount": i % 500 * 100 + 25, "receiver_id": 1, "receiver_user_id": 1,
+              "timestamp": start + timedelta(minutes=i)} for i in range(rows)],
+        )
+        db.session.commit()
+        return create_access_token(identity="1", additional_claims={"role": "user", "username": "bench"})
+
+
+def measure(func):
+    tracemalloc.start()
+    started = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 2**20, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[50_000, 200_000])
+    args = parser.parse_args()
+
+    app = create_app()
+    app.config["RATELIMIT_ENABLED"] = False
+    client = app.test_client()
+
+    print(f"{'rows':>9} {'mode':8} {'peak MiB':>9} {'seconds':>8}")
+    for rows in args.rows:
+        token = seed(app, rows)
+        headers = {"Authorization": f"Bearer {token}"}
+
+        def stream(fmt):
+            response = client.get(f"/transactions/export?format={fmt}", headers=headers, buffered=False)
+            for _ in response.response:
+                pass
+            response.close()
+
+        def load_all():
+            session = SessionLocal()
+            try:
+                [t.as_dict() for t in session.query(Transaction).filter(Transaction.receiver_user_id == 1).all()]
+            finally:
+                session.close()
+
+        for mode, func in (("csv", lambda: stream("csv")), ("ndjson", lambda: stream("ndjson")), (".all()", load_all)):
+            peak, elapsed = measure(func)
+            print(f"{rows:9d} {mode:8} {peak:9.1f} {elapsed:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
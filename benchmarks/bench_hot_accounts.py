@@ -0,0 +1,100 @@
+"""Throughput of concurrent payments into one merchant account, with and without hot mode.
+
+    DATABASE_URL=postgresql://... python -m benchmarks.bench_hot_accounts [--threads 16] [--seconds 5] [--slots 8]
+
+Every thread pays the same merchant from its own account through
+``handle_transfer``. In normal mode each payment holds the merchant's row
+lock until commit, so payments queue behind each other; in hot mode they
+only lock the payer and add to one of the merchant's balance slots.
+
+Point DATABASE_URL at PostgreSQL for meaningful numbers: the default
+temporary SQLite file serializes every writer, so both modes measure the
+same database-wide lock there.
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+_tmp = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmp.name}")
+os.environ.setdefault("SECRET_KEY", "bench")
+
+from sqlalchemy.exc import OperationalError  # noqa: E402
+from app import create_app  # noqa: E402
+from app.database.db import SessionLocal, db  # noqa: E402
+from app.model.models import Account, AccountBalanceSlot, LedgerPosting, Transaction, User  # noqa: E402
+from app.services.ledger.projection import current_balance  # noqa: E402
+from app.services.ledger.slots import fold_slots, set_slots  # noqa: E402
+from app.services.transactions import core  # noqa: E402
+
+MERCHANT = 1
+
+
+def seed(app, payers):
+    with app.app_context():
+        db.create_all()
+        for model in (LedgerPosting, AccountBalanceSlot, Transaction, Account, User):
+            db.session.query(model).delete()
+        db.session.add_all(
+            [User(id=i, username=f"bench{i}", password="x", email=f"bench{i}@example.com") for i in range(1, payers + 2)]
+            + [Account(id=i, user_id=i, account_type="checking", balance=0 if i == MERCHANT else 10**12,
+                       account_number=f"bench{i:05d}") for i in range(1, payers + 2)]
+        )
+        db.session.commit()
+
+
+def pay(payer, deadline, counts):
+    user = {"id": payer, "username": f"bench{payer}"}
+    session = SessionLocal()
+    done = failed = 0
+    try:
+        while time.perf_counter() < deadline:
+            try:
+                core.handle_transfer(session, user, 100, payer, MERCHANT)
+                done += 1
+            except OperationalError:
+                session.rollback()
+                failed += 1
+    finally:
+        session.close()
+    counts.append((done, failed))
+
+
+def run(threads, seconds):
+    counts = []
+    deadline = time.perf_counter() + seconds
+    workers = [threading.Thread(target=pay, args=(payer, deadline, counts)) for payer in range(2, threads + 2)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return sum(done for done, _ in counts), sum(failed for _, failed in counts)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--slots", type=int, default=8)
+    args = parser.parse_args()
+
+    app = create_app()
+    core.send_invoice_with_email = lambda *a, **kw: None  # PDF rendering would dominate
+
+    print(f"{'mode':10} {'payments/s':>12} {'failed':>8}")
+    for mode, slots in (("normal", 1), ("hot", args.slots)):
+        seed(app, args.threads)
+        session = SessionLocal()
+        set_slots(session, session.get(Account, MERCHANT), slots)
+        done, failed = run(args.threads, args.seconds)
+
+        fold_slots(session)
+        assert current_balance(session, MERCHANT) == done * 100
+        session.close()
+        print(f"{mode:10} {done / args.seconds:12.0f} {failed:8}")
+
+
+if __name__ == "__main__":
+    main()
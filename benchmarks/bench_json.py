@@ -0,0 +1,82 @@
+"""JSON encoding cost: Flask's stdlib provider vs. the orjson provider.
+
+    python -m benchmarks.bench_json [--rows 500] [--requests 200]
+
+Measures raw ``dumps`` of a transaction page and end-to-end
+``GET /transactions/?per_page=<rows>`` with each provider installed.
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+_tmp = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmp.name}")
+os.environ.setdefault("SECRET_KEY", "bench")
+
+from flask.json.provider import DefaultJSONProvider  # noqa: E402
+from flask_jwt_extended import create_access_token  # noqa: E402
+from app import create_app  # noqa: E402
+from app.core.json_provider import OrjsonProvider  # noqa: E402
+from app.database.db import db  # noqa: E402
+from app.model.models import Account, Transaction, User  # noqa: E402
+
+
+def seed(app, rows):
+    with app.app_context():
+        db.create_all()
+        db.session.add_all([
+            User(id=1, username="bench", password="x", email="bench@example.com", is_verified=True),
+            Account(id=1, user_id=1, account_type="savings", balance=100_000, account_number="bench00001"),
+        ])
+        db.session.flush()
+        start = datetime(2025, 1, 1)
+        db.session.add_all([
+            Transaction(type="deposit", amount=i * 100 + 50, receiver_id=1, receiver_user_id=1, timestamp=start + timedelta(minutes=i))
+            for i in range(rows)
+        ])
+        db.session.commit()
+        payload = [t.as_dict() for t in db.session.query(Transaction).all()]
+        token = create_access_token(identity="1", additional_claims={"role": "user", "username": "bench"})
+        return token, payload
+
+
+def timed(func, repeat):
+    func()  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    app = create_app()
+    app.config["RATELIMIT_ENABLED"] = False
+    token, payload = seed(app, args.rows)
+    headers = {"Authorization": f"Bearer {token}"}
+    client = app.test_client()
+    path = f"/transactions/?per_page={args.rows}"
+
+    results = {}
+    for name, provider in (("stdlib", DefaultJSONProvider(app)), ("orjson", OrjsonProvider(app))):
+        app.json = provider
+        with app.app_context():
+            dumps_ms = timed(lambda: provider.dumps({"transactions": payload}), args.requests)
+        request_ms = timed(lambda: client.get(path, headers=headers), args.requests)
+        results[name] = (dumps_ms, request_ms)
+
+    print(f"{'provider':10} {'dumps ms':>10} {'GET ms':>10}")
+    for name, (dumps_ms, request_ms) in results.items():
+        print(f"{name:10} {dumps_ms:10.3f} {request_ms:10.3f}")
+    (std_dumps, std_req), (orj_dumps, orj_req) = results["stdlib"], results["orjson"]
+    print(f"speed-up: dumps x{std_dumps / orj_dumps:.1f}, request {(1 - orj_req / std_req) * 100:.1f}% faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Money handling cost: Decimal/float conversions vs. integer cents.
+
+    python -m benchmarks.bench_money [--calls 200000] [--rows 1000000]
+
+``handler`` replays the money work of one withdrawal: parse the request
+amount, check and debit the balance, then bind amount and balance for the
+INSERT/UPDATE and read them back. ``legacy`` is the old Decimal(str(...)) /
+float(...) path over Float and Numeric(10, 2) columns, ``cents`` the integer
+path over Money columns. ``aggregate`` sums a history of amounts.
+"""
+import argparse
+import os
+import tempfile
+import time
+from decimal import Decimal
+
+_tmp = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmp.name}")
+os.environ.setdefault("SECRET_KEY", "bench")
+
+import numpy as np  # noqa: E402
+from sqlalchemy import Float, Numeric  # noqa: E402
+from sqlalchemy.dialects import postgresql  # noqa: E402
+from app.model.types import Money  # noqa: E402
+from app.utils.money import to_cents  # noqa: E402
+
+DIALECT = postgresql.psycopg2.dialect()
+
+
+def processors(column_type):
+    return column_type.bind_processor(DIALECT) or (lambda v: v), column_type.result_processor(DIALECT, None) or (lambda v: v)
+
+
+def legacy_handler(calls):
+    bind_float, load_float = processors(Float())
+    bind_numeric, load_numeric = processors(Numeric(10, 2))
+    balance = Decimal("10000000.00")
+    for _ in range(calls):
+        amount = Decimal(str(12.34))             # route
+        if balance < amount:                      # handler
+            raise ValueError
+        balance -= Decimal(str(amount))
+        stored = bind_float(float(amount)), bind_numeric(balance)
+        amount_back, balance = load_float(stored[0]), load_numeric(stored[1])
+    return balance
+
+
+def cents_handler(calls):
+    bind_money, load_money = processors(Money())
+    balance = 1_000_000_000
+    for _ in range(calls):
+        amount = to_cents(12.34)                  # route
+        if balance < amount:                      # handler
+            raise ValueError
+        balance -= amount
+        stored = bind_money(amount), bind_money(balance)
+        amount_back, balance = load_money(stored[0]), load_money(stored[1])
+    return balance
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=200_000)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    legacy_s, legacy_balance = timed(legacy_handler, args.calls)
+    cents_s, cents_balance = timed(cents_handler, args.calls)
+    assert to_cents(legacy_balance) == cents_balance
+
+    print(f"{'handler':10} {'us/call':>10}")
+    print(f"{'legacy':10} {legacy_s / args.calls * 1e6:10.3f}")
+    print(f"{'cents':10} {cents_s / args.calls * 1e6:10.3f}")
+    print(f"speed-up: x{legacy_s / cents_s:.1f}")
+
+    rng = np.random.default_rng(0)
+    cents = rng.integers(1, 100_000, size=args.rows, dtype=np.int64)
+    floats = (cents / 100).tolist()
+    decimals = [Decimal(int(c)).scaleb(-2) for c in cents]
+
+    float_s, float_total = timed(sum, floats)
+    decimal_s, decimal_total = timed(sum, decimals)
+    numpy_s, numpy_total = timed(np.sum, cents)
+
+    print(f"\n{'aggregate':10} {'ms':>10}  total over {args.rows} rows")
+    print(f"{'float':10} {float_s * 1000:10.2f}  {float_total!r}")
+    print(f"{'Decimal':10} {decimal_s * 1000:10.2f}  {decimal_total}")
+    print(f"{'int64':10} {numpy_s * 1000:10.2f}  {int(numpy_total)} cents")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Settlement file import: wall time and peak memory for a large CSV.
+
+    python -m benchmarks.bench_settlements [--rows 1000000] [--accounts 1000]
+
+Writes a settlement file spread over ``--accounts`` accounts, imports it
+through ``import_settlement`` and prints the phases' throughput. Peak RSS
+should stay roughly flat as ``--rows`` grows.
+"""
+import argparse
+import os
+import resource
+import tempfile
+import time
+
+_tmp = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmp.name}")
+os.environ.setdefault("SECRET_KEY", "bench")
+
+from app import create_app  # noqa: E402
+from app.database.db import SessionLocal, db  # noqa: E402
+from app.model.models import Account, LedgerPosting, Transaction, User  # noqa: E402
+from app.services.settlements.ingest import import_settlement  # noqa: E402
+
+
+def seed(app, accounts):
+    with app.app_context():
+        db.create_all()
+        for model in (LedgerPosting, Transaction, Account, User):
+            db.session.query(model).delete()
+        db.session.add(User(id=1, username="bench", password="x", email="bench@example.com"))
+        db.session.add_all([Account(id=i, user_id=1, account_type="checking", balance=0,
+                                    account_number=f"bench{i:05d}") for i in range(1, accounts + 1)])
+        db.session.commit()
+
+
+def write_file(rows, accounts):
+    path = tempfile.NamedTemporaryFile(suffix=".csv", delete=False).name
+    with open(path, "w") as out:
+        out.write("reference,account_number,amount,external_account_number\n")
+        for i in range(rows):
+            out.write(f"S{i:09d},bench{i % accounts + 1:05d},{i % 500 + 1}.{i % 100:02d},EXT{i % 97}\n")
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--accounts", type=int, default=1_000)
+    args = parser.parse_args()
+
+    app = create_app()
+    seed(app, args.accounts)
+    path = write_file(args.rows, args.accounts)
+    size = os.path.getsize(path) / 2**20
+
+    session = SessionLocal()
+    started = time.perf_counter()
+    with open(path, newline="") as stream:
+        report = import_settlement(session, stream, "Bench Bank")
+    elapsed = time.perf_counter() - started
+    session.close()
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"file: {args.rows} rows, {size:.0f} MiB")
+    print(f"applied: {report['applied']} in {elapsed:.1f}s ({report['applied'] / elapsed:,.0f} rows/s)")
+    print(f"peak RSS: {peak:.0f} MiB")
+    os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
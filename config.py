@@ -24,6 +24,47 @@ class Config:
     
     MAX_FAILED_ATTEMPTS = 4
     LOCK_DURATION = timedelta(minutes=15)
+
+    # Sliding-window limits for money-moving endpoints and login
+    RATE_LIMIT_PER_USER = os.getenv("RATE_LIMIT_PER_USER", "60 per minute")
+    RATE_LIMIT_PER_ACCOUNT = os.getenv("RATE_LIMIT_PER_ACCOUNT", "20 per minute")
+    RATE_LIMIT_PER_USERNAME = os.getenv("RATE_LIMIT_PER_USERNAME", "10 per minute")
+
+    # Revoked JWTs: Redis is the source of truth, a per-worker Bloom filter
+    # (synced every REVOCATION_SYNC_SECONDS) answers "not revoked" locally
+    REVOCATION_SYNC_SECONDS = float(os.getenv("REVOCATION_SYNC_SECONDS", 1))
+    REVOCATION_FILTER_CAPACITY = int(os.getenv("REVOCATION_FILTER_CAPACITY", 100_000))
+    REVOCATION_FILTER_FP_RATE = float(os.getenv("REVOCATION_FILTER_FP_RATE", 0.001))
+
+    # Per-worker Bloom filter of usernames used to short-circuit unknown logins
+    USERNAME_FILTER_FP_RATE = float(os.getenv("USERNAME_FILTER_FP_RATE", 0.01))
+    USERNAME_FILTER_REFRESH_SECONDS = int(os.getenv("USERNAME_FILTER_REFRESH_SECONDS", 15))
+
+    # Response compression (brotli if installed, else gzip) for bodies at least this big
+    COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", 1024))
+    COMPRESS_GZIP_LEVEL = int(os.getenv("COMPRESS_GZIP_LEVEL", 6))
+    COMPRESS_BROTLI_QUALITY = int(os.getenv("COMPRESS_BROTLI_QUALITY", 4))
+    # Group commit for external deposits: each worker records the deposits
+    # that arrive within the wait window (up to the batch size) in one commit
+    EXTERNAL_DEPOSIT_BATCHING = os.getenv("EXTERNAL_DEPOSIT_BATCHING", "False").lower() == "true"
+    EXTERNAL_DEPOSIT_BATCH_SIZE = int(os.getenv("EXTERNAL_DEPOSIT_BATCH_SIZE", 200))
+    EXTERNAL_DEPOSIT_BATCH_WAIT_MS = float(os.getenv("EXTERNAL_DEPOSIT_BATCH_WAIT_MS", 5))
+    # Partner bank gateway for external withdrawals: pending withdrawals are
+    # batched per bank and submitted with bounded concurrency; outcomes come
+    # back to GATEWAY_CALLBACK_URL signed with GATEWAY_SECRET
+    GATEWAY_URL = os.getenv("GATEWAY_URL", "http://127.0.0.1:5055")
+    GATEWAY_SECRET = os.environ["GATEWAY_SECRET"]
+    GATEWAY_CALLBACK_URL = os.getenv("GATEWAY_CALLBACK_URL", "http://127.0.0.1:5000/external/gateway/callback")
+    GATEWAY_TIMEOUT_SECONDS = float(os.getenv("GATEWAY_TIMEOUT_SECONDS", 10))
+    GATEWAY_BATCH_SIZE = int(os.getenv("GATEWAY_BATCH_SIZE", 500))
+    GATEWAY_MAX_CONCURRENCY = int(os.getenv("GATEWAY_MAX_CONCURRENCY", 4))
+    # Card authorizations hold funds until captured or released; after this
+    # long the hold lapses and the expiry sweeper closes it
+    AUTHORIZATION_TTL_MINUTES = int(os.getenv("AUTHORIZATION_TTL_MINUTES", 7 * 24 * 60))
+    # Worker processes for the daily bill autopay run
+    AUTOPAY_WORKERS = int(os.getenv("AUTOPAY_WORKERS", 1))
+    # Bills due within this many days are in the daily reminder email
+    BILL_REMINDER_DAYS = int(os.getenv("BILL_REMINDER_DAYS", 3))
     SQLALCHEMY_DATABASE_URI = DATABASE_URL
     LOG_LEVEL = "INFO"
 
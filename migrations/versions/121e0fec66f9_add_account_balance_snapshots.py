@@ -0,0 +1,35 @@
+"""Add account_balance_snapshots
+
+Revision ID: 121e0fec66f9
+Revises: d6d0efda51d2
+Create Date: 2026-10-19 13:31:52.604417
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '121e0fec66f9'
+down_revision = 'd6d0efda51d2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('account_balance_snapshots',
+    sa.Column('account_id', sa.Integer(), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('closing_balance', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.ForeignKeyConstraint(['account_id'], ['accounts.id'], ),
+    sa.PrimaryKeyConstraint('account_id', 'date')
+    )
+    # The nightly snapshot reads one day of transactions across all accounts
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.create_index('ix_transactions_timestamp', ['timestamp'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.drop_index('ix_transactions_timestamp')
+    op.drop_table('account_balance_snapshots')
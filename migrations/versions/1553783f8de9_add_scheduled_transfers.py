@@ -0,0 +1,58 @@
+"""Add scheduled transfers
+
+Revision ID: 1553783f8de9
+Revises: dbb2a217c00b
+Create Date: 2026-10-19 19:27:44.180392
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1553783f8de9'
+down_revision = 'dbb2a217c00b'
+branch_labels = None
+depends_on = None
+
+ACTIVE = sa.text("status = 'active'")
+
+
+def upgrade():
+    op.create_table('scheduled_transfers',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('sender_id', sa.Integer(), nullable=False),
+    sa.Column('receiver_id', sa.Integer(), nullable=False),
+    sa.Column('amount', sa.BigInteger(), nullable=False),
+    sa.Column('interval', sa.String(length=10), nullable=False),
+    sa.Column('start_at', sa.DateTime(), nullable=False),
+    sa.Column('end_at', sa.DateTime(), nullable=True),
+    sa.Column('next_run_at', sa.DateTime(), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('claimed_at', sa.DateTime(), nullable=True),
+    sa.Column('last_run_at', sa.DateTime(), nullable=True),
+    sa.Column('last_transaction_id', sa.Integer(), nullable=True),
+    sa.Column('last_error', sa.String(length=255), nullable=True),
+    sa.Column('run_count', sa.Integer(), nullable=False),
+    sa.Column('failure_count', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], name='fk_scheduled_transfers_user_id_users'),
+    sa.ForeignKeyConstraint(['sender_id'], ['accounts.id'], name='fk_scheduled_transfers_sender_id_accounts'),
+    sa.ForeignKeyConstraint(['receiver_id'], ['accounts.id'], name='fk_scheduled_transfers_receiver_id_accounts'),
+    sa.ForeignKeyConstraint(['last_transaction_id'], ['transactions.id'], name='fk_scheduled_transfers_last_transaction_id_transactions'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('scheduled_transfers', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_scheduled_transfers_user_id'), ['user_id'], unique=False)
+        batch_op.create_index('ix_scheduled_transfers_due', ['next_run_at'], unique=False,
+                              postgresql_where=ACTIVE, sqlite_where=ACTIVE)
+
+
+def downgrade():
+    with op.batch_alter_table('scheduled_transfers', schema=None) as batch_op:
+        batch_op.drop_index('ix_scheduled_transfers_due')
+        batch_op.drop_index(batch_op.f('ix_scheduled_transfers_user_id'))
+
+    op.drop_table('scheduled_transfers')
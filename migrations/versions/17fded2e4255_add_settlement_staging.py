@@ -0,0 +1,46 @@
+"""Add settlement staging and external references
+
+Revision ID: 17fded2e4255
+Revises: 918666dd7fa8
+Create Date: 2026-10-19 16:48:05.127733
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '17fded2e4255'
+down_revision = '918666dd7fa8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('settlement_staging',
+    sa.Column('import_id', sa.String(length=32), nullable=False),
+    sa.Column('line', sa.Integer(), nullable=False),
+    sa.Column('reference', sa.String(length=64), nullable=False),
+    sa.Column('account_number', sa.String(), nullable=False),
+    sa.Column('external_account_number', sa.String(length=100), nullable=True),
+    sa.Column('amount', sa.BigInteger(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=True),
+    sa.PrimaryKeyConstraint('import_id', 'line')
+    )
+    with op.batch_alter_table('settlement_staging', schema=None) as batch_op:
+        batch_op.create_index('ix_settlement_staging_import_id_reference', ['import_id', 'reference', 'line'], unique=False)
+
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('external_reference', sa.String(length=64), nullable=True))
+        batch_op.create_index('uq_transactions_bank_name_external_reference', ['bank_name', 'external_reference'], unique=True)
+
+
+def downgrade():
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.drop_index('uq_transactions_bank_name_external_reference')
+        batch_op.drop_column('external_reference')
+
+    with op.batch_alter_table('settlement_staging', schema=None) as batch_op:
+        batch_op.drop_index('ix_settlement_staging_import_id_reference')
+
+    op.drop_table('settlement_staging')
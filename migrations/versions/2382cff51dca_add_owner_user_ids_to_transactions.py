@@ -0,0 +1,57 @@
+"""Add sender_user_id and receiver_user_id to transactions
+
+Revision ID: 2382cff51dca
+Revises: 6dd9cb0a5d42
+Create Date: 2026-10-19 11:20:41.338190
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2382cff51dca'
+down_revision = '6dd9cb0a5d42'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 10_000
+
+BACKFILL = sa.text("""
+    UPDATE transactions SET
+        sender_user_id = (SELECT user_id FROM accounts WHERE accounts.id = transactions.sender_id),
+        receiver_user_id = (SELECT user_id FROM accounts WHERE accounts.id = transactions.receiver_id)
+    WHERE id >= :low AND id < :high
+""")
+
+
+def upgrade():
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('sender_user_id', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('receiver_user_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key('fk_transactions_sender_user_id_users', 'users', ['sender_user_id'], ['id'])
+        batch_op.create_foreign_key('fk_transactions_receiver_user_id_users', 'users', ['receiver_user_id'], ['id'])
+
+    # Backfill in id ranges, each committed on its own, so a large table is
+    # never locked by one long UPDATE
+    bind = op.get_bind()
+    low, high = bind.execute(sa.text("SELECT MIN(id), MAX(id) FROM transactions")).one()
+    if low is not None:
+        with op.get_context().autocommit_block():
+            for start in range(low, high + 1, BATCH_SIZE):
+                bind.execute(BACKFILL, {"low": start, "high": start + BATCH_SIZE})
+
+    # Built after the backfill: one index build instead of per-row maintenance
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.create_index('ix_transactions_sender_user_id_timestamp', ['sender_user_id', 'timestamp'], unique=False)
+        batch_op.create_index('ix_transactions_receiver_user_id_timestamp', ['receiver_user_id', 'timestamp'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.drop_index('ix_transactions_receiver_user_id_timestamp')
+        batch_op.drop_index('ix_transactions_sender_user_id_timestamp')
+        batch_op.drop_constraint('fk_transactions_receiver_user_id_users', type_='foreignkey')
+        batch_op.drop_constraint('fk_transactions_sender_user_id_users', type_='foreignkey')
+        batch_op.drop_column('receiver_user_id')
+        batch_op.drop_column('sender_user_id')
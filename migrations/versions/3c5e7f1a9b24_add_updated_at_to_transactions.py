@@ -0,0 +1,28 @@
+"""Add updated_at to transactions
+
+Revision ID: 3c5e7f1a9b24
+Revises: 982a0e215e13
+Create Date: 2026-10-19 22:41:37.204518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c5e7f1a9b24'
+down_revision = '982a0e215e13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Part of the transactions listing's ETag version, so settling a
+    # withdrawal in place changes it
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.drop_column('updated_at')
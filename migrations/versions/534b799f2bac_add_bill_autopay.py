@@ -0,0 +1,29 @@
+"""Add bill autopay and the unpaid due-date index
+
+Revision ID: 534b799f2bac
+Revises: 1553783f8de9
+Create Date: 2026-10-19 20:06:31.742915
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '534b799f2bac'
+down_revision = '1553783f8de9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('bills', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('autopay', sa.Boolean(), server_default=sa.false(), nullable=False))
+        batch_op.create_index('ix_bills_unpaid_due_date', ['due_date'], unique=False,
+                              postgresql_where=sa.text('is_paid = false'), sqlite_where=sa.text('is_paid = 0'))
+
+
+def downgrade():
+    with op.batch_alter_table('bills', schema=None) as batch_op:
+        batch_op.drop_index('ix_bills_unpaid_due_date')
+        batch_op.drop_column('autopay')
@@ -0,0 +1,31 @@
+"""Add updated_at to bills, budgets and transaction_categories
+
+Revision ID: 6dd9cb0a5d42
+Revises: f7aa7e1d0869
+Create Date: 2026-10-19 10:02:17.514208
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6dd9cb0a5d42'
+down_revision = 'f7aa7e1d0869'
+branch_labels = None
+depends_on = None
+
+TABLES = ('bills', 'budgets', 'transaction_categories')
+
+
+def upgrade():
+    # Part of the ETag version marker for the list endpoints
+    for table in TABLES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    for table in TABLES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_column('updated_at')
@@ -0,0 +1,82 @@
+"""Store money as integer cents
+
+Revision ID: 74ee00601853
+Revises: 121e0fec66f9
+Create Date: 2026-10-19 14:02:37.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '74ee00601853'
+down_revision = '121e0fec66f9'
+branch_labels = None
+depends_on = None
+
+NUMERIC = sa.Numeric(precision=10, scale=2)
+
+# (table, column, previous type, nullable)
+MONEY_COLUMNS = [
+    ('accounts', 'balance', NUMERIC, False),
+    ('transactions', 'amount', sa.Float(), False),
+    ('transactions', 'sender_balance_after', NUMERIC, True),
+    ('transactions', 'receiver_balance_after', NUMERIC, True),
+    ('bills', 'amount', sa.Float(), False),
+    ('budgets', 'amount', sa.Float(), False),
+    ('account_balance_snapshots', 'closing_balance', NUMERIC, False),
+]
+
+
+def _tables():
+    tables = {}
+    for table, column, old_type, nullable in MONEY_COLUMNS:
+        tables.setdefault(table, []).append((column, old_type, nullable))
+    return tables
+
+
+def _is_postgresql():
+    return op.get_bind().dialect.name == 'postgresql'
+
+
+def upgrade():
+    postgresql = _is_postgresql()
+    for table, columns in _tables().items():
+        if not postgresql:
+            # Scale while the column can still hold the result; the type
+            # change below then copies whole numbers only
+            op.execute(f"UPDATE {table} SET " + ", ".join(
+                f"{column} = ROUND({column} * 100)" for column, _, _ in columns
+            ))
+
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            for column, old_type, nullable in columns:
+                # Floats go through NUMERIC so 0.29 becomes 29, not 28
+                batch_op.alter_column(
+                    column,
+                    existing_type=old_type,
+                    type_=sa.BigInteger(),
+                    existing_nullable=nullable,
+                    postgresql_using=f"ROUND({column}::numeric * 100)::bigint",
+                )
+
+
+def downgrade():
+    postgresql = _is_postgresql()
+    for table, columns in _tables().items():
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            for column, old_type, nullable in columns:
+                cast_to = 'numeric(10, 2)' if old_type is NUMERIC else 'double precision'
+                batch_op.alter_column(
+                    column,
+                    existing_type=sa.BigInteger(),
+                    type_=old_type,
+                    existing_nullable=nullable,
+                    postgresql_using=f"({column} / 100.0)::{cast_to}",
+                )
+
+        if not postgresql:
+            op.execute(f"UPDATE {table} SET " + ", ".join(
+                f"{column} = {column} / 100.0" for column, _, _ in columns
+            ))
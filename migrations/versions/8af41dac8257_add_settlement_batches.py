@@ -0,0 +1,60 @@
+"""Add settlement batches and transaction status
+
+Revision ID: 8af41dac8257
+Revises: 17fded2e4255
+Create Date: 2026-10-19 17:31:52.604118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8af41dac8257'
+down_revision = '17fded2e4255'
+branch_labels = None
+depends_on = None
+
+UNBATCHED = sa.text("status = 'pending' AND settlement_batch_id IS NULL")
+
+
+def upgrade():
+    op.create_table('settlement_batches',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('bank_name', sa.String(length=100), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('item_count', sa.Integer(), nullable=False),
+    sa.Column('total', sa.BigInteger(), nullable=False),
+    sa.Column('gateway_reference', sa.String(length=64), nullable=True),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('submitted_at', sa.DateTime(), nullable=True),
+    sa.Column('settled_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('gateway_reference')
+    )
+    with op.batch_alter_table('settlement_batches', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_settlement_batches_status'), ['status'], unique=False)
+
+    # Existing external withdrawals were final when made
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('status', sa.String(length=20), server_default='completed', nullable=False))
+        batch_op.add_column(sa.Column('settlement_batch_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key('fk_transactions_settlement_batch_id_settlement_batches', 'settlement_batches', ['settlement_batch_id'], ['id'])
+        batch_op.create_index(batch_op.f('ix_transactions_settlement_batch_id'), ['settlement_batch_id'], unique=False)
+        batch_op.create_index('ix_transactions_unbatched', ['bank_name', 'id'], unique=False,
+                              postgresql_where=UNBATCHED, sqlite_where=UNBATCHED)
+
+
+def downgrade():
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.drop_index('ix_transactions_unbatched')
+        batch_op.drop_index(batch_op.f('ix_transactions_settlement_batch_id'))
+        batch_op.drop_constraint('fk_transactions_settlement_batch_id_settlement_batches', type_='foreignkey')
+        batch_op.drop_column('settlement_batch_id')
+        batch_op.drop_column('status')
+
+    with op.batch_alter_table('settlement_batches', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_settlement_batches_status'))
+
+    op.drop_table('settlement_batches')
@@ -0,0 +1,41 @@
+"""Add hot account balance slots
+
+Revision ID: 918666dd7fa8
+Revises: f992b11f39ac
+Create Date: 2026-10-19 16:02:17.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '918666dd7fa8'
+down_revision = 'f992b11f39ac'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('account_balance_slots',
+    sa.Column('account_id', sa.Integer(), nullable=False),
+    sa.Column('slot', sa.Integer(), nullable=False),
+    sa.Column('balance', sa.BigInteger(), nullable=False),
+    sa.ForeignKeyConstraint(['account_id'], ['accounts.id'], ),
+    sa.PrimaryKeyConstraint('account_id', 'slot')
+    )
+    with op.batch_alter_table('accounts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('balance_slots', sa.Integer(), server_default='1', nullable=False))
+
+    with op.batch_alter_table('ledger_postings', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('slot', sa.Integer(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('ledger_postings', schema=None) as batch_op:
+        batch_op.drop_column('slot')
+
+    with op.batch_alter_table('accounts', schema=None) as batch_op:
+        batch_op.drop_column('balance_slots')
+
+    op.drop_table('account_balance_slots')
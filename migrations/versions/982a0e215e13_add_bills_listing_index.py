@@ -0,0 +1,26 @@
+"""Add bills listing index
+
+Revision ID: 982a0e215e13
+Revises: a71c20e7ad80
+Create Date: 2026-10-19 21:19:02.671548
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '982a0e215e13'
+down_revision = 'a71c20e7ad80'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('bills', schema=None) as batch_op:
+        batch_op.create_index('ix_bills_user_id_is_paid_due_date', ['user_id', 'is_paid', 'due_date'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('bills', schema=None) as batch_op:
+        batch_op.drop_index('ix_bills_user_id_is_paid_due_date')
@@ -0,0 +1,28 @@
+"""Add bill overdue and reminder flags
+
+Revision ID: a71c20e7ad80
+Revises: 534b799f2bac
+Create Date: 2026-10-19 20:48:15.306827
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a71c20e7ad80'
+down_revision = '534b799f2bac'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('bills', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('is_overdue', sa.Boolean(), server_default=sa.false(), nullable=False))
+        batch_op.add_column(sa.Column('reminded_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('bills', schema=None) as batch_op:
+        batch_op.drop_column('reminded_at')
+        batch_op.drop_column('is_overdue')
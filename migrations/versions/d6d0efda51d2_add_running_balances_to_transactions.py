@@ -0,0 +1,61 @@
+"""Add running balances to transactions
+
+Revision ID: d6d0efda51d2
+Revises: 2382cff51dca
+Create Date: 2026-10-19 12:05:09.871442
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd6d0efda51d2'
+down_revision = '2382cff51dca'
+branch_labels = None
+depends_on = None
+
+# Walk each account's movements newest-first from its current balance: the
+# balance after a transaction is the current balance minus everything that
+# happened since.
+RUNNING = """
+    WITH moves AS (
+        SELECT id AS txn_id, sender_id AS account_id, -amount AS delta, timestamp
+        FROM transactions WHERE sender_id IS NOT NULL
+        UNION ALL
+        SELECT id, receiver_id, amount, timestamp
+        FROM transactions WHERE receiver_id IS NOT NULL
+    ), running AS (
+        SELECT m.txn_id, m.account_id,
+               a.balance - COALESCE(SUM(m.delta) OVER (
+                   PARTITION BY m.account_id
+                   ORDER BY m.timestamp DESC, m.txn_id DESC
+                   ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+               ), 0) AS balance_after
+        FROM moves m JOIN accounts a ON a.id = m.account_id
+    )
+    UPDATE transactions SET {column} = running.balance_after
+    FROM running
+    WHERE running.txn_id = transactions.id AND running.account_id = transactions.{account}
+"""
+
+
+def upgrade():
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('sender_balance_after', sa.Numeric(precision=10, scale=2), nullable=True))
+        batch_op.add_column(sa.Column('receiver_balance_after', sa.Numeric(precision=10, scale=2), nullable=True))
+
+    op.execute(RUNNING.format(column='sender_balance_after', account='sender_id'))
+    op.execute(RUNNING.format(column='receiver_balance_after', account='receiver_id'))
+
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.create_index('ix_transactions_sender_id_timestamp', ['sender_id', 'timestamp'], unique=False)
+        batch_op.create_index('ix_transactions_receiver_id_timestamp', ['receiver_id', 'timestamp'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.drop_index('ix_transactions_receiver_id_timestamp')
+        batch_op.drop_index('ix_transactions_sender_id_timestamp')
+        batch_op.drop_column('receiver_balance_after')
+        batch_op.drop_column('sender_balance_after')
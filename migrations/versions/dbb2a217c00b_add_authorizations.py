@@ -0,0 +1,54 @@
+"""Add card authorizations
+
+Revision ID: dbb2a217c00b
+Revises: 8af41dac8257
+Create Date: 2026-10-19 18:42:10.517263
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'dbb2a217c00b'
+down_revision = '8af41dac8257'
+branch_labels = None
+depends_on = None
+
+HELD = sa.text("status = 'held'")
+
+
+def upgrade():
+    op.create_table('authorizations',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('account_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('bill_id', sa.Integer(), nullable=True),
+    sa.Column('transaction_id', sa.Integer(), nullable=True),
+    sa.Column('amount', sa.BigInteger(), nullable=False),
+    sa.Column('biller_name', sa.String(length=100), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.Column('closed_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['account_id'], ['accounts.id'], name='fk_authorizations_account_id_accounts'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], name='fk_authorizations_user_id_users'),
+    sa.ForeignKeyConstraint(['bill_id'], ['bills.id'], name='fk_authorizations_bill_id_bills'),
+    sa.ForeignKeyConstraint(['transaction_id'], ['transactions.id'], name='fk_authorizations_transaction_id_transactions'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('authorizations', schema=None) as batch_op:
+        batch_op.create_index('ix_authorizations_bill_id', ['bill_id'], unique=False)
+        batch_op.create_index('ix_authorizations_held_expires_at', ['expires_at'], unique=False,
+                              postgresql_where=HELD, sqlite_where=HELD)
+        batch_op.create_index('ix_authorizations_held_account_id', ['account_id', 'expires_at'], unique=False,
+                              postgresql_where=HELD, sqlite_where=HELD)
+
+
+def downgrade():
+    with op.batch_alter_table('authorizations', schema=None) as batch_op:
+        batch_op.drop_index('ix_authorizations_held_account_id')
+        batch_op.drop_index('ix_authorizations_held_expires_at')
+        batch_op.drop_index('ix_authorizations_bill_id')
+
+    op.drop_table('authorizations')
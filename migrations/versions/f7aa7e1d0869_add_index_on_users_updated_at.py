@@ -0,0 +1,27 @@
+"""Add index on users.updated_at
+
+Revision ID: f7aa7e1d0869
+Revises: f9e8b8ecf456
+Create Date: 2026-10-19 09:12:44.201733
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f7aa7e1d0869'
+down_revision = 'f9e8b8ecf456'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Lets the username filter pick up new and renamed users with a range scan
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_users_updated_at'), ['updated_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_users_updated_at'))
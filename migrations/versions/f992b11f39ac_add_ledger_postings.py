@@ -0,0 +1,77 @@
+"""Add ledger_postings
+
+Revision ID: f992b11f39ac
+Revises: 74ee00601853
+Create Date: 2026-10-19 15:10:44.502913
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f992b11f39ac'
+down_revision = '74ee00601853'
+branch_labels = None
+depends_on = None
+
+COUNTERPARTY = """
+    CASE type
+        WHEN 'deposit' THEN 'cash'
+        WHEN 'withdrawal' THEN 'cash'
+        WHEN 'external_deposit' THEN 'external_bank'
+        WHEN 'external_withdrawal' THEN 'external_bank'
+        WHEN 'bill_payment' THEN 'biller'
+        ELSE 'suspense'
+    END
+"""
+
+# Both legs of every existing transaction; current balances already include
+# them, so each account's checkpoint starts at its latest posting.
+BACKFILL = [
+    f"""INSERT INTO ledger_postings (transaction_id, account_id, ledger, amount, created_at)
+        SELECT id, sender_id, CASE WHEN sender_id IS NULL THEN {COUNTERPARTY} ELSE 'account' END,
+               -amount, timestamp
+        FROM transactions ORDER BY id""",
+    f"""INSERT INTO ledger_postings (transaction_id, account_id, ledger, amount, created_at)
+        SELECT id, receiver_id, CASE WHEN receiver_id IS NULL THEN {COUNTERPARTY} ELSE 'account' END,
+               amount, timestamp
+        FROM transactions ORDER BY id""",
+    """UPDATE accounts SET balance_posting_id = COALESCE(
+           (SELECT MAX(id) FROM ledger_postings WHERE ledger_postings.account_id = accounts.id), 0)""",
+]
+
+
+def upgrade():
+    op.create_table('ledger_postings',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('transaction_id', sa.Integer(), nullable=False),
+    sa.Column('account_id', sa.Integer(), nullable=True),
+    sa.Column('ledger', sa.String(length=50), nullable=False),
+    sa.Column('amount', sa.BigInteger(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['account_id'], ['accounts.id'], ),
+    sa.ForeignKeyConstraint(['transaction_id'], ['transactions.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('accounts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('balance_posting_id', sa.Integer(), server_default='0', nullable=False))
+
+    for statement in BACKFILL:
+        op.execute(statement)
+
+    # Built after the backfill, which is cheaper than maintaining them row by row
+    with op.batch_alter_table('ledger_postings', schema=None) as batch_op:
+        batch_op.create_index('ix_ledger_postings_account_id_id', ['account_id', 'id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_ledger_postings_transaction_id'), ['transaction_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('accounts', schema=None) as batch_op:
+        batch_op.drop_column('balance_posting_id')
+
+    with op.batch_alter_table('ledger_postings', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_ledger_postings_transaction_id'))
+        batch_op.drop_index('ix_ledger_postings_account_id_id')
+
+    op.drop_table('ledger_postings')
@@ -117,15 +117,16 @@ def seed_test_data(session):
     account = Account(
         id=1,
         user_id=1,
-        balance=1000,
+        balance=100_000,  # cents
         account_type="savings",
         account_number="1234567890"
     )
     transaction = Transaction(
         id=1,
         sender_id=1,
+        sender_user_id=1,
         type="deposit",
-        amount=500
+        amount=50_000
     )
     session.add_all([user, account, transaction])
     session.commit()
@@ -164,3 +165,14 @@ def test_app(client):
 def test_client(client):
     return client
 
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """Swap the shared Redis client for an in-process fake."""
+    import fakeredis
+    from app.core import extensions
+
+    client = fakeredis.FakeRedis()
+    monkeypatch.setattr(extensions, "redis_client", client)
+    return client
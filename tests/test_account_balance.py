@@ -0,0 +1,68 @@
+from datetime import datetime
+import pytest
+from flask_jwt_extended import create_access_token
+from app.model.models import Account, Transaction
+from app.services.accounts.balance import balance_as_of, parse_as_of
+from app.services.transactions.core import handle_deposit, handle_transfer, handle_withdrawal
+
+USER = {"id": 1, "username": "testuser", "email": "test@example.com"}
+
+
+@pytest.fixture
+def history(seeded_db, monkeypatch):
+    """Account 1 starts at $1000: +$100 on Jan 10, -$30 on Jan 20, -$50 to account 2 on Feb 1."""
+    monkeypatch.setattr("app.services.transactions.core.send_invoice_with_email", lambda *a, **kw: None)
+    seeded_db.query(Transaction).delete()
+    seeded_db.add(Account(id=2, user_id=1, balance=0, account_type="savings", account_number="2222222222"))
+    seeded_db.commit()
+
+    for when, (handler, args) in [
+        (datetime(2025, 1, 10), (handle_deposit, (10_000, 1))),
+        (datetime(2025, 1, 20), (handle_withdrawal, (3_000, 1))),
+        (datetime(2025, 2, 1), (handle_transfer, (5_000, 1, 2))),
+    ]:
+        transaction, _ = handler(seeded_db, USER, *args)
+        transaction.timestamp = when
+    seeded_db.commit()
+    return seeded_db
+
+
+def test_every_transaction_stores_running_balances(history):
+    rows = history.query(Transaction).order_by(Transaction.timestamp).all()
+    assert [(t.sender_balance_after, t.receiver_balance_after) for t in rows] == [
+        (None, 110_000), (107_000, None), (102_000, 5_000),
+    ]
+    assert rows[2].as_dict()["receiver_balance_after"] == 50.0
+
+
+@pytest.mark.parametrize("as_of, expected", [
+    ("2025-01-01", 100_000),   # before any transaction: opening balance
+    ("2025-01-10", 110_000),   # bare date covers the whole day
+    ("2025-01-25T12:00:00", 107_000),
+    ("2025-03-01", 102_000),
+])
+def test_balance_as_of(history, as_of, expected):
+    account = history.get(Account, 1)
+    assert balance_as_of(history, account, parse_as_of(as_of)) == expected
+
+
+def test_balance_as_of_for_receiving_side(history):
+    account = history.get(Account, 2)
+    assert balance_as_of(history, account, parse_as_of("2025-01-31")) == 0
+    assert balance_as_of(history, account, parse_as_of("2025-02-01")) == 5_000
+
+
+def test_balance_endpoint(app, client, history, monkeypatch):
+    def override_get_db():
+        yield history
+    monkeypatch.setattr("app.routes.accounts.get_db", override_get_db)
+    with app.app_context():
+        token = create_access_token(identity="1", additional_claims={"role": "user", "username": "testuser"})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = client.get("/accounts/1/balance?as_of=2025-01-25", headers=headers)
+    assert response.status_code == 200
+    assert response.get_json()["balance"] == 1070.0
+
+    assert client.get("/accounts/1/balance?as_of=soon", headers=headers).status_code == 400
+    assert client.get("/accounts/99/balance", headers=headers).status_code == 404
@@ -83,7 +83,7 @@ def test_delete_account(test_db, test_account):
 @patch("app.routes.accounts.get_current_user", return_value={"id": 1, "username": "admin_user", "role": "admin"})
 @patch("app.routes.accounts.get_db")
 @patch("app.core.authorization.verify_jwt_in_request", return_value=None)
-@patch("app.core.authorization.get_jwt", return_value={"role": "admin"})
+@patch("app.core.authorization.get_jwt", return_value={"sub": "1", "role": "admin"})
 def test_list_user_accounts_with_pagination(mock_verify, mock_get_jwt, mock_get_db, mock_user, client):
     mock_db = MagicMock()
 
@@ -100,12 +100,12 @@ def test_list_user_accounts_with_pagination(mock_verify, mock_get_jwt, mock_get_
         def __init__(self, data):
             self.__dict__.update(data)
 
-        def as_dict(self):
+        def as_dict(self, balance):
             return {
                 "id": self.id,
                 "user_id": self.user_id,
                 "account_type": self.account_type,
-                "balance": self.balance,
+                "balance": balance,
                 "account_number": self.account_number
             }
 
@@ -117,12 +117,14 @@ def test_list_user_accounts_with_pagination(mock_verify, mock_get_jwt, mock_get_
     account_query.all.return_value = [mock_account]
 
     mock_db.query.return_value.filter_by.return_value = account_query
+    mock_db.execute.return_value.all.return_value = [(1, 1250.0)]
     mock_get_db.return_value.__next__.return_value = mock_db
 
     response = client.get("/accounts/?page=1&per_page=1")
 
     assert response.status_code == 200
     assert response.json["accounts"][0]["account_number"] == "abc123"
+    assert response.json["accounts"][0]["balance"] == 1250.0
 
 
 @patch("app.routes.users.send_email_async")  # Patch where send_email_async is being used
@@ -0,0 +1,59 @@
+import contextlib
+import flask_jwt_extended.view_decorators as view_decorators
+from flask_jwt_extended import create_access_token
+from app.core import auth
+from app.core.auth import get_current_user
+from app.core.authorization import Principal, current_principal, load_principal, role_required
+from app.model.models import User
+
+
+def bearer(app, identity="7", **claims):
+    with app.app_context():
+        token = create_access_token(identity=identity, additional_claims=claims)
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_jwt_is_decoded_once_per_request(app, monkeypatch):
+    decodes = []
+    original = view_decorators._decode_jwt_from_request
+    monkeypatch.setattr(
+        view_decorators, "_decode_jwt_from_request",
+        lambda *a, **kw: decodes.append(1) or original(*a, **kw),
+    )
+
+    @role_required("user")
+    def handler():
+        return get_current_user()
+
+    with app.test_request_context(headers=bearer(app, role="user", username="neo")):
+        load_principal()
+        result = handler()
+
+    assert result == {"id": 7, "username": "neo", "role": "user"}
+    assert len(decodes) == 1
+
+
+def test_role_required_uses_cached_principal(app):
+    @role_required("admin")
+    def handler():
+        return "ok"
+
+    with app.test_request_context(headers=bearer(app, role="user", username="neo")):
+        load_principal()
+        assert current_principal() == Principal(id=7, role="user", username="neo")
+        assert handler()[1] == 403
+
+
+def test_fresh_user_is_loaded_from_database(app, test_db, monkeypatch):
+    user = User(username="trinity", password="hashed", email="trinity@example.com")
+    test_db.add(user)
+    test_db.commit()
+
+    @contextlib.contextmanager
+    def override_get_db():
+        yield test_db
+    monkeypatch.setattr(auth, "get_db", override_get_db)
+
+    with app.test_request_context(headers=bearer(app, identity=str(user.id), role="user", username="trinity")):
+        load_principal()
+        assert get_current_user(fresh=True)["email"] == "trinity@example.com"
@@ -0,0 +1,113 @@
+import pytest
+from datetime import datetime, timedelta
+from flask_jwt_extended import create_access_token
+from app.model.models import Authorization, Bill
+from app.services.authorizations.balance import ledger_and_available
+from app.services.authorizations.expiry import expire_authorizations
+from app.services.ledger.postings import unbalanced_transactions
+from app.services.transactions.core import (
+    handle_authorize_bill_with_card,
+    handle_capture_authorization,
+    handle_pay_bill_from_balance,
+    handle_release_authorization,
+    handle_withdrawal,
+)
+
+USER = {"id": 1, "username": "testuser"}
+CARD = "4111111111111111"
+
+
+@pytest.fixture
+def holds_db(seeded_db, monkeypatch):
+    monkeypatch.setattr("app.services.transactions.core.send_invoice_with_email", lambda *a, **kw: None)
+    seeded_db.add_all([
+        Bill(id=bill_id, user_id=1, account_id=1, biller_name="PLN", amount=amount,
+             due_date=datetime.utcnow() + timedelta(days=7))
+        for bill_id, amount in ((1, 30_000), (2, 60_000))
+    ])
+    seeded_db.commit()
+    return seeded_db
+
+
+def test_hold_lowers_available_balance_only(holds_db):
+    authorization, _ = handle_authorize_bill_with_card(holds_db, USER, 1, CARD)
+
+    assert authorization.status == "held"
+    assert ledger_and_available(holds_db, 1) == (100_000, 70_000)
+    with pytest.raises(ValueError, match="pending card authorization"):
+        handle_authorize_bill_with_card(holds_db, USER, 1, CARD)
+    with pytest.raises(ValueError, match="pending card authorization"):
+        handle_pay_bill_from_balance(holds_db, USER, 1)
+    # Debits are checked against what is available, not the ledger
+    with pytest.raises(ValueError, match="Insufficient"):
+        handle_withdrawal(holds_db, USER, 80_000, 1)
+    handle_authorize_bill_with_card(holds_db, USER, 2, CARD)
+    assert ledger_and_available(holds_db, 1) == (100_000, 10_000)
+
+
+def test_capture_posts_the_payment(holds_db):
+    authorization, _ = handle_authorize_bill_with_card(holds_db, USER, 1, CARD)
+
+    transaction, _ = handle_capture_authorization(holds_db, USER, authorization.id)
+
+    assert (transaction.type, transaction.amount, transaction.sender_balance_after) == ("bill_payment", 30_000, 70_000)
+    assert (authorization.status, authorization.transaction_id) == ("captured", transaction.id)
+    assert holds_db.get(Bill, 1).is_paid is True
+    assert ledger_and_available(holds_db, 1) == (70_000, 70_000)
+    assert unbalanced_transactions(holds_db) == [1]
+    with pytest.raises(ValueError, match="captured"):
+        handle_release_authorization(holds_db, USER, authorization.id)
+
+
+def test_release_frees_the_hold(holds_db):
+    authorization, _ = handle_authorize_bill_with_card(holds_db, USER, 1, CARD)
+
+    handle_release_authorization(holds_db, USER, authorization.id)
+
+    assert ledger_and_available(holds_db, 1) == (100_000, 100_000)
+    assert holds_db.get(Bill, 1).is_paid is False
+    with pytest.raises(ValueError, match="released"):
+        handle_capture_authorization(holds_db, USER, authorization.id)
+    with pytest.raises(LookupError):
+        handle_release_authorization(holds_db, {"id": 2, "username": "other"}, authorization.id)
+
+
+def test_sweeper_expires_only_lapsed_holds(holds_db):
+    lapsed, _ = handle_authorize_bill_with_card(holds_db, USER, 1, CARD)
+    live, _ = handle_authorize_bill_with_card(holds_db, USER, 2, CARD)
+    lapsed.expires_at = datetime.utcnow() - timedelta(minutes=1)
+    holds_db.commit()
+
+    # A lapsed hold stops reserving funds before the sweeper gets to it
+    assert ledger_and_available(holds_db, 1) == (100_000, 40_000)
+    with pytest.raises(ValueError, match="expired"):
+        handle_capture_authorization(holds_db, USER, lapsed.id)
+
+    assert expire_authorizations(holds_db, batch_size=1) == 1
+    assert expire_authorizations(holds_db) == 0
+    holds_db.expire_all()
+    assert [a.status for a in holds_db.query(Authorization).order_by(Authorization.id)] == ["expired", "held"]
+    assert holds_db.get(Authorization, live.id).closed_at is None
+
+
+def test_authorize_route_and_available_balance(client, app, holds_db, monkeypatch):
+    def override_get_db():
+        yield holds_db
+    monkeypatch.setattr("app.routes.billpayment.get_db", override_get_db)
+    monkeypatch.setattr("app.routes.transactions.get_db", override_get_db)
+    monkeypatch.setattr("app.routes.billpayment.get_current_user", lambda fresh=False: USER)
+    with app.app_context():
+        token = create_access_token(identity="1", additional_claims={"role": "user", "username": "testuser"})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = client.post("/bills/1/authorize/card", json={"card_number": CARD}, headers=headers)
+    assert response.status_code == 201
+    authorization_id = response.get_json()["authorization_id"]
+
+    balance = client.get("/transactions/check-balance/?account_id=1", headers=headers).get_json()
+    assert (balance["balance"], balance["available_balance"]) == ("1000.00", "700.00")
+
+    response = client.post(f"/bills/authorizations/{authorization_id}/capture", headers=headers)
+    assert response.status_code == 200
+    assert response.get_json()["balance"] == "700.00"
+    assert client.post("/bills/authorizations/999/release", headers=headers).status_code == 404
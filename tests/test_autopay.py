@@ -0,0 +1,76 @@
+import pytest
+from collections import namedtuple
+from datetime import date, timedelta
+from sqlalchemy.orm import sessionmaker
+from app.model.models import Account, Bill, Transaction, User
+from app.services.bills.autopay import chunk_by_account, run_autopay
+from app.services.ledger.postings import unbalanced_transactions
+from app.services.ledger.projection import current_balance
+from app.services.transactions.core import handle_authorize_bill_with_card
+
+TODAY = date(2026, 3, 2)
+Row = namedtuple("Row", "id account_id")
+
+
+@pytest.fixture
+def autopay_db(seeded_db, monkeypatch):
+    monkeypatch.setattr("app.services.bills.autopay.send_invoice_with_email", lambda *a, **kw: None)
+    seeded_db.add_all([
+        User(id=2, username="other", email="other@example.com", password="hashed"),
+        Account(id=2, user_id=2, balance=5_000, account_type="savings", account_number="2222222222"),
+    ])
+    seeded_db.commit()
+    return seeded_db
+
+
+def bill(db, id, amount, due, autopay=True, user_id=1, account_id=1):
+    db.add(Bill(id=id, user_id=user_id, account_id=account_id, biller_name=f"Biller {id}",
+                amount=amount, due_date=due, autopay=autopay))
+    db.commit()
+
+
+def run(db, chunk_bills=500):
+    return run_autopay(sessionmaker(bind=db.get_bind()), day=TODAY, chunk_bills=chunk_bills)
+
+
+def test_chunks_never_split_an_account():
+    rows = [Row(1, 1), Row(2, 1), Row(3, 2), Row(4, 3), Row(5, 3), Row(6, 4)]
+    assert chunk_by_account(rows, 2) == [[1, 2], [3, 4, 5], [6]]
+
+
+def test_autopay_pays_due_bills_and_reports(autopay_db):
+    bill(autopay_db, 1, 10_000, TODAY)
+    bill(autopay_db, 2, 2_000, TODAY - timedelta(days=3))
+    bill(autopay_db, 3, 1_000, TODAY + timedelta(days=1))
+    bill(autopay_db, 4, 1_000, TODAY, autopay=False)
+    bill(autopay_db, 5, 4_000, TODAY, user_id=2, account_id=2)
+    bill(autopay_db, 6, 4_000, TODAY, user_id=2, account_id=2)
+    # Billed to an account its owner doesn't hold
+    bill(autopay_db, 7, 1_000, TODAY, user_id=2, account_id=1)
+
+    report = run(autopay_db, chunk_bills=1)
+
+    assert (report["due"], report["chunks"], report["paid"], report["amount"]) == (5, 2, 3, 16_000)
+    assert report["failed"] == [
+        {"bill_id": 7, "reason": "Account not found or unauthorized"},
+        {"bill_id": 6, "reason": "Insufficient balance"},
+    ]
+    autopay_db.expire_all()
+    assert [autopay_db.get(Bill, id).is_paid for id in range(1, 8)] == [True, True, False, False, True, False, False]
+    assert (current_balance(autopay_db, 1), current_balance(autopay_db, 2)) == (88_000, 1_000)
+    payments = autopay_db.query(Transaction).filter_by(payment_method="autopay").order_by(Transaction.id).all()
+    assert [t.sender_balance_after for t in payments] == [98_000, 88_000, 1_000]
+    assert unbalanced_transactions(autopay_db) == [1]
+    assert run(autopay_db)["paid"] == 0
+
+
+def test_autopay_skips_bills_with_a_card_hold(autopay_db):
+    bill(autopay_db, 1, 10_000, TODAY)
+    bill(autopay_db, 2, 95_000, TODAY)
+    handle_authorize_bill_with_card(autopay_db, {"id": 1, "username": "testuser"}, 1, "4111111111111111")
+
+    report = run(autopay_db)
+
+    # The hold on bill 1 also leaves too little available for bill 2
+    assert [f["bill_id"] for f in report["failed"]] == [1, 2]
+    assert current_balance(autopay_db, 1) == 100_000
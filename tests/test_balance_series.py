@@ -0,0 +1,103 @@
+from datetime import date, datetime, timedelta
+import pytest
+from flask_jwt_extended import create_access_token
+from app.model.models import Account, Transaction
+from app.services.accounts.series import BalanceSeriesCache, bucket_starts, compute_series, parse_range
+
+
+@pytest.fixture
+def history(seeded_db):
+    """Account 1 is at $1000 now: +$100 on Jan 10, -$30 on Jan 11, +$5 on Feb 3."""
+    seeded_db.query(Transaction).delete()
+    seeded_db.add_all([
+        Transaction(type="deposit", amount=10_000, receiver_id=1, timestamp=datetime(2025, 1, 10, 9)),
+        Transaction(type="withdrawal", amount=3_000, sender_id=1, timestamp=datetime(2025, 1, 11, 15)),
+        Transaction(type="deposit", amount=500, receiver_id=1, timestamp=datetime(2025, 2, 3, 8)),
+    ])
+    seeded_db.commit()
+    return seeded_db
+
+
+def balances(series):
+    return [point["closing_balance"] for point in series.as_list()]
+
+
+def test_daily_series(history):
+    series = compute_series(history, history.get(Account, 1), date(2025, 1, 9), date(2025, 1, 12), "day")
+    assert [point["start"] for point in series.as_list()] == ["2025-01-09", "2025-01-10", "2025-01-11", "2025-01-12"]
+    assert balances(series) == [925, 1025, 995, 995]
+
+
+def test_weekly_and_monthly_buckets(history):
+    account = history.get(Account, 1)
+    weekly = compute_series(history, account, date(2025, 1, 8), date(2025, 1, 20), "week")
+    monthly = compute_series(history, account, date(2025, 1, 1), date(2025, 2, 28), "month")
+
+    assert [p["start"] for p in weekly.as_list()] == ["2025-01-06", "2025-01-13", "2025-01-20"]
+    assert balances(weekly) == [995, 995, 995]
+    assert balances(monthly) == [995, 1000]
+
+
+def test_cache_folds_in_new_transactions(history):
+    cache = BalanceSeriesCache()
+    account = history.get(Account, 1)
+    today = datetime.utcnow().date()
+    first = today - timedelta(days=2)
+
+    before = balances(cache.get(history, account, first, today, "day"))
+    account.balance += 4_000
+    history.add(Transaction(type="deposit", amount=4_000, receiver_id=1, timestamp=datetime.utcnow()))
+    history.commit()
+    after = balances(cache.get(history, account, first, today, "day"))
+
+    assert after[:-1] == before[:-1]
+    assert after[-1] == before[-1] + 40
+    assert after == balances(compute_series(history, account, first, today, "day"))
+
+
+def test_cache_catches_up_after_the_range_ends(history, monkeypatch):
+    cache = BalanceSeriesCache()
+    account = history.get(Account, 1)
+    today = datetime.utcnow().date()
+    first = today - timedelta(days=2)
+
+    cache.get(history, account, first, today, "day")
+    account.balance += 4_000
+    history.add(Transaction(type="deposit", amount=4_000, receiver_id=1, timestamp=datetime.utcnow()))
+    history.commit()
+
+    class Tomorrow(datetime):
+        @classmethod
+        def utcnow(cls):
+            return datetime.utcnow() + timedelta(days=1)
+    monkeypatch.setattr("app.services.accounts.series.datetime", Tomorrow)
+
+    # The range is over, but this is the first read since it closed
+    later = balances(cache.get(history, account, first, today, "day"))
+    assert later == balances(compute_series(history, account, first, today, "day"))
+    assert cache.get(history, account, first, today, "day").synced_at >= datetime.utcnow()
+
+
+def test_parse_range_validation():
+    assert parse_range("2025-01-01", "2025-01-31", "week") == (date(2025, 1, 1), date(2025, 1, 31))
+    for args in (("2025-02-01", "2025-01-01", "day"), ("x", None, "day"), (None, None, "hour"), ("2000-01-01", "2025-01-01", "day")):
+        with pytest.raises(ValueError):
+            parse_range(*args)
+    assert len(bucket_starts(date(2025, 1, 31), date(2025, 3, 1), "month")) == 3
+
+
+def test_balance_series_endpoint(app, client, history, monkeypatch):
+    def override_get_db():
+        yield history
+    monkeypatch.setattr("app.routes.accounts.get_db", override_get_db)
+    with app.app_context():
+        token = create_access_token(identity="1", additional_claims={"role": "user", "username": "testuser"})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = client.get("/accounts/1/balance-series?from=2025-01-10&to=2025-01-11", headers=headers)
+    assert response.status_code == 200
+    assert response.get_json()["series"] == [
+        {"start": "2025-01-10", "closing_balance": 1025.0},
+        {"start": "2025-01-11", "closing_balance": 995.0},
+    ]
+    assert client.get("/accounts/1/balance-series?bucket=hour", headers=headers).status_code == 400
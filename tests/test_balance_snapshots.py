@@ -0,0 +1,52 @@
+from datetime import date, datetime
+from app.model.models import Account, AccountBalanceSnapshot, Transaction
+from app.services.accounts.balance import balance_as_of, parse_as_of
+from app.services.accounts.snapshots import balance_from_snapshot, snapshot_day, snapshot_through
+
+
+def add_history(db):
+    """Account 1 is at $1000 now: +$100 on Jan 10, -$30 on Jan 11, +$5 on Jan 12 (no running balances)."""
+    db.query(Transaction).delete()
+    db.get(Account, 1).created_at = datetime(2025, 1, 1)
+    db.add_all([
+        Transaction(type="deposit", amount=10_000, receiver_id=1, timestamp=datetime(2025, 1, 10, 9)),
+        Transaction(type="withdrawal", amount=3_000, sender_id=1, timestamp=datetime(2025, 1, 11, 15)),
+        Transaction(type="deposit", amount=500, receiver_id=1, timestamp=datetime(2025, 1, 12, 8)),
+    ])
+    db.commit()
+
+
+def closing(db, day):
+    return db.get(AccountBalanceSnapshot, (1, day)).closing_balance
+
+
+def test_first_snapshot_starts_from_current_balance(seeded_db):
+    add_history(seeded_db)
+
+    assert snapshot_day(seeded_db, date(2025, 1, 9)) == 1
+    assert closing(seeded_db, date(2025, 1, 9)) == 92_500
+
+
+def test_catch_up_carries_previous_day_forward(seeded_db):
+    add_history(seeded_db)
+    snapshot_day(seeded_db, date(2025, 1, 9))
+
+    results = snapshot_through(seeded_db, date(2025, 1, 12))
+
+    assert [day for day, _ in results] == [date(2025, 1, 10), date(2025, 1, 11), date(2025, 1, 12)]
+    assert [closing(seeded_db, date(2025, 1, d)) for d in (10, 11, 12)] == [102_500, 99_500, 100_000]
+    # Already snapshotted: nothing to do, nothing duplicated
+    assert snapshot_day(seeded_db, date(2025, 1, 12)) == 0
+
+
+def test_balance_as_of_uses_snapshot_plus_same_day_delta(seeded_db):
+    add_history(seeded_db)
+    snapshot_through(seeded_db, date(2025, 1, 9))
+    snapshot_through(seeded_db, date(2025, 1, 10))
+
+    assert balance_from_snapshot(seeded_db, 1, parse_as_of("2025-01-11T12:00:00")) == 102_500
+    assert balance_from_snapshot(seeded_db, 1, parse_as_of("2025-01-11")) == 99_500
+    assert balance_from_snapshot(seeded_db, 1, parse_as_of("2025-01-09")) is None
+
+    account = seeded_db.get(Account, 1)
+    assert balance_as_of(seeded_db, account, parse_as_of("2025-01-11T16:00:00")) == 99_500
@@ -1,18 +1,19 @@
 import pytest
-from decimal import Decimal
 from datetime import datetime, timedelta
 from app.services.transactions.core import (
     handle_pay_bill_with_card,
     handle_pay_bill_from_balance
 )
-from app.model.models import Account, Bill
+from app.services.ledger.projection import current_balance
+from sqlalchemy import update
+from app.model.models import Account, Bill, Transaction
 
 def test_handle_pay_bill_with_card_success(seeded_db):
     bill = Bill(
         id=1,
         user_id=1,
         biller_name="Telkom",
-        amount=100,
+        amount=10_000,
         is_paid=False,
         due_date=datetime.utcnow() + timedelta(days=7),
         account_id=1
@@ -25,10 +26,10 @@ def test_handle_pay_bill_with_card_success(seeded_db):
 
     transaction, account = handle_pay_bill_with_card(seeded_db, current_user, bill_id=1, card_number=card_number)
 
-    assert transaction.amount == 100
+    assert transaction.amount == 10_000
     assert transaction.biller_name == "Telkom"
     assert transaction.payment_method == "credit_card"
-    assert account.balance == Decimal("900")
+    assert current_balance(seeded_db, account.id) == 90_000
 
     updated_bill = seeded_db.query(Bill).filter_by(id=1).first()
     assert updated_bill.is_paid is True
@@ -39,7 +40,7 @@ def test_handle_pay_bill_with_card_invalid_card(seeded_db):
         id=2,
         user_id=1,
         biller_name="PLN",
-        amount=150,
+        amount=15_000,
         is_paid=False,
         due_date=datetime.utcnow() + timedelta(days=7),
         account_id=1
@@ -59,7 +60,7 @@ def test_handle_pay_bill_from_balance_success(seeded_db):
         id=3,
         user_id=1,
         biller_name="BPJS",
-        amount=200,
+        amount=20_000,
         is_paid=False,
         due_date=datetime.utcnow() + timedelta(days=7),
         account_id=1
@@ -71,9 +72,9 @@ def test_handle_pay_bill_from_balance_success(seeded_db):
 
     transaction, account = handle_pay_bill_from_balance(seeded_db, current_user, bill_id=3)
 
-    assert transaction.amount == 200
+    assert transaction.amount == 20_000
     assert transaction.payment_method == "account_balance"
-    assert account.balance == Decimal("800")
+    assert current_balance(seeded_db, account.id) == 80_000
 
     updated_bill = seeded_db.query(Bill).filter_by(id=3).first()
     assert updated_bill.is_paid is True
@@ -81,14 +82,14 @@ def test_handle_pay_bill_from_balance_success(seeded_db):
 
 def test_handle_pay_bill_from_balance_insufficient_funds(seeded_db):
     account = seeded_db.query(Account).filter_by(id=1).first()
-    account.balance = 50
+    account.balance = 5_000
     seeded_db.commit()
 
     bill = Bill(
         id=4,
         user_id=1,
         biller_name="Indihome",
-        amount=100,
+        amount=10_000,
         is_paid=False,
         due_date=datetime.utcnow() + timedelta(days=7),
         account_id=1
@@ -100,3 +101,27 @@ def test_handle_pay_bill_from_balance_insufficient_funds(seeded_db):
 
     with pytest.raises(ValueError):
         handle_pay_bill_from_balance(seeded_db, current_user, bill_id=4)
+
+
+def test_handle_pay_bill_from_balance_rereads_bill_under_lock(seeded_db):
+    bill = Bill(
+        id=5,
+        user_id=1,
+        biller_name="PDAM",
+        amount=10_000,
+        is_paid=False,
+        due_date=datetime.utcnow() + timedelta(days=7),
+        account_id=1
+    )
+    seeded_db.add(bill)
+    seeded_db.commit()
+    assert bill.is_paid is False
+
+    # Autopay pays the bill behind this session's back
+    seeded_db.connection().execute(update(Bill.__table__).where(Bill.id == 5).values(is_paid=True))
+
+    current_user = {"id": 1, "username": "testuser"}
+
+    with pytest.raises(ValueError, match="already paid"):
+        handle_pay_bill_from_balance(seeded_db, current_user, bill_id=5)
+    assert seeded_db.query(Transaction).filter_by(type="bill_payment").count() == 0
@@ -0,0 +1,53 @@
+import pytest
+from datetime import date, datetime, timedelta
+from app.model.models import Bill, User
+from app.services.bills.reminders import send_bill_reminders
+
+TODAY = date(2026, 3, 10)
+STAMP = datetime(2026, 1, 1)
+
+
+@pytest.fixture
+def reminder_db(seeded_db, monkeypatch):
+    sent = []
+    monkeypatch.setattr("app.services.bills.reminders.send_emails", lambda messages: sent.extend(messages) or len(messages))
+    seeded_db.add(User(id=2, username="other", email="other@example.com", password="hashed"))
+    for id, user_id, days, is_paid in (
+        (1, 1, 1, False),     # due soon
+        (2, 1, -2, False),    # overdue
+        (3, 1, 10, False),    # not due for a while
+        (4, 1, -5, True),     # paid
+        (5, 2, 0, False),     # due today
+    ):
+        seeded_db.add(Bill(id=id, user_id=user_id, account_id=1, biller_name=f"Biller {id}", amount=1_000 * id,
+                           due_date=TODAY + timedelta(days=days), is_paid=is_paid, updated_at=STAMP))
+    seeded_db.commit()
+    seeded_db.sent = sent
+    return seeded_db
+
+
+def test_one_reminder_per_user_and_overdue_marked(reminder_db):
+    report = send_bill_reminders(reminder_db, today=TODAY, days=3)
+
+    assert report == {"bills": 3, "users": 2, "sent": 2, "marked_overdue": 1}
+    (subject, recipient, body), (_, other, _) = reminder_db.sent
+    assert (subject, recipient, other) == ("Overdue bills: 2 to pay", "test@example.com", "other@example.com")
+    assert "Biller 2: $20.00 due 2026-03-08" in body and "Biller 1" in body and "Biller 3" not in body
+
+    reminder_db.expire_all()
+    bills = {bill.id: bill for bill in reminder_db.query(Bill)}
+    assert [bills[id].is_overdue for id in range(1, 6)] == [False, True, False, False, False]
+    # Marking overdue changes what listings show; a reminder doesn't
+    assert bills[2].updated_at > STAMP
+    assert bills[1].updated_at == STAMP and bills[1].reminded_at is not None
+
+
+def test_reminders_are_not_repeated(reminder_db):
+    send_bill_reminders(reminder_db, today=TODAY, days=3)
+    reminder_db.sent.clear()
+
+    assert send_bill_reminders(reminder_db, today=TODAY, days=3)["bills"] == 0
+    # The next day bill 1 is still only due soon; bill 5 has become overdue
+    report = send_bill_reminders(reminder_db, today=TODAY + timedelta(days=1), days=3)
+    assert (report["bills"], report["marked_overdue"]) == (1, 1)
+    assert [recipient for _, recipient, _ in reminder_db.sent] == ["other@example.com"]
@@ -0,0 +1,56 @@
+import pytest
+from datetime import date, timedelta
+from flask_jwt_extended import create_access_token
+from app.model.models import Account, Bill
+
+START = date(2026, 3, 1)
+
+
+@pytest.fixture
+def bills_client(client, app, seeded_db, monkeypatch):
+    def override_get_db():
+        yield seeded_db
+    monkeypatch.setattr("app.routes.bills.get_db", override_get_db)
+    seeded_db.add(Account(id=2, user_id=1, balance=0, account_type="checking", account_number="2222222222"))
+    # Two bills share each due date, so pages have to break ties by id
+    seeded_db.add_all([
+        Bill(id=id, user_id=1, account_id=1 if id % 3 else 2, biller_name=f"Biller {id}", amount=1_000 * id,
+             due_date=START + timedelta(days=(id - 1) // 2), is_paid=id % 4 == 0)
+        for id in range(1, 11)
+    ])
+    seeded_db.commit()
+    with app.app_context():
+        token = create_access_token(identity="1", additional_claims={"role": "user", "username": "testuser"})
+
+    def get(**params):
+        return client.get("/bills/", query_string=params, headers={"Authorization": f"Bearer {token}"})
+    return get
+
+
+def test_cursor_walks_every_bill_once(bills_client):
+    ids, cursor = [], None
+    while True:
+        body = bills_client(limit=3, **({"cursor": cursor} if cursor else {})).get_json()
+        ids += [bill["id"] for bill in body["bills"]]
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+
+    assert ids == list(range(1, 11))
+
+
+def test_filters_and_compact_rows(bills_client):
+    body = bills_client(is_paid="false", due_from="2026-03-02", due_to="2026-03-04", account_id=1).get_json()
+
+    assert [bill["id"] for bill in body["bills"]] == [5, 7]
+    assert body["bills"][0] == {
+        "id": 5, "biller_name": "Biller 5", "due_date": "2026-03-03", "amount": 50.0,
+        "account_id": 1, "is_paid": False, "autopay": False, "is_overdue": False,
+    }
+    assert body["next_cursor"] is None
+
+
+def test_invalid_filters_are_rejected(bills_client):
+    assert bills_client(is_paid="maybe").status_code == 400
+    assert bills_client(due_from="March").status_code == 400
+    assert bills_client(cursor="not-a-cursor").status_code == 400
@@ -0,0 +1,56 @@
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from sqlalchemy.orm import sessionmaker
+from app.model.models import Account, User
+from app.services.ledger.postings import unbalanced_transactions
+from app.services.ledger.projection import current_balance
+from app.services.transactions.batching import DepositBatcher
+from app.services.transactions.core import handle_external_deposits
+
+USER = {"id": 1, "username": "testuser"}
+
+
+def deposit(amount):
+    return {"amount": amount, "bank_name": "BCA", "account_number": "999"}
+
+
+@pytest.fixture
+def batch_db(seeded_db):
+    seeded_db.add(User(id=2, username="other", email="other@example.com", password="x"))
+    seeded_db.add(Account(id=2, user_id=2, balance=0, account_type="savings", account_number="2222222222"))
+    seeded_db.commit()
+    return seeded_db
+
+
+def test_batch_carries_running_balances_and_rejects_per_request(batch_db):
+    other = {"id": 2, "username": "other"}
+    results = handle_external_deposits(batch_db, [
+        (USER, deposit("10.00")),
+        (other, deposit("5.00")),
+        (USER, deposit("0")),
+        (USER, deposit("2.50")),
+    ])
+
+    assert [t.receiver_balance_after for t, _ in (results[0], results[1], results[3])] == [101_000, 500, 101_250]
+    assert isinstance(results[2], ValueError)
+    assert current_balance(batch_db, 1) == 101_250
+    assert current_balance(batch_db, 2) == 500
+    assert unbalanced_transactions(batch_db) == [1]
+
+
+def test_batcher_answers_each_caller_from_one_flush(batch_db, monkeypatch):
+    monkeypatch.setattr("app.services.transactions.batching.send_invoice_with_email", lambda *a, **kw: None)
+    flushes = []
+    batcher = DepositBatcher(max_items=3, max_wait_ms=200, session_factory=sessionmaker(bind=batch_db.get_bind()))
+    original = batcher._flush
+    monkeypatch.setattr(batcher, "_flush", lambda batch: (flushes.append(len(batch)), original(batch)))
+
+    with ThreadPoolExecutor(3) as pool:
+        futures = [pool.submit(batcher.submit, USER, deposit(amount)) for amount in ("1.00", "2.00", "-1")]
+
+    assert flushes == [3]
+    transactions = [future.result()[0] for future in futures[:2]]
+    assert sorted(t.amount for t in transactions) == [100, 200]
+    with pytest.raises(ValueError, match="greater than zero"):
+        futures[2].result()
+    assert current_balance(batch_db, 1) == 100_300
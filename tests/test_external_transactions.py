@@ -1,9 +1,9 @@
 import pytest
-from decimal import Decimal
 from app.services.transactions.core import (
     handle_external_deposit,
     handle_external_withdrawal
 )
+from app.services.ledger.projection import current_balance
 from app.model.models import Account, Transaction
 
 def test_external_deposit_success(seeded_db):
@@ -16,10 +16,10 @@ def test_external_deposit_success(seeded_db):
 
     transaction, account = handle_external_deposit(seeded_db, current_user, data)
 
-    assert transaction.amount == 200.00
+    assert transaction.amount == 20_000
     assert transaction.type == "external_deposit"
     assert transaction.bank_name == "Bank Mandiri"
-    assert account.balance == Decimal("1200.00")
+    assert current_balance(seeded_db, account.id) == 120_000
 
 
 def test_external_deposit_invalid_amount(seeded_db):
@@ -44,10 +44,10 @@ def test_external_withdrawal_success(seeded_db):
 
     transaction, account = handle_external_withdrawal(seeded_db, current_user, data)
 
-    assert transaction.amount == 300.00
+    assert transaction.amount == 30_000
     assert transaction.type == "external_withdrawal"
     assert transaction.bank_name == "Bank BRI"
-    assert account.balance == Decimal("700.00")
+    assert current_balance(seeded_db, account.id) == 70_000
 
 
 def test_external_withdrawal_insufficient_funds(seeded_db):
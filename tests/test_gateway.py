@@ -0,0 +1,167 @@
+import time
+import orjson
+import pytest
+from sqlalchemy.orm import sessionmaker
+from flask_jwt_extended import create_access_token
+from app.model.models import SettlementBatch, Transaction
+from app.services.gateway.client import SIGNATURE_HEADER, ExternalGateway, GatewayError, sign
+from app.services.gateway.settlement import apply_callback, batch_pending_withdrawals, submit_open_batches
+from app.services.gateway.stub import create_stub_app
+from app.services.ledger.postings import unbalanced_transactions
+from app.services.ledger.projection import current_balance
+from app.services.transactions.core import handle_external_withdrawal
+
+USER = {"id": 1, "username": "testuser"}
+
+
+class FakeGateway(ExternalGateway):
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.batches = []
+
+    def submit(self, batch):
+        if self.fail:
+            raise GatewayError("down")
+        self.batches.append(batch)
+        return f"ref-{batch['batch_id']}"
+
+
+@pytest.fixture
+def gateway_db(seeded_db, monkeypatch):
+    monkeypatch.setattr("app.services.transactions.core.send_invoice_with_email", lambda *a, **kw: None)
+    return seeded_db
+
+
+def withdraw(db, amount, bank="BCA"):
+    return handle_external_withdrawal(db, USER, {"amount": amount, "bank_name": bank, "account_number": "EXT"})[0]
+
+
+def submit(db, gateway):
+    return submit_open_batches(sessionmaker(bind=db.get_bind()), gateway, max_concurrency=1)
+
+
+def test_withdrawals_are_pending_and_batched_per_bank(gateway_db):
+    first, second, third = withdraw(gateway_db, "1.00"), withdraw(gateway_db, "2.00"), withdraw(gateway_db, "3.00", "BNI")
+
+    assert first.status == "pending"
+    assert current_balance(gateway_db, 1) == 99_400
+    assert batch_pending_withdrawals(gateway_db, max_items=1) == 3
+    assert batch_pending_withdrawals(gateway_db, max_items=1) == 0
+
+    gateway = FakeGateway()
+    assert submit(gateway_db, gateway) == 3
+    assert [(b["bank_name"], [i["transaction_id"] for i in b["items"]]) for b in gateway.batches] == [
+        ("BCA", [first.id]), ("BCA", [second.id]), ("BNI", [third.id]),
+    ]
+    assert {b.status for b in gateway_db.query(SettlementBatch)} == {"submitted"}
+
+
+def test_failed_submission_is_retried(gateway_db):
+    withdraw(gateway_db, "1.00")
+    batch_pending_withdrawals(gateway_db, max_items=10)
+
+    assert submit(gateway_db, FakeGateway(fail=True)) == 0
+    batch = gateway_db.query(SettlementBatch).one()
+    assert (batch.status, batch.attempts) == ("open", 1)
+
+    assert submit(gateway_db, FakeGateway()) == 1
+    gateway_db.refresh(batch)
+    assert (batch.status, batch.attempts, batch.gateway_reference) == ("submitted", 2, f"ref-{batch.id}")
+
+
+def test_callback_settles_and_credits_back_rejections(gateway_db):
+    settled, rejected = withdraw(gateway_db, "1.00"), withdraw(gateway_db, "2.50")
+    batch_pending_withdrawals(gateway_db, max_items=10)
+    submit(gateway_db, FakeGateway())
+    batch = gateway_db.query(SettlementBatch).one()
+    payload = {"reference": batch.gateway_reference, "results": [
+        {"transaction_id": settled.id, "status": "settled"},
+        {"transaction_id": rejected.id, "status": "rejected"},
+    ]}
+
+    assert apply_callback(gateway_db, payload) == {"batch_id": batch.id, "settled": 1, "rejected": 1, "pending": 0}
+    # Delivered twice: nothing changes
+    assert apply_callback(gateway_db, payload)["rejected"] == 0
+
+    gateway_db.expire_all()
+    assert [gateway_db.get(Transaction, t.id).status for t in (settled, rejected)] == ["settled", "failed"]
+    reversal = gateway_db.query(Transaction).filter_by(type="external_withdrawal_reversal").one()
+    assert (reversal.amount, reversal.receiver_id, reversal.receiver_balance_after) == (250, 1, 99_900)
+    assert current_balance(gateway_db, 1) == 99_900
+    assert gateway_db.get(SettlementBatch, batch.id).status == "settled"
+    assert unbalanced_transactions(gateway_db) == [1]
+
+    with pytest.raises(LookupError):
+        apply_callback(gateway_db, {"reference": "nope", "results": []})
+
+
+def test_settling_in_place_changes_the_listing_etag(app, client, gateway_db, monkeypatch):
+    def override_get_db():
+        yield gateway_db
+    monkeypatch.setattr("app.routes.transactions.get_db", override_get_db)
+    with app.app_context():
+        token = create_access_token(identity="1", additional_claims={"role": "user", "username": "testuser"})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    withdrawal = withdraw(gateway_db, "1.00")
+    batch_pending_withdrawals(gateway_db, max_items=10)
+    submit(gateway_db, FakeGateway())
+    gateway_db.expire_all()
+    etag = client.get("/transactions/", headers=headers).headers["ETag"]
+
+    batch = gateway_db.query(SettlementBatch).one()
+    apply_callback(gateway_db, {"reference": batch.gateway_reference, "results": [
+        {"transaction_id": withdrawal.id, "status": "settled"},
+    ]})
+
+    # No row was added, only a status changed
+    response = client.get("/transactions/", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.get_json()["transactions"][0]["status"] == "settled"
+
+
+def test_callback_endpoint_checks_the_signature(client, gateway_db, monkeypatch):
+    def override_get_db():
+        yield gateway_db
+    monkeypatch.setattr("app.routes.gateway.get_db", override_get_db)
+    monkeypatch.setattr("config.Config.GATEWAY_SECRET", "s3cret")
+    withdrawal = withdraw(gateway_db, "1.00")
+    batch_pending_withdrawals(gateway_db, max_items=10)
+    submit(gateway_db, FakeGateway())
+    reference = gateway_db.query(SettlementBatch).one().gateway_reference
+    body = orjson.dumps({"reference": reference, "results": [{"transaction_id": withdrawal.id, "status": "settled"}]})
+
+    def post(signature):
+        return client.post("/external/gateway/callback", data=body, content_type="application/json",
+                           headers={SIGNATURE_HEADER: signature})
+
+    assert post("forged").status_code == 401
+    response = post(sign(body, "s3cret"))
+    assert response.status_code == 200
+    assert response.get_json()["settled"] == 1
+
+
+def test_stub_gateway_is_idempotent_and_calls_back(monkeypatch):
+    callbacks = []
+    monkeypatch.setattr("app.services.gateway.stub.urllib.request.urlopen",
+                        lambda request, timeout: callbacks.append(request) or open("/dev/null"))
+    stub = create_stub_app("s3cret", settle_after=0, reject_rate=0, seed=1).test_client()
+    body = orjson.dumps({"batch_id": 7, "callback_url": "http://bank/callback",
+                         "items": [{"transaction_id": 3, "amount": 100, "account_number": "EXT"}]})
+
+    def post():
+        return stub.post("/batches", data=body, content_type="application/json",
+                         headers={SIGNATURE_HEADER: sign(body, "s3cret")})
+
+    first, again = post(), post()
+    assert first.get_json()["reference"] == again.get_json()["reference"]
+    assert stub.post("/batches", data=body, content_type="application/json").status_code == 401
+
+    for _ in range(100):
+        if callbacks:
+            break
+        time.sleep(0.01)
+    sent = orjson.loads(callbacks[0].data)
+    assert sent["results"] == [{"transaction_id": 3, "status": "settled"}]
+    assert sign(callbacks[0].data, "s3cret") in callbacks[0].headers.values()
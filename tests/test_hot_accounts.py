@@ -0,0 +1,92 @@
+from datetime import timedelta
+import pytest
+from flask_jwt_extended import create_access_token
+from app.model.models import Account, AccountBalanceSlot, LedgerPosting, User
+from app.services.ledger.postings import unbalanced_transactions
+from app.services.ledger.projection import current_balance, project_balances
+from app.services.ledger.slots import fold_slots, set_slots
+from app.services.transactions.core import handle_deposit, handle_transfer, handle_withdrawal
+
+USER = {"id": 1, "username": "testuser"}
+
+
+@pytest.fixture
+def merchant_db(seeded_db, monkeypatch):
+    monkeypatch.setattr("app.services.transactions.core.send_invoice_with_email", lambda *a, **kw: None)
+    seeded_db.add(User(id=2, username="merchant", email="merchant@example.com", password="x", role="user"))
+    seeded_db.add(Account(id=2, user_id=2, balance=0, account_type="checking", account_number="2222222222"))
+    seeded_db.commit()
+    set_slots(seeded_db, seeded_db.get(Account, 2), 4)
+    return seeded_db
+
+
+def slot_balances(db):
+    rows = db.query(AccountBalanceSlot).filter_by(account_id=2).order_by(AccountBalanceSlot.slot)
+    return [row.balance for row in rows]
+
+
+def test_credits_to_a_hot_account_spread_over_slots(merchant_db):
+    transactions = [handle_transfer(merchant_db, USER, 1_000, 1, 2)[0] for _ in range(4)]
+
+    assert [t.receiver_balance_after for t in transactions] == [None] * 4
+    assert sorted(t.id % 4 for t in transactions) == [0, 1, 2, 3]
+    assert slot_balances(merchant_db) == [1_000] * 4
+    credits = merchant_db.query(LedgerPosting).filter_by(account_id=2).all()
+    assert sorted(p.slot for p in credits) == [0, 1, 2, 3]
+    assert current_balance(merchant_db, 2) == 4_000
+    # The payer's side is unchanged: exact running balance, plain postings
+    assert transactions[-1].sender_balance_after == 96_000
+    assert unbalanced_transactions(merchant_db) == [1]
+
+
+def test_projection_and_fold_count_each_credit_once(merchant_db):
+    handle_transfer(merchant_db, USER, 1_000, 1, 2)
+    handle_transfer(merchant_db, USER, 2_000, 1, 2)
+    merchant_db.commit()
+
+    project_balances(merchant_db, lag=timedelta(0))
+    assert current_balance(merchant_db, 2) == 3_000
+
+    assert fold_slots(merchant_db) == 1
+    merchant_db.expire_all()
+    assert merchant_db.get(Account, 2).balance == 3_000
+    assert slot_balances(merchant_db) == [0] * 4
+    assert current_balance(merchant_db, 2) == 3_000
+    assert fold_slots(merchant_db) == 0
+
+
+def test_debits_read_slots_and_turning_hot_mode_off_keeps_the_balance(merchant_db):
+    handle_transfer(merchant_db, USER, 5_000, 1, 2)
+    merchant = {"id": 2, "username": "merchant"}
+
+    with pytest.raises(ValueError, match="Insufficient"):
+        handle_withdrawal(merchant_db, merchant, 5_001, 2)
+    withdrawal, _ = handle_withdrawal(merchant_db, merchant, 2_000, 2)
+    assert withdrawal.sender_balance_after == 3_000
+
+    set_slots(merchant_db, merchant_db.get(Account, 2), 1)
+    deposit, _ = handle_deposit(merchant_db, merchant, 500, 2)
+    assert deposit.receiver_balance_after == 3_500
+    fold_slots(merchant_db)
+    assert current_balance(merchant_db, 2) == 3_500
+
+
+def test_slot_count_is_bounded(merchant_db):
+    with pytest.raises(ValueError):
+        set_slots(merchant_db, merchant_db.get(Account, 2), 0)
+
+
+def test_deposit_to_a_hot_account_returns_its_balance(app, client, merchant_db, monkeypatch):
+    def override_get_db():
+        yield merchant_db
+    monkeypatch.setattr("app.routes.transactions.get_db", override_get_db)
+    monkeypatch.setattr("app.routes.transactions.get_current_user", lambda fresh=False: {"id": 2, "username": "merchant"})
+    with app.app_context():
+        token = create_access_token(identity="2", additional_claims={"role": "user", "username": "merchant"})
+    handle_transfer(merchant_db, USER, 1_000, 1, 2)
+
+    response = client.post("/transactions/deposit/", json={"amount": "2.50", "receiver_id": 2},
+                           headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    # No running balance is recorded for slotted credits; the live one is returned
+    assert response.get_json()["balance"] == "12.50"
@@ -0,0 +1,81 @@
+import gzip
+import pytest
+from flask import jsonify
+from flask_jwt_extended import create_access_token
+from app.core.compression import compress_response
+from app.model.models import Transaction
+from config import Config
+
+
+def bearer(app, identity="1"):
+    with app.app_context():
+        token = create_access_token(identity=identity, additional_claims={"role": "user", "username": "testuser"})
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def db_client(client, seeded_db, monkeypatch):
+    def override_get_db():
+        yield seeded_db
+    monkeypatch.setattr("app.routes.transactions.get_db", override_get_db)
+    return client
+
+
+def test_unchanged_transactions_return_304(app, db_client):
+    client = db_client
+    headers = bearer(app)
+    first = client.get("/transactions/", headers=headers)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert etag.startswith('W/"')
+
+    again = client.get("/transactions/", headers={**headers, "If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.data == b""
+    assert again.headers["ETag"] == etag
+
+
+def test_304_skips_row_conversion(app, db_client, monkeypatch):
+    client = db_client
+    headers = bearer(app)
+    etag = client.get("/transactions/", headers=headers).headers["ETag"]
+
+    converted = []
+    monkeypatch.setattr("app.routes.transactions.transaction_row", lambda row: converted.append(row) or {})
+    assert client.get("/transactions/", headers={**headers, "If-None-Match": etag}).status_code == 304
+    assert converted == []
+
+
+def test_new_transaction_changes_etag(app, db_client, seeded_db):
+    client = db_client
+    headers = bearer(app)
+    etag = client.get("/transactions/", headers=headers).headers["ETag"]
+
+    seeded_db.add(Transaction(type="deposit", amount=10, receiver_id=1, receiver_user_id=1))
+    seeded_db.commit()
+
+    response = client.get("/transactions/", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.get_json()["total"] == 2
+
+
+def test_large_json_is_gzipped(app, monkeypatch):
+    monkeypatch.setattr("app.core.compression.brotli", None)
+    payload = [{"id": i, "type": "deposit"} for i in range(200)]
+    with app.test_request_context(headers={"Accept-Encoding": "gzip"}):
+        response = compress_response(jsonify(payload))
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert gzip.decompress(response.get_data()).decode().startswith('[{"id":0')
+
+
+def test_small_or_unaccepted_responses_are_left_alone(app):
+    with app.test_request_context(headers={"Accept-Encoding": "gzip"}):
+        small = compress_response(jsonify({"ok": True}))
+    with app.test_request_context():
+        large = compress_response(jsonify(["x" * Config.COMPRESS_MIN_SIZE]))
+
+    assert "Content-Encoding" not in small.headers
+    assert "Content-Encoding" not in large.headers
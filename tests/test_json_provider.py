@@ -0,0 +1,32 @@
+import json
+import pytest
+from datetime import datetime, date
+from decimal import Decimal
+from flask import jsonify
+from app.core.json_provider import OrjsonProvider
+
+
+def test_app_uses_orjson_provider(app):
+    assert isinstance(app.json, OrjsonProvider)
+
+
+def test_decimal_is_kept_exact(app):
+    body = app.json.dumps({"amount": Decimal("1000.10")})
+    assert json.loads(body) == {"amount": "1000.10"}
+
+
+def test_datetimes_are_iso_8601(app):
+    body = app.json.loads(app.json.dumps({"at": datetime(2025, 1, 2, 3, 4, 5), "on": date(2025, 1, 2)}))
+    assert body == {"at": "2025-01-02T03:04:05", "on": "2025-01-02"}
+
+
+def test_unknown_types_raise(app):
+    with pytest.raises(TypeError):
+        app.json.dumps({"x": object()})
+
+
+def test_jsonify_round_trip(app):
+    with app.test_request_context():
+        response = jsonify({"total": 1, "items": [{"id": 1, "amount": Decimal("5.00")}]})
+    assert response.mimetype == "application/json"
+    assert response.get_json() == {"total": 1, "items": [{"id": 1, "amount": "5.00"}]}
@@ -0,0 +1,99 @@
+from datetime import timedelta
+import pytest
+from flask_jwt_extended import create_access_token
+from app.model.models import Account, LedgerPosting, Transaction
+from app.services.accounts.core import update_user_account_logic
+from app.services.ledger.postings import unbalanced_transactions
+from app.services.ledger.projection import current_balance, live_balances, project_balances
+from app.services.transactions.core import handle_deposit, handle_external_deposit, handle_transfer
+
+USER = {"id": 1, "username": "testuser"}
+
+
+@pytest.fixture
+def ledger_db(seeded_db, monkeypatch):
+    monkeypatch.setattr("app.services.transactions.core.send_invoice_with_email", lambda *a, **kw: None)
+    seeded_db.add(Account(id=2, user_id=1, balance=0, account_type="savings", account_number="2222222222"))
+    seeded_db.commit()
+    return seeded_db
+
+
+def postings(db, transaction):
+    rows = db.query(LedgerPosting).filter_by(transaction_id=transaction.id).order_by(LedgerPosting.id)
+    return [(p.account_id, p.ledger, p.amount) for p in rows]
+
+
+def test_every_transaction_appends_a_balanced_pair(ledger_db):
+    deposit, _ = handle_deposit(ledger_db, USER, 10_000, 1)
+    transfer, _ = handle_transfer(ledger_db, USER, 2_500, 1, 2)
+    external, _ = handle_external_deposit(ledger_db, USER, {"amount": "7.50", "bank_name": "BCA", "account_number": "1"})
+
+    assert postings(ledger_db, deposit) == [(None, "cash", -10_000), (1, "account", 10_000)]
+    assert postings(ledger_db, transfer) == [(1, "account", -2_500), (2, "account", 2_500)]
+    assert postings(ledger_db, external) == [(None, "external_bank", -750), (1, "account", 750)]
+    # Only the seeded transaction, which predates the ledger, has no postings
+    assert unbalanced_transactions(ledger_db) == [1]
+
+
+def test_handlers_leave_the_account_row_alone(ledger_db):
+    handle_deposit(ledger_db, USER, 10_000, 1)
+    handle_transfer(ledger_db, USER, 2_500, 1, 2)
+
+    ledger_db.expire_all()
+    assert ledger_db.get(Account, 1).balance == 100_000
+    assert live_balances(ledger_db, [1, 2]) == {1: 107_500, 2: 2_500}
+
+
+def test_projection_folds_postings_once(ledger_db):
+    handle_deposit(ledger_db, USER, 10_000, 1)
+    handle_transfer(ledger_db, USER, 2_500, 1, 2)
+
+    # Too recent for the default lag
+    assert project_balances(ledger_db) == 0
+
+    assert project_balances(ledger_db, lag=timedelta(0)) == 2
+    ledger_db.expire_all()
+    account = ledger_db.get(Account, 1)
+    assert account.balance == 107_500
+    assert account.balance_posting_id == 3  # deposit credit is posting 2, transfer debit 3
+    assert current_balance(ledger_db, 1) == 107_500
+
+    assert project_balances(ledger_db, lag=timedelta(0)) == 0
+    handle_deposit(ledger_db, USER, 500, 2)
+    assert current_balance(ledger_db, 2) == 3_000
+    assert project_balances(ledger_db, lag=timedelta(0)) == 1
+    assert current_balance(ledger_db, 2) == 3_000
+
+
+def test_account_update_books_an_adjustment(ledger_db):
+    handle_deposit(ledger_db, USER, 10_000, 1)
+
+    response = update_user_account_logic(ledger_db, USER, 1, {"account_type": "savings", "initial_balance": "75.00"})
+    assert response["balance"] == 75.0
+    debit = ledger_db.query(Transaction).filter_by(type="adjustment").one()
+    assert (debit.amount, debit.sender_id, debit.sender_balance_after) == (102_500, 1, 7_500)
+    assert postings(ledger_db, debit) == [(1, "account", -102_500), (None, "adjustment", 102_500)]
+
+    update_user_account_logic(ledger_db, USER, 1, {"account_type": "savings", "initial_balance": "80.00"})
+    update_user_account_logic(ledger_db, USER, 1, {"account_type": "checking", "initial_balance": "80.00"})
+    credits = ledger_db.query(Transaction).filter_by(type="adjustment", receiver_id=1).all()
+    assert [(t.amount, t.receiver_balance_after) for t in credits] == [(500, 8_000)]
+
+    # The ledger still adds up, and the projection reaches the same figure
+    assert unbalanced_transactions(ledger_db) == [1]
+    project_balances(ledger_db, lag=timedelta(0))
+    ledger_db.expire_all()
+    assert ledger_db.get(Account, 1).balance == current_balance(ledger_db, 1) == 8_000
+
+
+def test_admin_account_list_shows_live_balances(app, client, ledger_db, monkeypatch):
+    def override_get_db():
+        yield ledger_db
+    monkeypatch.setattr("app.routes.accounts.get_db", override_get_db)
+    with app.app_context():
+        token = create_access_token(identity="1", additional_claims={"role": "admin", "username": "testuser"})
+    handle_deposit(ledger_db, USER, 10_000, 1)
+
+    response = client.get("/accounts/", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    assert {acc["id"]: acc["balance"] for acc in response.get_json()["accounts"]} == {1: 1100.0, 2: 0.0}
@@ -0,0 +1,70 @@
+import pytest
+from datetime import datetime, timedelta
+from redis.exceptions import ConnectionError as RedisConnectionError
+from app.core import lockout
+from app.model.models import User
+
+LOCK_DURATION = timedelta(minutes=15)
+
+
+@pytest.fixture
+def user(test_db):
+    user = User(username="lockme", password="hashed", email="lockme@example.com", failed_attempts=0)
+    test_db.add(user)
+    test_db.commit()
+    return user
+
+
+def test_failures_are_counted_in_redis_not_db(test_db, user, fake_redis):
+    attempts, locked = lockout.register_failure(test_db, user, 3, LOCK_DURATION)
+
+    assert (attempts, locked) == (1, False)
+    assert int(fake_redis.get("login:failures:lockme")) == 1
+    assert 0 < fake_redis.ttl("login:failures:lockme") <= LOCK_DURATION.total_seconds()
+    assert user.failed_attempts == 0
+
+
+def test_final_failure_persists_lock(test_db, user, fake_redis):
+    for _ in range(2):
+        lockout.register_failure(test_db, user, 3, LOCK_DURATION)
+    attempts, locked = lockout.register_failure(test_db, user, 3, LOCK_DURATION)
+
+    assert (attempts, locked) == (3, True)
+    refreshed = test_db.query(User).filter_by(username="lockme").first()
+    assert refreshed.is_locked is True
+    assert refreshed.locked_time is not None
+    assert lockout.is_locked_out("lockme")
+    assert not fake_redis.exists("login:failures:lockme")
+
+
+def test_expired_lock_is_lifted(test_db, user, fake_redis):
+    user.is_locked = True
+    user.locked_time = datetime.utcnow() - LOCK_DURATION - timedelta(seconds=1)
+    test_db.commit()
+
+    assert lockout.check_lock(test_db, user, LOCK_DURATION) is False
+    assert user.is_locked is False
+
+
+def test_clear_resets_counters(test_db, user, fake_redis):
+    lockout.register_failure(test_db, user, 3, LOCK_DURATION)
+    lockout.clear(test_db, user)
+
+    assert not fake_redis.exists("login:failures:lockme")
+
+
+def test_falls_back_to_db_counter_when_redis_is_down(test_db, user, monkeypatch):
+    from app.core import extensions
+
+    broken = type("Broken", (), {})()
+    def fail(*args, **kwargs):
+        raise RedisConnectionError("down")
+    broken.pipeline = fail
+    broken.exists = fail
+    monkeypatch.setattr(extensions, "redis_client", broken)
+
+    attempts, locked = lockout.register_failure(test_db, user, 3, LOCK_DURATION)
+
+    assert (attempts, locked) == (1, False)
+    assert user.failed_attempts == 1
+    assert lockout.is_locked_out("lockme") is False
@@ -0,0 +1,73 @@
+from datetime import datetime
+from decimal import Decimal
+import pytest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import func, select
+from app.model.models import Transaction
+from app.model.types import Money
+from app.services.accounts.snapshots import account_movements
+from app.utils.money import format_money, to_cents, to_units
+
+
+@pytest.mark.parametrize("value, cents", [
+    ("12.34", 1234),
+    (12.34, 1234),
+    (0.1, 10),
+    (12, 1200),
+    (Decimal("0.29"), 29),
+    (" 7.5 ", 750),
+    ("-3.01", -301),
+])
+def test_to_cents(value, cents):
+    assert to_cents(value) == cents
+    assert isinstance(to_cents(value), int)
+
+
+@pytest.mark.parametrize("value", ["1.234", 12.345, float("nan"), "abc", None, "NaN", "Infinity", True, ""])
+def test_to_cents_rejects(value):
+    with pytest.raises(ValueError):
+        to_cents(value)
+
+
+def test_to_units_and_format():
+    assert to_units(1999) == 19.99
+    assert to_units(None) is None
+    assert format_money(1999) == "19.99"
+    assert format_money(5) == "0.05"
+    assert format_money(-5) == "-0.05"
+
+
+def test_money_column_refuses_fractional_cents():
+    assert Money().process_bind_param(1050.0, None) == 1050
+    with pytest.raises(ValueError):
+        Money().process_bind_param(10.5, None)
+
+
+def test_sums_stay_integer_cents(seeded_db):
+    # 0.1 + 0.2 as floats drifts; as cents it is exactly 30
+    seeded_db.query(Transaction).delete()
+    seeded_db.add_all([
+        Transaction(type="deposit", amount=to_cents(0.1), receiver_id=1),
+        Transaction(type="deposit", amount=to_cents(0.2), receiver_id=1),
+    ])
+    seeded_db.commit()
+
+    moves = account_movements(datetime(2000, 1, 1), account_id=1)
+    total = seeded_db.execute(select(func.sum(moves.c.delta))).scalar()
+    assert total == 30 and isinstance(total, int)
+    assert to_units(total) == 0.3
+
+
+def test_transaction_responses_carry_exact_money_strings(app, client, seeded_db, monkeypatch):
+    def override_get_db():
+        yield seeded_db
+    monkeypatch.setattr("app.routes.transactions.get_db", override_get_db)
+    monkeypatch.setattr("app.routes.transactions.get_current_user", lambda fresh=False: {"id": 1, "username": "testuser"})
+    monkeypatch.setattr("app.services.transactions.core.send_invoice_with_email", lambda *a, **kw: None)
+    with app.app_context():
+        token = create_access_token(identity="1", additional_claims={"role": "user", "username": "testuser"})
+
+    response = client.post("/transactions/withdraw/", json={"amount": "0.10", "sender_id": 1},
+                           headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    assert b'"balance":"999.90"' in response.data
@@ -0,0 +1,64 @@
+import pytest
+from flask import Blueprint, Flask, jsonify, request
+from app.core.ratelimit import SlidingWindow, account_key, rate_limit, sliding_limiter
+
+
+@pytest.fixture
+def limited_client(fake_redis):
+    app = Flask(__name__)
+    bp = Blueprint("limited", __name__)
+
+    @bp.route("/pay", methods=["POST"])
+    def pay():
+        return jsonify({"ok": True})
+
+    rate_limit(
+        bp,
+        SlidingWindow("3 per minute", key_func=lambda: "user:1", scope="test:user"),
+        SlidingWindow("2 per minute", key_func=account_key("sender_id"), scope="test:account"),
+    )
+    app.register_blueprint(bp)
+    return app.test_client()
+
+
+def test_headers_are_returned_on_every_response(limited_client):
+    response = limited_client.post("/pay", json={})
+
+    assert response.status_code == 200
+    assert response.headers["X-RateLimit-Limit"] == "3"
+    assert response.headers["X-RateLimit-Remaining"] == "2"
+    assert "X-RateLimit-Reset" in response.headers
+
+
+def test_account_limit_is_enforced_independently(limited_client):
+    assert limited_client.post("/pay", json={"sender_id": 7}).status_code == 200
+    assert limited_client.post("/pay", json={"sender_id": 7}).status_code == 200
+
+    blocked = limited_client.post("/pay", json={"sender_id": 7})
+    assert blocked.status_code == 429
+    assert blocked.headers["X-RateLimit-Remaining"] == "0"
+    assert "Retry-After" in blocked.headers
+
+    # A different account still has budget under the same user limit
+    assert limited_client.post("/pay", json={"sender_id": 8}).status_code == 200
+
+
+def test_account_limit_is_kept_per_caller(limited_client, monkeypatch):
+    monkeypatch.setattr("app.core.ratelimit.identity_key", lambda: f"user:{request.headers['X-User']}")
+
+    # Someone else naming account 7 can't use up its owner's budget
+    for _ in range(3):
+        limited_client.post("/pay", json={"sender_id": 7}, headers={"X-User": "2"})
+    assert limited_client.post("/pay", json={"sender_id": 7}, headers={"X-User": "2"}).status_code == 429
+
+    assert limited_client.post("/pay", json={"sender_id": 7}, headers={"X-User": "1"}).status_code == 200
+
+
+def test_rejected_requests_do_not_consume_budget(fake_redis):
+    window = SlidingWindow("1 per minute", key_func=lambda: "k", scope="test:reject")
+
+    assert sliding_limiter.hit([(window, "k")]).allowed
+    for _ in range(3):
+        assert not sliding_limiter.hit([(window, "k")]).allowed
+
+    assert fake_redis.zcard("ratelimit:test:reject:k") == 1
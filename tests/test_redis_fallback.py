@@ -0,0 +1,80 @@
+import pytest
+from flask_jwt_extended import create_access_token
+from redis.exceptions import ConnectionError as RedisConnectionError
+from app.core import extensions
+from app.core.extensions import CircuitBreaker, LazyRedis, RedisUnavailable
+from app.core.ratelimit import SlidingWindow, sliding_limiter
+
+
+def failing_call():
+    raise RedisConnectionError("connection refused")
+
+
+def test_breaker_opens_after_threshold_and_fails_fast():
+    breaker = CircuitBreaker("test", threshold=2, reset_seconds=60)
+
+    for _ in range(2):
+        with pytest.raises(RedisConnectionError):
+            breaker.call(failing_call)
+
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(RedisUnavailable):
+        breaker.call(lambda: "never called")
+
+
+def test_breaker_half_open_probe_closes_on_success():
+    breaker = CircuitBreaker("test", threshold=1, reset_seconds=0)
+    with pytest.raises(RedisConnectionError):
+        breaker.call(failing_call)
+
+    assert breaker.call(lambda: "pong") == "pong"
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_probe_through_a_pipeline_closes_the_breaker(monkeypatch):
+    import fakeredis
+    breaker = CircuitBreaker("test", threshold=1, reset_seconds=0)
+    breaker.record_failure()
+    client = LazyRedis("redis://localhost:1/0", breaker)
+    monkeypatch.setattr(client, "_client", fakeredis.FakeRedis())
+
+    pipe = client.pipeline()
+    pipe.incr("attempts")
+    pipe.expire("attempts", 60)
+
+    assert pipe.execute() == [1, True]
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_lazy_client_without_url_is_unavailable():
+    client = LazyRedis(None, CircuitBreaker("test", threshold=1, reset_seconds=60))
+
+    with pytest.raises(RedisUnavailable):
+        client.get("anything")
+
+
+def test_rate_limit_falls_back_to_local_counter(monkeypatch):
+    breaker = CircuitBreaker("test", threshold=1, reset_seconds=60)
+    breaker.record_failure()
+    monkeypatch.setattr(extensions, "redis_client", LazyRedis("redis://localhost:1/0", breaker))
+    window = SlidingWindow("2 per minute", key_func=lambda: "k", scope="test:fallback")
+
+    results = [sliding_limiter.hit([(window, "fallback-user")]) for _ in range(3)]
+
+    assert [r.allowed for r in results] == [True, True, False]
+    assert results[-1].remaining == 0
+
+
+def test_metrics_endpoint_reports_breaker_state(app, client):
+    with app.app_context():
+        admin, user = (
+            create_access_token(identity="1", additional_claims={"role": role, "username": "testuser"})
+            for role in ("admin", "user")
+        )
+
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": f"Bearer {user}"}).status_code == 403
+    response = client.get("/metrics", headers={"Authorization": f"Bearer {admin}"})
+
+    assert response.status_code == 200
+    assert "revoubank_redis_circuit_state" in response.get_data(as_text=True)
@@ -0,0 +1,46 @@
+import time
+import pytest
+from flask_jwt_extended import create_access_token
+from app.core.revocation import RevocationStore
+
+
+def make_store():
+    return RevocationStore(max_token_lifetime=1800, sync_seconds=0, capacity=1000, error_rate=0.001)
+
+
+def test_revoked_token_is_reported(fake_redis):
+    store = make_store()
+    store.revoke("jti-1", int(time.time()) + 60)
+
+    assert store.is_revoked("jti-1")
+    assert 0 < fake_redis.ttl("jwt:revoked:jti-1") <= 60
+
+
+def test_unrevoked_token_needs_no_lookup(fake_redis, monkeypatch):
+    store = make_store()
+    store.revoke("jti-1", int(time.time()) + 60)
+    store.sync_seconds = 3600
+
+    def no_network(*args, **kwargs):
+        raise AssertionError("should be answered by the local filter")
+    monkeypatch.setattr(fake_redis, "exists", no_network)
+
+    assert store.is_revoked("never-revoked") is False
+
+
+def test_other_workers_pick_up_revocations(fake_redis):
+    revoking_worker, other_worker = make_store(), make_store()
+    other_worker.is_revoked("warm-up")
+
+    revoking_worker.revoke("jti-2", int(time.time()) + 60)
+
+    assert other_worker.is_revoked("jti-2")
+
+
+def test_logout_revokes_token(app, client, fake_redis):
+    with app.app_context():
+        token = create_access_token(identity="1", additional_claims={"role": "user"})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    assert client.post("/logout", headers=headers).status_code == 200
+    assert client.post("/logout", headers=headers).status_code == 401
@@ -0,0 +1,109 @@
+import pytest
+from datetime import datetime, timedelta
+from flask_jwt_extended import create_access_token
+from sqlalchemy.orm import sessionmaker
+from app.model.models import Account, ScheduledTransfer, Transaction, User
+from app.services.ledger.projection import current_balance
+from app.services.scheduled_transfers.executor import MAX_FAILURES, claim_due, run_due_transfers
+from app.services.scheduled_transfers.schedule import create_scheduled_transfer, next_run, update_scheduled_transfer
+
+USER = {"id": 1, "username": "testuser"}
+NOW = datetime(2026, 3, 1, 9, 0)
+
+
+@pytest.fixture
+def schedule_db(seeded_db, monkeypatch):
+    monkeypatch.setattr("app.services.transactions.core.send_invoice_with_email", lambda *a, **kw: None)
+    seeded_db.add_all([
+        User(id=2, username="payee", email="payee@example.com", password="hashed"),
+        Account(id=2, user_id=2, balance=0, account_type="savings", account_number="2222222222"),
+    ])
+    seeded_db.commit()
+    return seeded_db
+
+
+def schedule(db, amount="10.00", interval="monthly", start_at=NOW - timedelta(minutes=1), **data):
+    return create_scheduled_transfer(db, USER, {
+        "sender_id": 1, "receiver_id": 2, "amount": amount, "interval": interval,
+        "start_at": start_at.isoformat(), **data,
+    })
+
+
+def run(db, now=NOW, batch_size=100):
+    # Failed runs roll back; a savepoint keeps that inside the test's transaction
+    session_factory = sessionmaker(bind=db.get_bind(), join_transaction_mode="create_savepoint")
+    return run_due_transfers(session_factory, batch_size, now=now)
+
+
+def test_next_run_counts_from_the_start():
+    start = datetime(2026, 1, 31, 9, 0)
+    assert next_run(start, "monthly", start) == datetime(2026, 2, 28, 9, 0)
+    assert next_run(start, "monthly", datetime(2026, 2, 28, 9, 0)) == datetime(2026, 3, 31, 9, 0)
+    assert next_run(start, "weekly", datetime(2026, 2, 1)) == datetime(2026, 2, 7, 9, 0)
+    assert next_run(start, "daily", start - timedelta(days=1)) == start
+    assert next_run(start, "once", start) is None
+
+
+def test_executor_runs_due_transfers_and_reschedules(schedule_db):
+    monthly = schedule(schedule_db)
+    once = schedule(schedule_db, "5.00", "once")
+    later = schedule(schedule_db, start_at=NOW + timedelta(days=1))
+
+    report = run(schedule_db, batch_size=1)
+
+    assert (report["executed"], report["failed"], report["max_lag_seconds"]) == (2, 0, 60.0)
+    assert current_balance(schedule_db, 2) == 1_500
+    schedule_db.expire_all()
+    assert (monthly.status, monthly.next_run_at, monthly.run_count) == ("active", datetime(2026, 4, 1, 8, 59), 1)
+    assert schedule_db.get(Transaction, monthly.last_transaction_id).amount == 1_000
+    assert (once.status, once.next_run_at) == ("completed", None)
+    assert later.last_run_at is None
+    assert run(schedule_db)["executed"] == 0
+
+
+def test_claimed_runs_are_not_claimed_twice(schedule_db):
+    schedule(schedule_db)
+
+    assert len(claim_due(schedule_db, NOW, 10)) == 1
+    assert claim_due(schedule_db, NOW, 10) == []
+    # Until the claim times out
+    assert len(claim_due(schedule_db, NOW + timedelta(minutes=10), 10)) == 1
+
+
+def test_repeated_failures_stop_a_standing_order(schedule_db):
+    daily = schedule(schedule_db, "5000.00", "daily")
+
+    for day in range(MAX_FAILURES):
+        assert run(schedule_db, NOW + timedelta(days=day))["failed"] == 1
+
+    schedule_db.expire_all()
+    assert (daily.status, daily.failure_count, daily.last_error) == ("failed", MAX_FAILURES, "Insufficient funds")
+    assert current_balance(schedule_db, 1) == 100_000
+
+    update_scheduled_transfer(schedule_db, USER, daily.id, {"status": "active", "amount": "1.00"})
+    assert run(schedule_db, NOW + timedelta(days=MAX_FAILURES))["executed"] == 1
+
+
+def test_crud_routes(client, app, schedule_db, monkeypatch):
+    def override_get_db():
+        yield schedule_db
+    monkeypatch.setattr("app.routes.scheduled_transfers.get_db", override_get_db)
+    with app.app_context():
+        token = create_access_token(identity="1", additional_claims={"role": "user", "username": "testuser"})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = client.post("/scheduled-transfers/", headers=headers, json={
+        "sender_id": 1, "receiver_id": 2, "amount": 25, "interval": "weekly", "start_at": "2026-11-02T09:00:00",
+    })
+    assert response.status_code == 201
+    schedule_id = response.get_json()["id"]
+
+    response = client.put(f"/scheduled-transfers/{schedule_id}", headers=headers, json={"status": "paused"})
+    assert response.get_json()["status"] == "paused"
+    assert [s["amount"] for s in client.get("/scheduled-transfers/", headers=headers).get_json()] == [25.0]
+    assert client.delete(f"/scheduled-transfers/{schedule_id}", headers=headers).status_code == 200
+    assert client.get(f"/scheduled-transfers/{schedule_id}", headers=headers).status_code == 404
+    assert schedule_db.query(ScheduledTransfer).count() == 0
+    assert client.post("/scheduled-transfers/", headers=headers, json={
+        "sender_id": 2, "receiver_id": 1, "amount": 25,
+    }).status_code == 403
@@ -0,0 +1,97 @@
+import io
+import pytest
+from flask_jwt_extended import create_access_token
+from app.model.models import Account, SettlementStagingRow, Transaction
+from app.services.ledger.postings import unbalanced_transactions
+from app.services.ledger.projection import current_balance
+from app.services.settlements.ingest import import_settlement
+from app.services.settlements.parsing import read_chunks, validate_chunk
+
+CSV = """reference,account_number,amount,external_account_number
+R1,1234567890,10.00,EXT1
+R2,1234567890,2.5,EXT1
+R3,1234567890,-4,EXT1
+R4,0000000000,1.00,EXT2
+R1,1234567890,10.00,EXT1
+R5,,1.00,EXT3
+R6,1234567890,1.999,EXT1
+"""
+
+
+def fixed_width(reference, account_number, external, amount):
+    return f"{reference:<20}{account_number:<20}{external:<20}{amount:>15}\n"
+
+
+def test_validate_chunk_converts_amounts_and_explains_rejects():
+    (lines, columns), = read_chunks(io.StringIO(CSV), "csv")
+    valid, rejected = validate_chunk(lines, columns)
+
+    assert valid["line"].tolist() == [2, 3, 5, 6]
+    assert valid["amount"].tolist() == [1_000, 250, 100, 1_000]
+    assert rejected == [
+        (4, "amount must be a number with at most 2 decimal places"),
+        (7, "account_number is required"),
+        (8, "amount must be a number with at most 2 decimal places"),
+    ]
+
+
+def test_read_chunks_streams_in_bounded_chunks():
+    chunks = list(read_chunks(io.StringIO(CSV), "csv", chunk_rows=3))
+    assert [lines for lines, _ in chunks] == [[2, 3, 4], [5, 6, 7], [8]]
+
+    with pytest.raises(ValueError, match="missing columns: amount"):
+        list(read_chunks(io.StringIO("reference,account_number,external_account_number\n"), "csv"))
+
+
+def test_import_applies_once_and_reports(seeded_db):
+    report = import_settlement(seeded_db, io.StringIO(CSV), "BCA", chunk_rows=2)
+
+    assert report["rows"] == 7
+    assert report["applied"] == 2
+    assert report["applied_amount"] == 1_250
+    assert report["rejected"] == 3
+    assert report["duplicates"] == 1
+    assert report["unknown_accounts"] == 1
+
+    deposits = seeded_db.query(Transaction).filter_by(type="external_deposit").order_by(Transaction.id).all()
+    assert [(t.external_reference, t.receiver_balance_after) for t in deposits] == [("R1", 101_000), ("R2", 101_250)]
+    assert current_balance(seeded_db, 1) == 101_250
+    assert unbalanced_transactions(seeded_db) == [1]
+    assert seeded_db.query(SettlementStagingRow).count() == 0
+
+    again = import_settlement(seeded_db, io.StringIO(CSV), "BCA")
+    assert again["applied"] == 0 and again["duplicates"] == 3
+    assert current_balance(seeded_db, 1) == 101_250
+
+
+def test_import_fixed_width(seeded_db):
+    text = fixed_width("F1", "1234567890", "EXT", "12.34") + "\n" + fixed_width("F2", "1234567890", "EXT", "0.66")
+
+    report = import_settlement(seeded_db, io.StringIO(text), "Mandiri", "fixed")
+
+    assert report["applied"] == 2
+    assert current_balance(seeded_db, 1) == 101_300
+
+
+def test_settlement_upload_requires_admin(app, client, seeded_db, monkeypatch):
+    def override_get_db():
+        yield seeded_db
+    monkeypatch.setattr("app.routes.external_transaction.get_db", override_get_db)
+    with app.app_context():
+        admin = create_access_token(identity="1", additional_claims={"role": "admin", "username": "testuser"})
+        user = create_access_token(identity="1", additional_claims={"role": "user", "username": "testuser"})
+
+    def upload(token, body):
+        return client.post(
+            "/external/settlements/",
+            data={"file": (io.BytesIO(body.encode()), "settlement.csv"), "bank_name": "BCA"},
+            headers={"Authorization": f"Bearer {token}"},
+            content_type="multipart/form-data",
+        )
+
+    assert upload(user, CSV).status_code == 403
+    response = upload(admin, CSV)
+    assert response.status_code == 200
+    assert response.get_json()["applied"] == 2
+    assert upload(admin, "nonsense\n").status_code == 400
+    assert seeded_db.get(Account, 1) is not None
@@ -0,0 +1,58 @@
+import csv
+import io
+import json
+from datetime import datetime
+import pytest
+from flask_jwt_extended import create_access_token
+from app.model.models import Account, Transaction, User
+
+
+@pytest.fixture
+def export_client(app, client, seeded_db, monkeypatch):
+    def override_get_db():
+        yield seeded_db
+    monkeypatch.setattr("app.routes.transactions.get_db", override_get_db)
+
+    seeded_db.add_all([
+        User(id=2, username="other", email="other@example.com", password="hashed"),
+        Account(id=2, user_id=2, balance=0, account_type="savings", account_number="2222222222"),
+    ])
+    seeded_db.flush()
+    seeded_db.add_all([
+        Transaction(type="deposit", amount=2_500, receiver_id=1, receiver_user_id=1, timestamp=datetime(2025, 1, 15, 12)),
+        Transaction(type="transfer", amount=500, sender_id=1, receiver_id=2, sender_user_id=1, receiver_user_id=2, timestamp=datetime(2025, 2, 1, 9)),
+        Transaction(type="deposit", amount=9_900, receiver_id=2, receiver_user_id=2, timestamp=datetime(2025, 1, 20)),
+    ])
+    seeded_db.commit()
+
+    with app.app_context():
+        token = create_access_token(identity="1", additional_claims={"role": "user", "username": "testuser"})
+    client.environ_base["HTTP_AUTHORIZATION"] = f"Bearer {token}"
+    return client
+
+
+def test_csv_export_streams_only_own_transactions(export_client):
+    response = export_client.get("/transactions/export?format=csv")
+
+    assert response.status_code == 200
+    assert response.is_streamed
+    assert response.mimetype == "text/csv"
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert [row["type"] for row in rows] == ["deposit", "deposit", "transfer"]
+    assert rows[1]["timestamp"] == "2025-01-15T12:00:00"
+    assert rows[1]["amount"] == "25.00"
+
+
+def test_ndjson_export_with_date_range(export_client):
+    response = export_client.get("/transactions/export?format=ndjson&from=2025-01-01&to=2025-01-31")
+
+    assert response.mimetype == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert len(lines) == 1
+    assert lines[0]["amount"] == 25
+    assert lines[0]["receiver_id"] == 1
+
+
+def test_export_rejects_bad_input(export_client):
+    assert export_client.get("/transactions/export?format=xml").status_code == 400
+    assert export_client.get("/transactions/export?from=yesterday").status_code == 400
@@ -2,6 +2,7 @@ import pytest
 from unittest.mock import patch, MagicMock
 from flask import Flask, jsonify
 from datetime import datetime, timezone
+from sqlalchemy import event
 from app.model.models import Account, Transaction
 
 
@@ -26,36 +27,17 @@ class MockTransaction:
 def mock_transaction():
     return MockTransaction()
 
-@patch("app.routes.transactions.get_current_user", return_value={"id": 1, "username": "mock_user"})
-@patch("app.routes.transactions.get_db")
-def test_get_all_transactions(mock_get_db, mock_user, client, mock_transaction):
-    session_mock = MagicMock()
-
-    # Setup account that belongs to current user
-    mock_account = MagicMock()
-    mock_account.id = 1
-
-    # Setup query().filter_by(user_id=...).all() to return this account
-    account_query = MagicMock()
-    account_query.filter_by.return_value.all.return_value = [mock_account]
-
-    # Setup transaction mock
-    mock_transaction.account_id = 1
-    transaction_query = MagicMock()
-    transaction_query.filter.return_value.order_by.return_value.offset.return_value.limit.return_value.all.return_value = [mock_transaction]
-    transaction_query.filter.return_value.order_by.return_value.count.return_value = 1
-
-    # Dispatch correct query mocks
-    def query_side_effect(model):
-        if model.__name__ == "Account":
-            return account_query
-        elif model.__name__ == "Transaction":
-            return transaction_query
-        return MagicMock()
+@pytest.fixture
+def listing_db(client, seeded_db):
+    """Point the listing route at the seeded database (user 1, one transaction)."""
+    def override_get_db():
+        yield seeded_db
+    with patch("app.routes.transactions.get_db", override_get_db):
+        yield seeded_db
 
-    session_mock.query.side_effect = query_side_effect
-    mock_get_db.return_value.__next__.return_value = session_mock
 
+@patch("app.routes.transactions.get_current_user", return_value={"id": 1, "username": "mock_user"})
+def test_get_all_transactions(mock_user, listing_db, client):
     response = client.get("/transactions/?page=1&per_page=1")
 
     print("🔥 Final debug response:", response.get_json())
@@ -64,7 +46,7 @@ def test_get_all_transactions(mock_get_db, mock_user, client, mock_transaction):
     data = response.get_json()
     assert data["total"] == 1
     assert len(data["transactions"]) == 1
-    assert data["transactions"][0]["id"] == mock_transaction.id
+    assert data["transactions"][0]["id"] == 1
 
 
 @patch("app.routes.transactions.get_current_user", return_value={"id": 1})
@@ -137,101 +119,45 @@ def test_create_transaction_insufficient_balance(mock_get_db, mock_user, client)
 
     assert response.status_code in (400, 404)
 
-@patch("app.routes.transactions.get_db")
 @patch("app.routes.transactions.get_current_user", return_value={"id": 1, "username": "test_user"})
-def test_list_transactions_with_pagination(mock_user, mock_get_db, client):
-    mock_session = MagicMock()
-
-    # Mock Account model query
-    mock_account = MagicMock()
-    mock_account.id = 123
-
-    # Mock Transaction model query
-    mock_transaction = MagicMock()
-    mock_transaction.as_dict.return_value = {
-        "id": 1,
-        "type": "deposit",
-        "amount": 100,
-        "timestamp": "2024-04-08T12:00:00Z"
-    }
-
-    # Mock .query(Account)
-    def query_side_effect(model):
-        if model.__name__ == "Account":
-            account_query = MagicMock()
-            account_query.filter_by.return_value.all.return_value = [mock_account]
-            return account_query
-        elif model.__name__ == "Transaction":
-            txn_query = MagicMock()
-            txn_query.filter.return_value.order_by.return_value.offset.return_value.limit.return_value.all.return_value = [mock_transaction]
-            txn_query.filter.return_value.order_by.return_value.count.return_value = 1
-            return txn_query
-        return MagicMock()
-
-    mock_session.query.side_effect = query_side_effect
-    mock_get_db.return_value.__next__.return_value = mock_session
+def test_list_transactions_with_pagination(mock_user, listing_db, client):
+    listing_db.add(Transaction(type="withdrawal", amount=100, sender_id=1, sender_user_id=1, timestamp=datetime(2024, 4, 8, 12)))
+    listing_db.commit()
 
     response = client.get("/transactions/?page=1&per_page=1")
 
     assert response.status_code == 200
     data = response.get_json()
-    assert data["total"] == 1
+    assert data["total"] == 2
     assert len(data["transactions"]) == 1
     assert data["transactions"][0]["type"] == "deposit"
 
-@patch("app.routes.transactions.get_db")
-@patch("app.routes.transactions.get_current_user", return_value={"id": 1, "username": "test_user"})
-def test_list_transactions_page_two(mock_user, mock_get_db, client):
-    mock_session = MagicMock()
-    mock_account = MagicMock()
-    mock_account.id = 123
-
-    mock_account_query = MagicMock()
-    mock_account_query.filter_by.return_value.all.return_value = [mock_account]
-
-    mock_transaction_query = MagicMock()
-    mock_transaction_query.filter.return_value.order_by.return_value.count.return_value = 1
-    mock_transaction_query.filter.return_value.order_by.return_value.offset.return_value.limit.return_value.all.return_value = []
-
-    def query_side_effect(model):
-        if model.__name__ == "Account":
-            return mock_account_query
-        elif model.__name__ == "Transaction":
-            return mock_transaction_query
-        return MagicMock()
-
-    mock_session.query.side_effect = query_side_effect
-    mock_get_db.return_value.__next__.return_value = mock_session
 
+@patch("app.routes.transactions.get_current_user", return_value={"id": 1, "username": "test_user"})
+def test_list_transactions_page_two(mock_user, listing_db, client):
     response = client.get("/transactions/?page=2&per_page=1")
     assert response.status_code == 200
     assert response.json["transactions"] == []
+    assert response.json["total"] == 1
 
 
 @patch("app.routes.transactions.get_current_user", return_value={"id": 1, "username": "test_user"})
-@patch("app.routes.transactions.get_db")
-def test_list_transactions_invalid_pagination(mock_get_db, mock_user, client):
-    mock_session = MagicMock()
-    mock_account = MagicMock()
-    mock_account.id = 123
-
-    mock_account_query = MagicMock()
-    mock_account_query.filter_by.return_value.all.return_value = [mock_account]
-
-    mock_transaction_query = MagicMock()
-    mock_transaction_query.filter.return_value.order_by.return_value.count.return_value = 0
-    mock_transaction_query.filter.return_value.order_by.return_value.offset.return_value.limit.return_value.all.return_value = []
+def test_list_transactions_invalid_pagination(mock_user, listing_db, client):
+    response = client.get("/transactions/?page=abc&per_page=-5")
+    assert response.status_code == 200
+    assert "transactions" in response.json
 
-    def query_side_effect(model):
-        if model.__name__ == "Account":
-            return mock_account_query
-        elif model.__name__ == "Transaction":
-            return mock_transaction_query
-        return MagicMock()
 
-    mock_session.query.side_effect = query_side_effect
-    mock_get_db.return_value.__next__.return_value = mock_session
+@patch("app.routes.transactions.get_current_user", return_value={"id": 1, "username": "test_user"})
+def test_list_transactions_runs_one_query(mock_user, listing_db, client):
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)  # noqa: E731
+    engine = listing_db.get_bind().engine
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        response = client.get("/transactions/?page=1&per_page=10")
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
 
-    response = client.get("/transactions/?page=abc&per_page=-5")
     assert response.status_code == 200
-    assert "transactions" in response.json
+    assert len(statements) == 1
@@ -1,14 +1,14 @@
-from decimal import Decimal
 import pytest
 from app.services.transactions.core import (
     handle_deposit, handle_withdrawal, handle_transfer
 )
+from app.services.ledger.projection import current_balance
 from app.model.models import Account, Transaction
 
 
 def test_handle_deposit_success(seeded_db):
     current_user = {"id": 1, "username": "testuser", "email": "test@example.com"}
-    amount = 100
+    amount = 10_000  # cents
     receiver_id = 1
 
     transaction, account = handle_deposit(seeded_db, current_user, amount, receiver_id)
@@ -16,9 +16,10 @@ def test_handle_deposit_success(seeded_db):
     assert isinstance(transaction, Transaction)
     assert transaction.amount == amount
     assert transaction.receiver_id == receiver_id
+    assert transaction.receiver_user_id == 1
 
     updated_account = seeded_db.query(Account).filter_by(id=receiver_id).first()
-    assert updated_account.balance == Decimal("1100")
+    assert current_balance(seeded_db, updated_account.id) == 110_000
 
 
 def test_handle_deposit_invalid_amount(seeded_db):
@@ -29,20 +30,21 @@ def test_handle_deposit_invalid_amount(seeded_db):
 
 def test_handle_withdrawal_success(seeded_db):
     current_user = {"id": 1, "username": "testuser"}
-    amount = 100
+    amount = 10_000
     sender_id = 1
 
     transaction, account = handle_withdrawal(seeded_db, current_user, amount, sender_id)
 
     assert transaction.amount == amount
     assert transaction.sender_id == sender_id
-    assert account.balance == Decimal("900")
+    assert transaction.sender_user_id == 1
+    assert current_balance(seeded_db, account.id) == 90_000
 
 
 def test_handle_withdrawal_insufficient_funds(seeded_db):
     current_user = {"id": 1, "username": "testuser"}
     with pytest.raises(ValueError):
-        handle_withdrawal(seeded_db, current_user, 10000, 1)
+        handle_withdrawal(seeded_db, current_user, 1_000_000, 1)
 
 
 def test_handle_transfer_success(seeded_db):
@@ -58,18 +60,19 @@ def test_handle_transfer_success(seeded_db):
     seeded_db.commit()
 
     current_user = {"id": 1, "username": "testuser", "email": "test@example.com"}
-    transaction, sender = handle_transfer(seeded_db, current_user, 200, 1, 2)
+    transaction, sender = handle_transfer(seeded_db, current_user, 20_000, 1, 2)
 
-    assert transaction.amount == 200
+    assert transaction.amount == 20_000
     assert transaction.sender_id == 1
     assert transaction.receiver_id == 2
+    assert (transaction.sender_user_id, transaction.receiver_user_id) == (1, 1)
 
-    assert sender.balance == Decimal("800")
+    assert current_balance(seeded_db, sender.id) == 80_000
     receiver_updated = seeded_db.query(Account).filter_by(id=2).first()
-    assert receiver_updated.balance == Decimal("200")
+    assert current_balance(seeded_db, receiver_updated.id) == 20_000
 
 
 def test_handle_transfer_same_account(seeded_db):
     current_user = {"id": 1, "username": "testuser", "email": "test@example.com"}
     with pytest.raises(ValueError):
-        handle_transfer(seeded_db, current_user, 100, 1, 1)
\ No newline at end of file
+        handle_transfer(seeded_db, current_user, 10_000, 1, 1)
\ No newline at end of file
@@ -0,0 +1,53 @@
+import pytest
+from app.core.usernames import UsernameFilter
+from app.model.models import User
+from app.utils.bloom import BloomFilter
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    names = [f"user{i}" for i in range(1000)]
+    for name in names:
+        bloom.add(name)
+
+    assert all(name in bloom for name in names)
+    assert bloom.expected_error_rate() < 0.02
+
+
+def test_filter_rejects_unknown_username(test_db):
+    test_db.add(User(username="alice", password="hashed", email="alice@example.com"))
+    test_db.commit()
+
+    usernames = UsernameFilter(error_rate=0.001, refresh_seconds=60)
+
+    assert usernames.might_exist(test_db, "alice")
+    assert not usernames.might_exist(test_db, "mallory")
+
+
+def test_filter_picks_up_registered_names(test_db):
+    usernames = UsernameFilter(error_rate=0.001, refresh_seconds=60)
+    usernames.rebuild(test_db)
+
+    usernames.add("bob")
+
+    assert usernames.might_exist(test_db, "bob")
+
+
+def test_filter_refreshes_from_database_when_stale(test_db):
+    usernames = UsernameFilter(error_rate=0.001, refresh_seconds=0)
+    usernames.rebuild(test_db)
+
+    test_db.add(User(username="carol", password="hashed", email="carol@example.com"))
+    test_db.commit()
+
+    assert usernames.might_exist(test_db, "carol")
+
+
+def test_report_includes_memory_and_false_positive_rate(test_db):
+    usernames = UsernameFilter(error_rate=0.01, refresh_seconds=60)
+    usernames.rebuild(test_db)
+
+    report = usernames.report(probes=1000)
+
+    assert report["bytes"] > 0
+    assert 0 <= report["measured_fp_rate"] <= 0.05